@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from apps.core.metrics import install_query_recorder, instrument_serializers
+
+        connection_created.connect(install_query_recorder)
+        instrument_serializers()
@@ -0,0 +1,199 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from apps.core.db.routers import use_primary
+
+
+def get_response_cache():
+    return caches[settings.RESPONSE_CACHE_ALIAS]
+
+
+def _generation_key(name):
+    return f"generation:{name}"
+
+
+def get_generations(names):
+    """
+    Return current generation values for the given names.
+
+    Missing generations are initialised from the clock, so an evicted
+    generation never restarts at a value that older cache entries used.
+    """
+    cache = get_response_cache()
+    keys = [_generation_key(name) for name in names]
+    values = cache.get_many(keys)
+    for key in keys:
+        if key not in values:
+            cache.add(key, time.time_ns())
+            values[key] = cache.get(key)
+    return [values[key] for key in keys]
+
+
+def _bump(names):
+    cache = get_response_cache()
+    for name in names:
+        try:
+            cache.incr(_generation_key(name))
+        except ValueError:
+            cache.add(_generation_key(name), time.time_ns())
+
+
+def bump_generations(*names):
+    """
+    Invalidate every cached response built from the given generations.
+
+    Bumps immediately and, inside a transaction, once more after commit,
+    so a reader cannot re-cache pre-commit data under the new generation.
+    """
+    _bump(names)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(names))
+
+
+class LocalTTLCache:
+    """
+    Thread-safe, size-bounded in-process cache with per-entry expiry.
+
+    Least recently used entries are evicted once maxsize is reached. Meant
+    for small hot objects read on every request, where even a shared cache
+    round trip is worth avoiding; entries are not shared between processes.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires = entry
+            if expires <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class CachedResponseMixin:
+    """
+    Serve safe viewset actions from a versioned cache of rendered JSON.
+
+    Views declare which generations a response depends on and which fields
+    are personal. Personal fields are stored with their anonymous value and
+    re-applied per user through personalize_rows(), so one cached body is
+    shared by all clients. Anonymous hits return the cached bytes as is.
+    """
+
+    cached_actions = ("list", "retrieve")
+    cache_status = None
+    # Field name -> value cached in the shared body
+    personal_fields = {}
+
+    def get_cache_generations(self):
+        raise NotImplementedError
+
+    def personalize_rows(self, request, rows):
+        """Fill personal fields of serialized rows for an authenticated user."""
+
+    def get_response_cache_key(self, request):
+        params = sorted(
+            (key, value)
+            for key, values in request.query_params.lists()
+            for value in values
+        )
+        raw = f"{request.get_host()}{request.path}?{urlencode(params)}"
+        digest = hashlib.sha1(raw.encode()).hexdigest()
+        generations = ".".join(
+            str(g) for g in get_generations(self.get_cache_generations())
+        )
+        return f"response:{self.basename}:{self.action}:{generations}:{digest}"
+
+    @staticmethod
+    def _rows(data):
+        if isinstance(data, dict) and "results" in data:
+            return data["results"]
+        if isinstance(data, list):
+            return data
+        return [data]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if self.cache_status:
+            response["X-Cache"] = self.cache_status
+        return response
+
+    def dispatch_cached(self, handler, request, *args, **kwargs):
+        if (
+            not settings.RESPONSE_CACHE_ENABLED
+            or self.action not in self.cached_actions
+            or request.accepted_renderer.format != "json"
+        ):
+            return handler(request, *args, **kwargs)
+
+        cache = get_response_cache()
+        key = self.get_response_cache_key(request)
+        body = cache.get(key)
+
+        if body is None:
+            self.cache_status = "MISS"
+            # A lagging replica could cache old rows under a new generation
+            with use_primary():
+                response = handler(request, *args, **kwargs)
+            if response.status_code == 200:
+                shared = json.loads(JSONRenderer().render(response.data))
+                for row in self._rows(shared):
+                    for field, value in self.personal_fields.items():
+                        if field in row:
+                            row[field] = value
+                cache.set(
+                    key,
+                    JSONRenderer().render(shared),
+                    settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            return response
+
+        self.cache_status = "HIT"
+        if not self.personal_fields or not request.user.is_authenticated:
+            return HttpResponse(body, content_type="application/json")
+        data = json.loads(body)
+        self.personalize_rows(request, self._rows(data))
+        return HttpResponse(
+            JSONRenderer().render(data), content_type="application/json"
+        )
@@ -0,0 +1,195 @@
+"""
+A per-process pool of database connections.
+
+Django opens a connection per thread and, with CONN_MAX_AGE = 0, closes it
+at the end of every request. Under ASGI every request runs its sync code in
+a new thread, so persistent connections cannot help there. The pooled
+backend (apps/core/db/postgresql) instead takes connections from a
+ConnectionPool shared by all threads of the worker and gives them back
+when Django closes them, so requests skip the TCP and auth handshake.
+
+The pool opens at most `max_size` connections and makes callers wait up to
+`timeout` seconds for one. Connections idle for longer than `check_after`
+seconds are checked before reuse, and connections older than
+`max_lifetime` are replaced, so restarts and failovers on the database
+side are picked up. Waits, timeouts and connection counts are exported
+through apps/core/metrics.py.
+"""
+
+import threading
+import time
+from collections import deque
+
+from apps.core.metrics import LATENCY_BUCKETS, REGISTRY, Counter, Gauge, Histogram
+
+pool_wait = REGISTRY.register(
+    Histogram(
+        "db_pool_wait_seconds",
+        "Time waiting for a pooled database connection, by database.",
+        ("database",),
+        buckets=(0.0005, 0.001, 0.0025) + LATENCY_BUCKETS,
+    )
+)
+pool_timeouts = REGISTRY.register(
+    Counter(
+        "db_pool_timeouts_total",
+        "Requests that gave up waiting for a pooled connection, by database.",
+        ("database",),
+    )
+)
+pool_connections = REGISTRY.register(
+    Gauge(
+        "db_pool_connections",
+        "Open pooled connections by database and state (idle, in_use).",
+        ("database", "state"),
+    )
+)
+pool_discarded = REGISTRY.register(
+    Counter(
+        "db_pool_discarded_total",
+        "Pooled connections closed, by database and reason.",
+        ("database", "reason"),
+    )
+)
+
+
+class PoolTimeout(Exception):
+    """No connection became available within the pool timeout."""
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of at most max_size connections to one database.
+
+    `check(connection)` returns whether an idle connection still works and
+    `close(connection)` closes one; both must not raise.
+    """
+
+    def __init__(
+        self,
+        name,
+        max_size,
+        timeout,
+        max_lifetime,
+        check_after,
+        check,
+        close,
+    ):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_after = check_after
+        self.check = check
+        self.close = close
+        self.condition = threading.Condition()
+        # (connection, opened at, returned at), most recently returned last
+        self.idle = deque()
+        # id(connection) -> opened at, for connections handed out
+        self.in_use = {}
+        self.size = 0
+
+    def getconn(self, connect):
+        """Return an idle connection or one opened with connect()."""
+        started = time.monotonic()
+        while True:
+            connection, opened, returned = self._acquire(started)
+            if connection is None:
+                try:
+                    connection = connect()
+                except Exception:
+                    self._release_slot()
+                    raise
+                opened = time.monotonic()
+            elif time.monotonic() - returned >= self.check_after:
+                if not self.check(connection):
+                    self._discard(connection, "unhealthy")
+                    continue
+            with self.condition:
+                self.in_use[id(connection)] = opened
+                self._update_gauges()
+            return connection
+
+    def _acquire(self, started):
+        """
+        Take an idle connection or a free slot, waiting up to the timeout.
+
+        Returns (connection, opened at, returned at), or Nones for a slot
+        that the caller must fill.
+        """
+        deadline = started + self.timeout
+        expired = []
+        try:
+            with self.condition:
+                while True:
+                    now = time.monotonic()
+                    while self.idle:
+                        # Most recently used first, so surplus connections
+                        # stay idle and age out
+                        connection, opened, returned = self.idle.pop()
+                        if now - opened >= self.max_lifetime:
+                            self.size -= 1
+                            expired.append(connection)
+                            continue
+                        pool_wait.observe(now - started, (self.name,))
+                        return connection, opened, returned
+                    if self.size < self.max_size:
+                        self.size += 1
+                        pool_wait.observe(now - started, (self.name,))
+                        return None, None, None
+                    remaining = deadline - now
+                    if remaining <= 0:
+                        pool_timeouts.inc((self.name,))
+                        raise PoolTimeout(
+                            f"No connection to {self.name!r} available within "
+                            f"{self.timeout}s, all {self.max_size} are in use"
+                        )
+                    self.condition.wait(remaining)
+        finally:
+            for connection in expired:
+                pool_discarded.inc((self.name, "lifetime"))
+                self.close(connection)
+
+    def putconn(self, connection, reusable=True):
+        """Give a connection back, closing it when not reusable or too old."""
+        with self.condition:
+            opened = self.in_use.pop(id(connection), None)
+        if opened is None:
+            # Not from this pool, e.g. opened before a fork
+            self.close(connection)
+            return
+        now = time.monotonic()
+        if not reusable:
+            self._discard(connection, "broken")
+        elif now - opened >= self.max_lifetime:
+            self._discard(connection, "lifetime")
+        else:
+            with self.condition:
+                self.idle.append((connection, opened, now))
+                self._update_gauges()
+                self.condition.notify()
+
+    def close_all(self):
+        """Close the idle connections, e.g. at exit or after a failover."""
+        with self.condition:
+            idle, self.idle = self.idle, deque()
+            self.size -= len(idle)
+            self._update_gauges()
+            self.condition.notify_all()
+        for connection, _, _ in idle:
+            self.close(connection)
+
+    def _discard(self, connection, reason):
+        pool_discarded.inc((self.name, reason))
+        self.close(connection)
+        self._release_slot()
+
+    def _release_slot(self):
+        with self.condition:
+            self.size -= 1
+            self._update_gauges()
+            self.condition.notify()
+
+    def _update_gauges(self):
+        pool_connections.set(len(self.idle), (self.name, "idle"))
+        pool_connections.set(self.size - len(self.idle), (self.name, "in_use"))
@@ -0,0 +1,114 @@
+"""
+PostgreSQL backend taking connections from a per-process pool.
+
+Use with CONN_MAX_AGE = 0, so Django hands the connection back at the end
+of every request. Pool settings come from the "POOL" entry of the database
+settings, see config/settings/production.py and apps/core/db/pool.py.
+"""
+
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from apps.core.db.pool import ConnectionPool, PoolTimeout
+
+try:
+    from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+except ImportError:  # psycopg 3
+    from psycopg.pq import TransactionStatus
+
+    TRANSACTION_STATUS_IDLE = TransactionStatus.IDLE
+
+POOL_DEFAULTS = {
+    "MAX_SIZE": 10,
+    "TIMEOUT": 5,
+    "MAX_LIFETIME": 1800,
+    "CHECK_AFTER": 30,
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def check_connection(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except base.Database.Error:
+        return False
+    return True
+
+
+def close_connection(connection):
+    try:
+        connection.close()
+    except base.Database.Error:
+        pass
+
+
+def get_pool(alias, settings_dict):
+    """The pool of this process for a database alias."""
+    pid = os.getpid()
+    key = (alias, pid)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                # Connections inherited over a fork belong to the parent
+                for inherited in [other for other in _pools if other[1] != pid]:
+                    del _pools[inherited]
+                options = {**POOL_DEFAULTS, **settings_dict.get("POOL", {})}
+                pool = _pools[key] = ConnectionPool(
+                    alias,
+                    max_size=options["MAX_SIZE"],
+                    timeout=options["TIMEOUT"],
+                    max_lifetime=options["MAX_LIFETIME"],
+                    check_after=options["CHECK_AFTER"],
+                    check=check_connection,
+                    close=close_connection,
+                )
+    return pool
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        try:
+            connection = self.pool.getconn(
+                lambda: super(DatabaseWrapper, self).get_new_connection(conn_params)
+            )
+        except PoolTimeout as exc:
+            raise self.Database.OperationalError(str(exc)) from exc
+        # Set when a connection is opened, also needed for reused ones
+        isolation_level = self.settings_dict["OPTIONS"].get("isolation_level")
+        self.isolation_level = (
+            IsolationLevel.READ_COMMITTED
+            if isolation_level is None
+            else IsolationLevel(isolation_level)
+        )
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            self.pool.putconn(self.connection, reusable=self.is_reusable())
+
+    def is_reusable(self):
+        """Whether the connection can serve another request as is."""
+        connection = self.connection
+        if connection.closed:
+            return False
+        try:
+            if connection.info.transaction_status != TRANSACTION_STATUS_IDLE:
+                # Closed inside a transaction, e.g. by an exception
+                connection.rollback()
+        except self.Database.Error:
+            return False
+        if self.errors_occurred:
+            return self.is_usable()
+        return True
@@ -0,0 +1,117 @@
+"""
+Send reads of safe requests to read replicas, everything else to the primary.
+
+ReplicaRoutingMiddleware gives each request a RoutingState, and only reads
+made while handling a request can go to a replica (DATABASE_REPLICAS, one
+picked per request). They stay on the primary when:
+
+- the request method is not safe, so validation reads see the latest rows
+- the request has written anything, or is inside a transaction
+- code asks for it with `use_primary()`
+- the authenticated user wrote within the last REPLICA_PIN_SECONDS, so
+  they see their own registration or event despite replication lag
+
+Pins are kept in the shared cache, looked up at most once per request and
+only when a read is routed. Outside requests (management commands, the
+mail worker) all queries use the primary.
+"""
+
+import contextvars
+import random
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils.functional import SimpleLazyObject
+
+current_state = contextvars.ContextVar("replica_routing_state", default=None)
+
+
+def pin_key(user_id):
+    return f"replica-pin:user:{user_id}"
+
+
+class RoutingState:
+    """Where one request reads from."""
+
+    def __init__(self, request, replica):
+        self.request = request
+        self.replica = replica
+        self.primary_only = request.method not in ("GET", "HEAD", "OPTIONS")
+        self.primary_depth = 0
+        self.wrote = False
+        self.pinned = None
+
+    @property
+    def user_id(self):
+        # DRF sets the authenticated user on the Django request; before that
+        # it is AuthenticationMiddleware's lazy session user, left unevaluated
+        # because evaluating it would query the database from the router
+        user = vars(self.request).get("user")
+        if user is None or isinstance(user, SimpleLazyObject):
+            return None
+        return user.pk if user.is_authenticated else None
+
+    def reads_primary(self):
+        if self.primary_only or self.primary_depth or self.wrote:
+            return True
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return True
+        if self.pinned is None:
+            user_id = self.user_id
+            if user_id is None:
+                return False
+            self.pinned = caches["default"].get(pin_key(user_id)) is not None
+        return self.pinned
+
+    def pin(self):
+        """Keep the user's reads on the primary after a write."""
+        user_id = self.user_id
+        if self.wrote and user_id is not None:
+            caches["default"].set(pin_key(user_id), 1, settings.REPLICA_PIN_SECONDS)
+
+
+def start_request(request):
+    """Return a RoutingState for the request, or None without replicas."""
+    if not settings.DATABASE_REPLICAS:
+        return None
+    return RoutingState(request, random.choice(settings.DATABASE_REPLICAS))
+
+
+@contextmanager
+def use_primary():
+    """Read from the primary inside the block, e.g. to fill shared caches."""
+    state = current_state.get()
+    if state is None:
+        yield
+        return
+    state.primary_depth += 1
+    try:
+        yield
+    finally:
+        state.primary_depth -= 1
+
+
+class PrimaryReplicaRouter:
+    """Database router for DATABASE_REPLICAS, see the module docstring."""
+
+    def db_for_read(self, model, **hints):
+        state = current_state.get()
+        if state is None or state.reads_primary():
+            return DEFAULT_DB_ALIAS
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = current_state.get()
+        if state is not None:
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        # Replicas receive the schema through replication
+        return db not in settings.DATABASE_REPLICAS
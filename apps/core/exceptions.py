@@ -33,6 +33,14 @@ class NotRegisteredError(BaseAPIException):
     default_detail = "You are not registered for this event."
 
 
+class EventFullError(BaseAPIException):
+    """Raised when user tries to register for an event with no seats left."""
+
+    status_code = status.HTTP_400_BAD_REQUEST
+    default_code = "event_full"
+    default_detail = "This event has no seats left."
+
+
 class PasswordMismatchError(BaseAPIException):
     """Raised when password confirmation doesn't match."""
 
@@ -57,6 +65,14 @@ class UsernameAlreadyExistsError(BaseAPIException):
     default_detail = "User with this username already exists."
 
 
+class PasswordHashingBusyError(BaseAPIException):
+    """Raised when every password hashing slot stays busy past the timeout."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_code = "hashing_busy"
+    default_detail = "Too many sign-ups and logins in progress, please retry."
+
+
 class EventNotFoundError(BaseAPIException):
     """Raised when event is not found."""
 
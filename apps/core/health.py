@@ -0,0 +1,149 @@
+"""
+Readiness checks and worker warm-up.
+
+Checks are the functions named in READINESS_CHECKS. Each returns a dict
+of details or raises; CheckFailed carries a message that is safe to show,
+other exceptions are reported by type only and logged. Results are kept
+for READINESS_CACHE_TTL seconds and computed by one thread at a time, so
+probes never add more than one round of queries per process and TTL.
+
+WARM_UP_HOOKS run once per process, from gunicorn's post_worker_init (see
+gunicorn.conf.py) or else on the first readiness probe. The worker reports
+ready only after they all succeeded; failed hooks are retried with the
+checks.
+"""
+
+import logging
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.urls import get_resolver
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class CheckFailed(Exception):
+    """A dependency is reachable but not usable, the message is public."""
+
+
+def database_aliases():
+    """The primary and the replicas in use."""
+    return [DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS]
+
+
+def check_database():
+    """Run a trivial query on the primary and every replica."""
+    details = {}
+    for alias in database_aliases():
+        started = time.perf_counter()
+        with connections[alias].cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        details[alias] = round((time.perf_counter() - started) * 1000, 1)
+    return {"ms": details}
+
+
+def check_cache():
+    """Write and read back a value in every configured cache."""
+    details = {}
+    for alias in settings.CACHES:
+        started = time.perf_counter()
+        cache = caches[alias]
+        value = uuid.uuid4().hex
+        cache.set("health:probe", value, 30)
+        if cache.get("health:probe") != value:
+            raise CheckFailed(f"Cache {alias!r} did not return the written value")
+        details[alias] = round((time.perf_counter() - started) * 1000, 1)
+    return {"ms": details}
+
+
+def connect_databases():
+    """Open a connection to every database, loading backend type info."""
+    for alias in database_aliases():
+        connections[alias].ensure_connection()
+
+
+def load_urlconf():
+    """Import every view module and compile the URL patterns."""
+    get_resolver().url_patterns
+
+
+class Readiness:
+    """Warm-up state and memoized check results of this process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.warmed_up = False
+        self.result = None
+        self.checked_at = None
+
+    def warm_up(self):
+        """Run WARM_UP_HOOKS until they all succeed once, return success."""
+        with self.lock:
+            return self._warm_up()
+
+    def _warm_up(self):
+        if self.warmed_up:
+            return True
+        started = time.perf_counter()
+        for path in settings.WARM_UP_HOOKS:
+            try:
+                import_string(path)()
+            except Exception:
+                logger.exception("Warm-up hook %s failed", path)
+                return False
+        self.warmed_up = True
+        logger.info("Warmed up in %.0f ms", (time.perf_counter() - started) * 1000)
+        return True
+
+    def check(self):
+        """Return (ready, checks), running the checks at most once per TTL."""
+        with self.lock:
+            if (
+                self.checked_at is not None
+                and time.monotonic() - self.checked_at < settings.READINESS_CACHE_TTL
+            ):
+                return self.result
+            warmed_up = self._warm_up()
+            checks = {
+                name: run_check(name, path)
+                for name, path in settings.READINESS_CHECKS.items()
+            }
+            ready = warmed_up and all(check["ok"] for check in checks.values())
+            self.result = ready, {"warm_up": {"ok": warmed_up}, **checks}
+            self.checked_at = time.monotonic()
+            return self.result
+
+    def reset(self):
+        with self.lock:
+            self.warmed_up = False
+            self.result = None
+            self.checked_at = None
+
+
+def run_check(name, path):
+    try:
+        return {"ok": True, **import_string(path)()}
+    except CheckFailed as exc:
+        logger.warning("Readiness check %s failed: %s", name, exc)
+        return {"ok": False, "error": str(exc)}
+    except Exception as exc:
+        logger.exception("Readiness check %s failed", name)
+        return {"ok": False, "error": type(exc).__name__}
+
+
+readiness = Readiness()
+
+
+def warm_up():
+    """Warm up this process, for server hooks outside any request."""
+    try:
+        return readiness.warm_up()
+    finally:
+        # Nothing closes connections of this thread, hand them back
+        connections.close_all()
@@ -0,0 +1,166 @@
+"""
+Logging that keeps formatting and I/O off request threads.
+
+BackgroundHandler puts records on a bounded in-memory queue; a listener
+thread formats them as JSON lines and writes them to the console and a
+rotating file. Request threads only merge the %-style arguments into the
+message. When the queue is full, records are dropped and counted instead of
+blocking the request.
+
+SamplingFilter, attached to chatty loggers, keeps a fraction of their
+records below WARNING, so the per-request cost can be cut further.
+
+Configured from config/settings/logging.py, before apps are loaded, so
+nothing here may import Django models.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+
+# LogRecord attributes that are not extra fields passed by the caller
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, with any `extra` fields included."""
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.thread,
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        if record.stack_info:
+            data["stack"] = record.stack_info
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for a listener thread that writes them out.
+
+    The listener is started lazily in each process, so workers forked
+    after logging was configured get their own thread.
+    """
+
+    def __init__(
+        self,
+        filename=None,
+        max_bytes=5 * 1024 * 1024,
+        backup_count=5,
+        console=True,
+        queue_size=10000,
+        text_console=False,
+    ):
+        super().__init__(queue.Queue(queue_size))
+        formatter = JSONFormatter()
+        self.targets = []
+        if console:
+            stream = logging.StreamHandler(sys.stderr)
+            stream.setFormatter(
+                logging.Formatter("%(levelname)s %(asctime)s %(name)s %(message)s")
+                if text_console
+                else formatter
+            )
+            self.targets.append(stream)
+        if filename:
+            rotating = logging.handlers.RotatingFileHandler(
+                filename, maxBytes=max_bytes, backupCount=backup_count
+            )
+            rotating.setFormatter(formatter)
+            self.targets.append(rotating)
+        self.dropped = 0
+        self._pid = None
+        self._listener = None
+        self._running = False
+        self._start_lock = threading.Lock()
+
+    def _ensure_listener(self):
+        if self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._pid != os.getpid():
+                # A forked child inherits a copy of the queue but no thread
+                self.queue = queue.Queue(self.queue.maxsize)
+                self._listener = logging.handlers.QueueListener(
+                    self.queue, *self.targets, respect_handler_level=True
+                )
+                self._listener.start()
+                self._running = True
+                self._pid = os.getpid()
+                atexit.register(self.stop)
+
+    def stop(self):
+        """Write out queued records and stop the listener thread."""
+        if self._running and self._pid == os.getpid():
+            self._running = False
+            self._listener.stop()
+
+    def prepare(self, record):
+        # Merge arguments now, while they still describe the logged state.
+        # Formatting and I/O happen on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            warning = logging.makeLogRecord(
+                {
+                    "name": __name__,
+                    "levelno": logging.WARNING,
+                    "levelname": "WARNING",
+                    "msg": "Dropped %d log records, the log queue was full",
+                    "args": (dropped,),
+                }
+            )
+            try:
+                self.queue.put_nowait(self.prepare(warning))
+            except queue.Full:
+                self.dropped += dropped
+
+    def flush(self):
+        """Wait until the listener has written every queued record."""
+        if self._running and self._pid == os.getpid():
+            self.queue.join()
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a `rate` fraction of records below WARNING, and everything above."""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        return record.levelno >= logging.WARNING or random.random() < self.rate
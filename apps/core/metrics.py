@@ -0,0 +1,441 @@
+"""
+Per-request timings for the Server-Timing header and Prometheus.
+
+MetricsMiddleware starts a RequestTimer for each request. A database
+execute wrapper, installed on every connection, adds query time and count
+to it, and DRF serializers add the time spent in `.data` and `.is_valid()`
+(minus the queries they run). When the response is ready, the timings go
+into the Server-Timing header and into in-process histograms and counters,
+which /metrics renders in the Prometheus text format.
+
+Recording is a few additions and, per request, one locked update per
+metric, so it can stay on in production.
+
+Each worker process has its own registry. With METRICS_DIR set, workers
+write a snapshot there every METRICS_FLUSH_INTERVAL seconds and on exit,
+and /metrics adds up the snapshots of all workers, so the totals stay
+monotonic when workers are recycled. Snapshots of exited workers are
+folded into one file, without their gauges.
+"""
+
+import atexit
+import bisect
+import contextvars
+import json
+import os
+import threading
+import time
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+ARCHIVE_FILE = "exited.json"
+
+current_timer = contextvars.ContextVar("current_timer", default=None)
+
+
+class RequestTimer:
+    """Time spent by one request, in seconds, shared by its threads."""
+
+    __slots__ = (
+        "started",
+        "queue_time",
+        "db_time",
+        "db_queries",
+        "serializer_time",
+        "serializer_depth",
+    )
+
+    def __init__(self, queue_time=None):
+        self.started = time.perf_counter()
+        self.queue_time = queue_time
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def server_timing(self, total):
+        """Header value, durations in milliseconds."""
+        parts = [
+            f'db;dur={self.db_time * 1000:.1f};desc="{self.db_queries} queries"',
+            f"serializer;dur={self.serializer_time * 1000:.1f}",
+        ]
+        if self.queue_time is not None:
+            parts.append(f"queue;dur={self.queue_time * 1000:.1f}")
+        parts.append(f"app;dur={total * 1000:.1f}")
+        return ", ".join(parts)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query to the current timer."""
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timer.db_time += time.perf_counter() - started
+        timer.db_queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """connection_created receiver, called again on every reconnect."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def timed_serializer(method):
+    """Wrap a serializer method to add its time to the current timer."""
+
+    def wrapper(*args, **kwargs):
+        timer = current_timer.get()
+        if timer is None or timer.serializer_depth:
+            # Nested serializers are already inside the outer one's time
+            return method(*args, **kwargs)
+        timer.serializer_depth += 1
+        db_time = timer.db_time
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            timer.serializer_time += elapsed - (timer.db_time - db_time)
+            timer.serializer_depth -= 1
+
+    wrapper.__wrapped__ = method
+    return wrapper
+
+
+def instrument_serializers():
+    """Time every DRF serializer's `.data` and `.is_valid()`."""
+    from rest_framework.serializers import BaseSerializer
+
+    if hasattr(BaseSerializer.is_valid, "__wrapped__"):
+        return
+    BaseSerializer.is_valid = timed_serializer(BaseSerializer.is_valid)
+    BaseSerializer.data = property(timed_serializer(BaseSerializer.data.fget))
+
+
+def escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names, values, extra=""):
+    pairs = [f'{name}="{escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def format_value(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """A named family of series, one per tuple of label values."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.series = {}
+        self.lock = threading.Lock()
+
+    def snapshot(self):
+        """Series keyed by their JSON-encoded label values."""
+        with self.lock:
+            return {
+                json.dumps(labels): self.copy(value)
+                for labels, value in self.series.items()
+            }
+
+    def copy(self, value):
+        return value
+
+    def render(self, series):
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for key in sorted(series):
+            lines.extend(self.render_series(json.loads(key), series[key]))
+        return lines
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, labels=(), amount=1):
+        with self.lock:
+            self.series[labels] = self.series.get(labels, 0) + amount
+
+    def value(self, labels=()):
+        return self.series.get(tuple(labels), 0)
+
+    @staticmethod
+    def merge(value, other):
+        return value + other
+
+    def render_series(self, labels, value):
+        label_text = format_labels(self.labelnames, labels)
+        yield f"{self.name}{label_text} {format_value(value)}"
+
+
+class Gauge(Counter):
+    """A current value; summed across live workers, dropped for exited ones."""
+
+    type = "gauge"
+
+    def set(self, value, labels=()):
+        with self.lock:
+            self.series[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Counts per bucket, kept non-cumulative as [count per bucket..., +Inf, sum].
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, labels=()):
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            counts = self.series.get(labels)
+            if counts is None:
+                counts = self.series[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def count(self, labels=()):
+        counts = self.series.get(tuple(labels))
+        return sum(counts[:-1]) if counts else 0
+
+    def copy(self, value):
+        return list(value)
+
+    @staticmethod
+    def merge(value, other):
+        return [a + b for a, b in zip(value, other)]
+
+    def render_series(self, labels, counts):
+        cumulative = 0
+        bounds = [format_value(bound) for bound in self.buckets] + ["+Inf"]
+        for bound, count in zip(bounds, counts):
+            cumulative += count
+            label_text = format_labels(self.labelnames, labels, f'le="{bound}"')
+            yield f"{self.name}_bucket{label_text} {cumulative}"
+        label_text = format_labels(self.labelnames, labels)
+        yield f"{self.name}_sum{label_text} {format_value(counts[-1])}"
+        yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class Registry:
+    """The metrics of this process, and snapshots of its sibling workers."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.next_flush = 0.0
+        self.flush_lock = threading.Lock()
+        self.atexit_pid = None
+
+    def register(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self):
+        return {name: metric.snapshot() for name, metric in self.metrics.items()}
+
+    def merge(self, state, other, gauges=True):
+        for name, series in other.items():
+            metric = self.metrics.get(name)
+            if metric is None or (metric.type == "gauge" and not gauges):
+                continue
+            target = state.setdefault(name, {})
+            for key, value in series.items():
+                target[key] = (
+                    metric.merge(target[key], value) if key in target else value
+                )
+        return state
+
+    def collect(self):
+        state = self.snapshot()
+        if settings.METRICS_DIR:
+            for snapshot in read_snapshots(settings.METRICS_DIR):
+                self.merge(state, snapshot)
+        return state
+
+    def render(self):
+        state = self.collect()
+        lines = []
+        for name, metric in self.metrics.items():
+            lines.extend(metric.render(state.get(name, {})))
+        return "\n".join(lines) + "\n"
+
+    def maybe_flush(self):
+        """Write this worker's snapshot to METRICS_DIR when one is due."""
+        if not settings.METRICS_DIR or time.monotonic() < self.next_flush:
+            return
+        if not self.flush_lock.acquire(blocking=False):
+            return
+        try:
+            self.next_flush = time.monotonic() + settings.METRICS_FLUSH_INTERVAL
+            if self.atexit_pid != os.getpid():
+                self.atexit_pid = os.getpid()
+                atexit.register(self.flush)
+            self.flush()
+        finally:
+            self.flush_lock.release()
+
+    def flush(self):
+        directory = settings.METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        write_json(os.path.join(directory, f"{os.getpid()}.json"), self.snapshot())
+
+
+def write_json(path, data):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as file:
+        json.dump(data, file)
+    os.replace(temporary, path)
+
+
+def pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def read_snapshots(directory):
+    """
+    Snapshots of the other workers, folding those of exited ones into one.
+    """
+    import fcntl
+
+    if not os.path.isdir(directory):
+        return []
+    with open(os.path.join(directory, "lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = os.path.join(directory, ARCHIVE_FILE)
+        archive = read_json(archive_path) or {}
+        snapshots, exited = [], []
+        for name in os.listdir(directory):
+            pid, extension = os.path.splitext(name)
+            if extension != ".json" or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            path = os.path.join(directory, name)
+            snapshot = read_json(path)
+            if snapshot is None:
+                continue
+            if pid_alive(int(pid)):
+                snapshots.append(snapshot)
+            else:
+                REGISTRY.merge(archive, snapshot, gauges=False)
+                exited.append(path)
+        if exited:
+            write_json(archive_path, archive)
+            for path in exited:
+                os.remove(path)
+    return snapshots + [archive]
+
+
+def read_json(path):
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+REGISTRY = Registry()
+
+requests_total = REGISTRY.register(
+    Counter(
+        "http_requests_total",
+        "Requests by view, method and status.",
+        ("view", "method", "status"),
+    )
+)
+request_duration = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Time until the response was returned, by view and method.",
+        ("view", "method"),
+    )
+)
+request_db_duration = REGISTRY.register(
+    Histogram(
+        "http_request_db_duration_seconds",
+        "Time spent in database queries per request, by view.",
+        ("view",),
+    )
+)
+request_db_queries = REGISTRY.register(
+    Histogram(
+        "http_request_db_queries",
+        "Database queries per request, by view.",
+        ("view",),
+        buckets=QUERY_BUCKETS,
+    )
+)
+request_serializer_duration = REGISTRY.register(
+    Histogram(
+        "http_request_serializer_duration_seconds",
+        "Time spent in DRF serializers per request, excluding queries, by view.",
+        ("view",),
+    )
+)
+request_queue_duration = REGISTRY.register(
+    Histogram(
+        "http_request_queue_duration_seconds",
+        "Time from the proxy's X-Request-Start until Django got the request.",
+    )
+)
+
+
+def queue_time(request):
+    """Seconds since the X-Request-Start header (nginx `t=${msec}`), or None."""
+    header = request.META.get("HTTP_X_REQUEST_START")
+    if not header:
+        return None
+    try:
+        started = float(header.removeprefix("t="))
+    except ValueError:
+        return None
+    return max(time.time() - started, 0.0)
+
+
+def view_label(request):
+    match = getattr(request, "resolver_match", None)
+    return match.view_name if match is not None else "<unmatched>"
+
+
+def record_request(request, response, timer):
+    """Observe a finished request and set its Server-Timing header."""
+    total = time.perf_counter() - timer.started
+    view = view_label(request)
+    requests_total.inc((view, request.method, str(response.status_code)))
+    request_duration.observe(total, (view, request.method))
+    request_db_duration.observe(timer.db_time, (view,))
+    request_db_queries.observe(timer.db_queries, (view,))
+    request_serializer_duration.observe(timer.serializer_time, (view,))
+    if timer.queue_time is not None:
+        request_queue_duration.observe(timer.queue_time)
+    if settings.SERVER_TIMING:
+        response["Server-Timing"] = timer.server_timing(total)
+    REGISTRY.maybe_flush()
@@ -0,0 +1,159 @@
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.http import JsonResponse
+
+from apps.core.db import routers
+from apps.core.metrics import RequestTimer, current_timer, queue_time, record_request
+
+
+class ConcurrencyLimitMiddleware:
+    """
+    Shed load once a process has MAX_CONCURRENT_REQUESTS requests in flight.
+
+    Excess requests get an immediate 503 with Retry-After instead of
+    queueing for database connections, so the database stays below
+    saturation (size it as WEB_CONCURRENCY * MAX_CONCURRENT_REQUESTS <= the
+    connections it serves well). A limit of 0 disables it. Paths in
+    LOAD_SHEDDING_EXEMPT_PATHS, such as probes, are never shed. Streaming
+    responses count only until their headers are returned.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def acquire(self, request):
+        limit = settings.MAX_CONCURRENT_REQUESTS
+        if not limit or request.path in settings.LOAD_SHEDDING_EXEMPT_PATHS:
+            return None
+        with self.lock:
+            if self.in_flight >= limit:
+                return False
+            self.in_flight += 1
+        return True
+
+    def release(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def overloaded(self):
+        response = JsonResponse(
+            {"detail": "Server is busy, please retry.", "code": "overloaded"},
+            status=503,
+        )
+        response["Retry-After"] = str(settings.LOAD_SHEDDING_RETRY_AFTER)
+        return response
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        acquired = self.acquire(request)
+        if acquired is False:
+            return self.overloaded()
+        try:
+            return self.get_response(request)
+        finally:
+            if acquired:
+                self.release()
+
+    async def __acall__(self, request):
+        acquired = self.acquire(request)
+        if acquired is False:
+            return self.overloaded()
+        try:
+            return await self.get_response(request)
+        finally:
+            if acquired:
+                self.release()
+
+
+class MetricsMiddleware:
+    """
+    Time each request for the Server-Timing header and /metrics.
+
+    See apps/core/metrics.py. Streaming responses are timed until their
+    headers are returned.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+        timer = RequestTimer(queue_time(request))
+        token = current_timer.set(timer)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        record_request(request, response, timer)
+        return response
+
+    async def __acall__(self, request):
+        if not settings.METRICS_ENABLED:
+            return await self.get_response(request)
+        timer = RequestTimer(queue_time(request))
+        token = current_timer.set(timer)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        record_request(request, response, timer)
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Let reads of safe requests go to DATABASE_REPLICAS.
+
+    See apps/core/db/routers.py. Users who wrote are pinned to the primary
+    once the response is ready. Does nothing without replicas.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        state = routers.start_request(request)
+        if state is None:
+            return self.get_response(request)
+        token = routers.current_state.set(state)
+        try:
+            return self.get_response(request)
+        finally:
+            routers.current_state.reset(token)
+            state.pin()
+
+    async def __acall__(self, request):
+        state = routers.start_request(request)
+        if state is None:
+            return await self.get_response(request)
+        token = routers.current_state.set(state)
+        try:
+            return await self.get_response(request)
+        finally:
+            routers.current_state.reset(token)
+            await sync_to_async(state.pin)()
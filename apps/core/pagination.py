@@ -0,0 +1,259 @@
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework import pagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
+from rest_framework.response import Response
+
+
+def estimate_row_count(queryset):
+    """
+    Return the planner's row estimate for the queryset's table, or None.
+
+    Only PostgreSQL keeps a cheap estimate (pg_class.reltuples, refreshed by
+    ANALYZE/autovacuum); other backends return None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class EstimatedCountPaginator(DjangoPaginator):
+    """
+    Paginator that skips COUNT(*) for unfiltered querysets on large tables.
+
+    Enabled with PAGINATION_ESTIMATED_COUNT. Estimates below
+    PAGINATION_ESTIMATE_THRESHOLD fall back to an exact count, since small
+    tables are cheap to count and their estimates are the least accurate.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if (
+            settings.PAGINATION_ESTIMATED_COUNT
+            and hasattr(queryset, "query")
+            and not queryset.query.where
+        ):
+            estimate = estimate_row_count(queryset)
+            if (
+                estimate is not None
+                and estimate >= settings.PAGINATION_ESTIMATE_THRESHOLD
+            ):
+                return estimate
+        return super().count
+
+
+class PageNumberPagination(pagination.PageNumberPagination):
+    """Default page number pagination with optional estimated totals."""
+
+    django_paginator_class = EstimatedCountPaginator
+
+
+class KeysetPagination(pagination.CursorPagination):
+    """
+    Cursor pagination keyed on (ordering field, pk).
+
+    Unlike DRF's CursorPagination, ties on the ordering field are broken by
+    the primary key instead of an offset, so every page is a single index
+    range scan no matter how deep it is. The ordering field is taken from
+    the view's OrderingFilter (first term only) and must be non-nullable.
+    """
+
+    ordering = "-pk"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """paginate_queryset() fetching the page with the async ORM."""
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([row async for row in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """Return the unevaluated query for the requested page plus one row."""
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        field = self.ordering[0].lstrip("-")
+        self.pk_name = queryset.model._meta.pk.attname
+        descending = self.ordering[0].startswith("-")
+        reverse = bool(self.cursor and self.cursor.reverse)
+        # Paging backwards scans the index in the opposite direction
+        scan_descending = descending != reverse
+        prefix = "-" if scan_descending else ""
+        queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}pk")
+
+        if self.cursor is not None:
+            value, pk = self.decode_position(queryset.model, field)
+            op, bound = ("lt", "lte") if scan_descending else ("gt", "gte")
+            # The redundant range bound lets the planner use a plain index
+            # range scan instead of evaluating the OR for every row.
+            queryset = queryset.filter(**{f"{field}__{bound}": value}).filter(
+                Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"pk__{op}": pk})
+            )
+
+        return queryset[: self.page_size + 1]
+
+    def set_page(self, results):
+        """Keep the page from the fetched rows and work out the links."""
+        reverse = bool(self.cursor and self.cursor.reverse)
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(
+                offset=0, reverse=False, position=self.encode_position(self.page[-1])
+            )
+        )
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=True, position=self.encode_position(self.page[0]))
+        )
+
+    def encode_position(self, instance):
+        field = self.ordering[0].lstrip("-")
+        if isinstance(instance, dict):
+            # A row of a values() queryset, which must select the field
+            value, pk = instance[field], instance[self.pk_name]
+        else:
+            value, pk = getattr(instance, field), instance.pk
+        if hasattr(value, "isoformat"):
+            value = value.isoformat()
+        return json.dumps([value, pk])
+
+    def decode_position(self, model, field):
+        try:
+            value, pk = json.loads(self.cursor.position)
+            return model._meta.get_field(field).to_python(value), int(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+
+class FixedKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination on the class's own `ordering`, with an optional total.
+
+    For nested actions such as an event's participants, where the view's
+    OrderingFilter describes a different model. The total is passed by the
+    view, typically from a denormalized counter, so no COUNT(*) runs.
+    """
+
+    count = None
+
+    def get_ordering(self, request, queryset, view):
+        return (self.ordering,)
+
+    def paginate_queryset(self, queryset, request, view=None, count=None):
+        self.count = count
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None, count=None):
+        self.count = count
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema["properties"] = {
+            "count": {"type": "integer", "nullable": True, "example": 123},
+            **schema["properties"],
+        }
+        return schema
+
+
+class PageNumberOrKeysetPagination(pagination.BasePagination):
+    """
+    Page number pagination by default, keyset pagination on request.
+
+    Keyset mode is selected with ?pagination=cursor for the first page and
+    by the ?cursor= parameter of the returned next/previous links.
+    """
+
+    mode_query_param = "pagination"
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.active = self.page_number
+
+    def use_keyset(self, request):
+        return (
+            self.keyset.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = self.keyset if self.use_keyset(request) else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    def get_paginated_response_schema(self, schema):
+        return self.page_number.get_paginated_response_schema(schema)
+
+    def get_schema_operation_parameters(self, view):
+        mode = {
+            "name": self.mode_query_param,
+            "required": False,
+            "in": "query",
+            "description": "Set to 'cursor' to use keyset pagination.",
+            "schema": {"type": "string", "enum": ["cursor"]},
+        }
+        return (
+            self.page_number.get_schema_operation_parameters(view)
+            + [mode]
+            + self.keyset.get_schema_operation_parameters(view)
+        )
@@ -0,0 +1,658 @@
+import json
+import logging
+import os
+import sys
+import threading
+from datetime import timedelta
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.core import metrics, throttling
+from apps.core.db.pool import ConnectionPool, PoolTimeout
+from apps.core.db.postgresql import base as postgresql_base
+from apps.core.db.routers import PrimaryReplicaRouter, use_primary
+from apps.core.health import CheckFailed
+from apps.core.logs import BackgroundHandler, JSONFormatter, SamplingFilter
+from apps.core.middleware import ConcurrencyLimitMiddleware
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze time.time() in apps.core.throttling, advance it with clock.now."""
+
+    class Clock:
+        now = 6000.0
+
+    monkeypatch.setattr(throttling.time, "time", lambda: Clock.now)
+    return Clock
+
+
+class TestSlidingWindow:
+    """Tests for the sliding window counter."""
+
+    def test_limit_within_window(self, clock):
+        """Test requests over the limit in one window are rejected."""
+        for _ in range(3):
+            assert throttling.consume("scope", "a", "3/min") is None
+
+        wait = throttling.consume("scope", "a", "3/min")
+
+        assert wait == pytest.approx(60 + 60 * (1 - 2 / 3))
+
+    def test_previous_window_slides_out(self, clock):
+        """Test the previous window counts in proportion to its overlap."""
+        for _ in range(4):
+            throttling.consume("scope", "a", "4/min")
+
+        clock.now += 60 + 15
+        # 4 * 0.75 = 3 of the old requests still count
+        assert throttling.consume("scope", "a", "4/min") is None
+        wait = throttling.consume("scope", "a", "4/min")
+        assert wait == pytest.approx(15)
+
+        clock.now += wait
+        assert throttling.consume("scope", "a", "4/min") is None
+
+    def test_rejected_requests_not_counted(self, clock):
+        """Test retrying while throttled does not extend the wait."""
+        throttling.consume("scope", "a", "1/s")
+        first = throttling.consume("scope", "a", "1/s")
+        for _ in range(10):
+            throttling.consume("scope", "a", "1/s")
+
+        assert throttling.consume("scope", "a", "1/s") == first
+
+    def test_zero_rate_rejects_everything(self, clock):
+        """Test a "0/min" rate rejects every request until the window ends."""
+        clock.now += 20
+
+        assert throttling.consume("scope", "a", "0/min") == pytest.approx(40)
+        assert throttling.consume("scope", "a", "0/min") == pytest.approx(40)
+
+    def test_clients_and_scopes_are_separate(self, clock):
+        """Test limits apply per scope and client."""
+        throttling.consume("scope", "a", "1/min")
+
+        assert throttling.consume("scope", "b", "1/min") is None
+        assert throttling.consume("other", "a", "1/min") is None
+
+
+class TestConcurrencyLimit:
+    """Tests for load shedding in ConcurrencyLimitMiddleware."""
+
+    def test_sheds_over_limit(self, settings):
+        """Test requests beyond the in-flight limit get 503 at once."""
+        settings.MAX_CONCURRENT_REQUESTS = 1
+        started, release = threading.Event(), threading.Event()
+
+        def slow_view(request):
+            started.set()
+            release.wait()
+            return HttpResponse()
+
+        middleware = ConcurrencyLimitMiddleware(slow_view)
+        factory = RequestFactory()
+        busy = threading.Thread(target=middleware, args=(factory.get("/api/"),))
+        busy.start()
+        started.wait()
+        try:
+            shed = middleware(factory.get("/api/"))
+            exempt = middleware.acquire(factory.get("/"))
+        finally:
+            release.set()
+            busy.join()
+
+        assert shed.status_code == 503
+        assert shed["Retry-After"] == "1"
+        assert exempt is None
+        assert middleware.in_flight == 0
+
+    def test_async_releases_slot(self, settings):
+        """Test the async path frees its slot, also when the view fails."""
+        settings.MAX_CONCURRENT_REQUESTS = 1
+
+        async def failing_view(request):
+            raise ValueError
+
+        middleware = ConcurrencyLimitMiddleware(failing_view)
+        with pytest.raises(ValueError):
+            async_to_sync(middleware)(RequestFactory().get("/api/"))
+
+        assert middleware.in_flight == 0
+
+    def test_disabled_by_default(self, settings):
+        """Test a limit of 0 never sheds."""
+        settings.MAX_CONCURRENT_REQUESTS = 0
+        middleware = ConcurrencyLimitMiddleware(lambda request: HttpResponse())
+
+        assert middleware(RequestFactory().get("/api/")).status_code == 200
+        assert middleware.in_flight == 0
+
+
+def make_record(msg="hello %s", args=("world",), level=logging.INFO, **extra):
+    record = logging.LogRecord("apps.test", level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLogging:
+    """Tests for the JSON formatter, background handler and sampling."""
+
+    def test_json_formatter(self):
+        """Test records become one JSON object with extra fields."""
+        line = JSONFormatter().format(make_record(event_id=5))
+        data = json.loads(line)
+
+        assert data["message"] == "hello world"
+        assert data["level"] == "INFO"
+        assert data["logger"] == "apps.test"
+        assert data["event_id"] == 5
+        assert "\n" not in line
+
+    def test_background_handler_writes_json(self, tmp_path):
+        """Test records reach the file through the listener thread."""
+        path = tmp_path / "app.log"
+        handler = BackgroundHandler(filename=path, console=False)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(level=logging.ERROR)
+            record.exc_info = sys.exc_info()
+        handler.handle(record)
+        handler.flush()
+        handler.stop()
+
+        data = json.loads(path.read_text())
+        assert data["message"] == "hello world"
+        assert "ValueError: boom" in data["exception"]
+
+    def test_arguments_merged_on_caller_thread(self, tmp_path):
+        """Test later changes to arguments do not alter the logged message."""
+        path = tmp_path / "app.log"
+        handler = BackgroundHandler(filename=path, console=False)
+        state = ["before"]
+        handler.handle(make_record(args=(state,)))
+        state[0] = "after"
+        handler.stop()
+
+        assert json.loads(path.read_text())["message"] == "hello ['before']"
+
+    def test_full_queue_drops_instead_of_blocking(self, tmp_path):
+        """Test a full queue drops records and reports how many."""
+        path = tmp_path / "app.log"
+        handler = BackgroundHandler(filename=path, console=False, queue_size=2)
+        # Pretend the listener runs, so nothing drains the queue
+        handler._pid = os.getpid()
+        for _ in range(4):
+            handler.handle(make_record())
+        assert handler.dropped == 2
+
+        handler._pid = None
+        handler.handle(make_record())
+        handler.flush()
+
+        messages = [json.loads(line)["message"] for line in path.open()]
+        assert messages == [
+            "hello world",
+            "Dropped 2 log records, the log queue was full",
+        ]
+        handler.stop()
+
+    def test_sampling_keeps_warnings(self, monkeypatch):
+        """Test sampling drops info records at the rate but never warnings."""
+        sampling = SamplingFilter(rate=0.25)
+        monkeypatch.setattr("apps.core.logs.random.random", lambda: 0.5)
+
+        assert sampling.filter(make_record()) is False
+        assert sampling.filter(make_record(level=logging.WARNING)) is True
+
+
+@pytest.mark.django_db
+class TestMetrics:
+    """Tests for request timings, Server-Timing and /metrics."""
+
+    @pytest.fixture
+    def event_list(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+        from apps.events.models import Event
+
+        organizer = User.objects.create_user(username="organizer", password="x")
+        Event.objects.create(
+            title="Meetup",
+            description="Talks",
+            date=timezone.now() + timedelta(days=7),
+            location="Hall",
+            organizer=organizer,
+        )
+        return reverse("events:event-list")
+
+    def test_server_timing_header(self, event_list):
+        """Test the header reports the queries run and serializer time."""
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(event_list)
+
+        timing = response["Server-Timing"]
+        assert f'desc="{len(queries)} queries"' in timing
+        assert "serializer;dur=" in timing
+        assert "app;dur=" in timing
+
+    def test_queue_time_from_proxy_header(self):
+        """Test X-Request-Start from the proxy is reported as queueing."""
+        started = f"t={timezone.now().timestamp() - 0.05:.3f}"
+        response = APIClient().get("/", HTTP_X_REQUEST_START=started)
+
+        queue = response["Server-Timing"].split("queue;dur=")[1].split(",")[0]
+        assert float(queue) >= 50
+
+    def test_metrics_per_view(self, event_list):
+        """Test requests are counted and observed under their view name."""
+        labels = ("events:event-list", "GET", "200")
+        before = metrics.requests_total.value(labels)
+        serialized = metrics.request_serializer_duration.count(("events:event-list",))
+
+        APIClient().get(event_list)
+        body = APIClient().get("/metrics").content.decode()
+
+        assert metrics.requests_total.value(labels) == before + 1
+        assert (
+            metrics.request_serializer_duration.count(("events:event-list",))
+            == serialized + 1
+        )
+        assert (
+            'http_requests_total{view="events:event-list",method="GET",status="200"} '
+            f"{before + 1}"
+        ) in body
+        assert "# TYPE http_request_duration_seconds histogram" in body
+
+    def test_metrics_token(self, settings):
+        """Test /metrics requires the bearer token when one is set."""
+        settings.METRICS_TOKEN = "secret"
+        client = APIClient()
+
+        assert client.get("/metrics").status_code == 401
+        response = client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        assert response.status_code == 200
+
+    def test_metrics_closed_without_token_when_required(self, settings):
+        """Test /metrics is not served without a token where one is required."""
+        settings.METRICS_REQUIRE_TOKEN = True
+        settings.METRICS_TOKEN = ""
+
+        assert APIClient().get("/metrics").status_code == 404
+
+    def test_histogram_render(self):
+        """Test buckets are rendered cumulative, with sum and count."""
+        histogram = metrics.Histogram("t_seconds", "Test.", ("view",), (0.1, 1))
+        for value in (0.05, 0.1, 0.5, 3):
+            histogram.observe(value, ("a",))
+
+        lines = histogram.render(histogram.snapshot())
+
+        assert lines[2:] == [
+            't_seconds_bucket{view="a",le="0.1"} 2',
+            't_seconds_bucket{view="a",le="1"} 3',
+            't_seconds_bucket{view="a",le="+Inf"} 4',
+            't_seconds_sum{view="a"} 3.65',
+            't_seconds_count{view="a"} 4',
+        ]
+
+    def test_worker_snapshots_merged(self, settings, tmp_path, monkeypatch):
+        """Test /metrics adds up other workers, folding exited ones."""
+        settings.METRICS_DIR = str(tmp_path)
+        monkeypatch.setattr(metrics, "pid_alive", lambda pid: pid == 1001)
+        labels = ("core:health", "GET", "200")
+        key = json.dumps(labels)
+        for pid in (1001, 1002):
+            (tmp_path / f"{pid}.json").write_text(
+                json.dumps({"http_requests_total": {key: 5}})
+            )
+        own = metrics.requests_total.value(labels)
+
+        state = metrics.REGISTRY.collect()
+
+        assert state["http_requests_total"][key] == own + 10
+        assert not (tmp_path / "1002.json").exists()
+        assert metrics.REGISTRY.collect()["http_requests_total"][key] == own + 10
+
+
+def failing_check():
+    raise CheckFailed("Broken on purpose")
+
+
+def crashing_check():
+    raise ConnectionError("secret host details")
+
+
+@pytest.mark.django_db
+class TestProbes:
+    """Tests for the liveness and readiness probes."""
+
+    def test_liveness(self, django_assert_num_queries):
+        """Test liveness answers without touching dependencies."""
+        with django_assert_num_queries(0):
+            response = APIClient().get(reverse("core:liveness"))
+
+        assert response.status_code == 200
+
+    def test_readiness_checks(self):
+        """Test readiness reports warm-up, database, cache and outbox."""
+        response = APIClient().get(reverse("core:readiness"))
+
+        assert response.status_code == 200
+        checks = response.data["checks"]
+        assert set(checks) == {"warm_up", "database", "cache", "outbox"}
+        assert all(check["ok"] for check in checks.values())
+        assert checks["outbox"]["lag_seconds"] == 0
+
+    def test_results_memoized(self, django_assert_num_queries):
+        """Test probes within the TTL reuse the last result."""
+        client = APIClient()
+        client.get(reverse("core:readiness"))
+
+        with django_assert_num_queries(0):
+            response = client.get(reverse("core:readiness"))
+
+        assert response.status_code == 200
+
+    def test_failed_check(self, settings):
+        """Test a failed check makes the worker unavailable."""
+        settings.READINESS_CHECKS = {
+            "database": "apps.core.health.check_database",
+            "broken": "apps.core.tests.test_core.failing_check",
+            "crashing": "apps.core.tests.test_core.crashing_check",
+        }
+
+        response = APIClient().get(reverse("core:readiness"))
+
+        assert response.status_code == 503
+        assert response.data["status"] == "unavailable"
+        assert response.data["checks"]["database"]["ok"] is True
+        assert response.data["checks"]["broken"] == {
+            "ok": False,
+            "error": "Broken on purpose",
+        }
+        # Unexpected errors are reported by type only
+        assert response.data["checks"]["crashing"]["error"] == "ConnectionError"
+
+    def test_not_ready_until_warmed_up(self, settings):
+        """Test a failed warm-up hook is retried once the result expires."""
+        settings.READINESS_CACHE_TTL = 0
+        settings.WARM_UP_HOOKS = ["apps.core.tests.test_core.failing_check"]
+        client = APIClient()
+
+        response = client.get(reverse("core:readiness"))
+        assert response.status_code == 503
+        assert response.data["checks"]["warm_up"] == {"ok": False}
+
+        settings.WARM_UP_HOOKS = ["apps.core.health.connect_databases"]
+        assert client.get(reverse("core:readiness")).status_code == 200
+
+    def test_outbox_lag(self, settings):
+        """Test an outbox further behind than allowed fails readiness."""
+        from apps.events.models import OutboxEmail
+
+        settings.READINESS_OUTBOX_MAX_LAG = 60
+        OutboxEmail.objects.create(
+            recipient="a@example.com",
+            subject="Hi",
+            body="Hello",
+            next_attempt_at=timezone.now() - timedelta(minutes=5),
+        )
+
+        response = APIClient().get(reverse("core:readiness"))
+
+        assert response.status_code == 503
+        assert "behind" in response.data["checks"]["outbox"]["error"]
+
+
+class FakeConnection:
+    def __init__(self, number):
+        self.number = number
+        self.healthy = True
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestConnectionPool:
+    """Tests for the per-process database connection pool."""
+
+    def make_pool(self, **options):
+        opened = []
+
+        def connect():
+            opened.append(FakeConnection(len(opened)))
+            return opened[-1]
+
+        options = {
+            "max_size": 2,
+            "timeout": 0.05,
+            "max_lifetime": 60,
+            "check_after": 30,
+            **options,
+        }
+        pool = ConnectionPool(
+            "test",
+            check=lambda connection: connection.healthy,
+            close=FakeConnection.close,
+            **options,
+        )
+        return pool, connect, opened
+
+    def test_reuses_returned_connections(self):
+        """Test a returned connection is handed out again without connecting."""
+        pool, connect, opened = self.make_pool()
+
+        first = pool.getconn(connect)
+        pool.putconn(first)
+        second = pool.getconn(connect)
+
+        assert second is first
+        assert len(opened) == 1
+
+    def test_waits_then_times_out(self):
+        """Test callers beyond max_size wait and then fail."""
+        pool, connect, opened = self.make_pool(max_size=1)
+        timeouts = metrics.REGISTRY.metrics["db_pool_timeouts_total"]
+        before = timeouts.value(("test",))
+        held = pool.getconn(connect)
+
+        with pytest.raises(PoolTimeout):
+            pool.getconn(connect)
+        assert timeouts.value(("test",)) == before + 1
+
+        pool.putconn(held)
+        assert pool.getconn(connect) is held
+
+    def test_waiter_gets_returned_connection(self):
+        """Test a waiting caller is woken when a connection comes back."""
+        pool, connect, opened = self.make_pool(max_size=1, timeout=5)
+        held = pool.getconn(connect)
+        result = []
+        waiter = threading.Thread(target=lambda: result.append(pool.getconn(connect)))
+        waiter.start()
+
+        pool.putconn(held)
+        waiter.join()
+
+        assert result == [held]
+        assert len(opened) == 1
+
+    def test_unhealthy_idle_connection_replaced(self):
+        """Test idle connections are checked and broken ones replaced."""
+        pool, connect, opened = self.make_pool(check_after=0)
+        first = pool.getconn(connect)
+        pool.putconn(first)
+        first.healthy = False
+
+        second = pool.getconn(connect)
+
+        assert second is not first
+        assert first.closed
+        assert pool.size == 1
+
+    def test_old_and_broken_connections_closed(self):
+        """Test connections past max_lifetime or not reusable are closed."""
+        pool, connect, opened = self.make_pool(max_lifetime=0)
+        old = pool.getconn(connect)
+        pool.putconn(old)
+        assert old.closed
+
+        pool.max_lifetime = 60
+        broken = pool.getconn(connect)
+        pool.putconn(broken, reusable=False)
+
+        assert broken.closed
+        assert pool.size == 0
+        assert not pool.idle
+
+    def test_failed_connect_frees_slot(self):
+        """Test a failed connection attempt does not use up the pool."""
+        pool, connect, opened = self.make_pool(max_size=1)
+
+        def failing_connect():
+            raise ConnectionError
+
+        with pytest.raises(ConnectionError):
+            pool.getconn(failing_connect)
+
+        assert pool.getconn(connect) is opened[0]
+
+    def test_backend_rolls_back_before_reuse(self):
+        """Test the pooled backend only returns idle, open connections."""
+        from django.db.utils import ConnectionHandler
+        from psycopg2.extensions import TRANSACTION_STATUS_INTRANS
+
+        handler = ConnectionHandler(
+            {"default": {"ENGINE": "apps.core.db.postgresql", "NAME": "events"}}
+        )
+        wrapper = handler["default"]
+        connection = FakeConnection(0)
+        connection.info = type("Info", (), {})()
+        connection.info.transaction_status = TRANSACTION_STATUS_INTRANS
+        connection.rollback = lambda: setattr(connection.info, "transaction_status", 0)
+        wrapper.connection = connection
+
+        assert wrapper.is_reusable()
+        assert connection.info.transaction_status == 0
+        connection.closed = True
+        assert not wrapper.is_reusable()
+
+    def test_pools_per_alias_and_process(self, monkeypatch):
+        """Test each alias keeps its pool, pools of a parent process are dropped."""
+        monkeypatch.setattr(postgresql_base, "_pools", {})
+        settings_dict = {"POOL": {"MAX_SIZE": 1}}
+
+        default = postgresql_base.get_pool("default", settings_dict)
+        replica = postgresql_base.get_pool("replica_1", settings_dict)
+        assert postgresql_base.get_pool("default", settings_dict) is default
+        assert postgresql_base.get_pool("replica_1", settings_dict) is replica
+
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        forked = postgresql_base.get_pool("default", settings_dict)
+        assert forked is not default
+        assert list(postgresql_base._pools) == [("default", -1)]
+
+
+@pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+class TestReplicaRouting:
+    """Tests for read replica routing, "replica" mirrors default in tests."""
+
+    @pytest.fixture(autouse=True)
+    def replicas(self, settings):
+        settings.DATABASE_REPLICAS = ["replica"]
+        settings.RESPONSE_CACHE_ENABLED = False
+
+    @pytest.fixture
+    def event(self):
+        from apps.events.models import Event
+
+        return Event.objects.create(
+            title="Meetup",
+            description="Talks",
+            date=timezone.now() + timedelta(days=7),
+            location="Hall",
+            organizer=User.objects.create_user(username="organizer", password="x"),
+        )
+
+    def request_queries(self, method, url, user=None):
+        """Return the response and queries per database of one request."""
+        client = APIClient()
+        if user is not None:
+            client.force_authenticate(user=user)
+        with CaptureQueriesContext(connections["default"]) as primary:
+            with CaptureQueriesContext(connections["replica"]) as replica:
+                response = getattr(client, method)(url)
+        return response, len(primary), len(replica)
+
+    def test_safe_reads_use_replica(self, event):
+        """Test GET requests read from the replica only."""
+        url = reverse("events:event-detail", kwargs={"pk": event.pk})
+
+        response, primary, replica = self.request_queries("get", url)
+
+        assert response.status_code == 200
+        assert primary == 0
+        assert replica > 0
+
+    def test_writes_and_unsafe_requests_use_primary(self, event):
+        """Test writes, and reads of the same request, use the primary."""
+        user = User.objects.create_user(username="attendee", password="x")
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+
+        response, primary, replica = self.request_queries("post", url, user)
+
+        assert response.status_code == 201
+        assert primary > 0
+        assert replica == 0
+
+    def test_user_pinned_after_write(self, event, settings):
+        """Test a user's reads stay on the primary for the pin window."""
+        user = User.objects.create_user(username="attendee", password="x")
+        other = User.objects.create_user(username="other", password="x")
+        register = reverse("events:event-register", kwargs={"pk": event.pk})
+        detail = reverse("events:event-detail", kwargs={"pk": event.pk})
+        self.request_queries("post", register, user)
+
+        response, primary, replica = self.request_queries("get", detail, user)
+        assert response.data["is_registered"] is True
+        assert replica == 0
+        assert primary > 0
+
+        _, primary, replica = self.request_queries("get", detail, other)
+        assert primary == 0
+
+        caches["default"].delete(f"replica-pin:user:{user.pk}")
+        _, primary, replica = self.request_queries("get", detail, user)
+        assert primary == 0
+        assert replica > 0
+
+    def test_response_cache_filled_from_primary(self, event, settings):
+        """Test cached responses are built from the primary, not a lagging replica."""
+        settings.RESPONSE_CACHE_ENABLED = True
+        url = reverse("events:event-list")
+
+        response, primary, replica = self.request_queries("get", url)
+
+        assert response["X-Cache"] == "MISS"
+        assert primary > 0
+        assert replica == 0
+
+    def test_primary_outside_requests(self, event):
+        """Test code outside requests and use_primary() blocks use the primary."""
+        from apps.events.models import Event
+
+        assert PrimaryReplicaRouter().db_for_read(Event) == "default"
+        with use_primary():
+            assert PrimaryReplicaRouter().db_for_read(Event) == "default"
@@ -0,0 +1,106 @@
+"""
+Sliding window rate limits kept in a shared cache.
+
+Each (scope, client) pair counts requests in fixed windows. A request is
+allowed while the previous window's count, weighted by how much of it still
+overlaps the sliding window, plus the current count stays under the limit.
+That costs one get_many and one incr per request, both atomic on Redis and
+on the local memory cache used in development and tests, and unlike DRF's
+SimpleRateThrottle it keeps no per-request history.
+"""
+
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_rate(rate):
+    """Parse "<requests>/<period>" with period s, sec, m, min, h, hour, d or day."""
+    num, period = rate.split("/")
+    return int(num), DURATIONS[period[0]]
+
+
+def consume(scope, ident, rate):
+    """
+    Count a request against the rate, return None or seconds to wait.
+
+    Rejected requests are not counted, so a client that keeps retrying is
+    let back in as soon as its earlier requests age out.
+    """
+    limit, duration = parse_rate(rate)
+    now = time.time()
+    window, elapsed = divmod(now, duration)
+    prefix = f"throttle:{scope}:{ident}:"
+    current_key, previous_key = f"{prefix}{int(window)}", f"{prefix}{int(window) - 1}"
+
+    cache = caches[settings.THROTTLE_CACHE_ALIAS]
+    counts = cache.get_many([current_key, previous_key])
+    current = counts.get(current_key, 0)
+    previous = counts.get(previous_key, 0)
+
+    if previous * (1 - elapsed / duration) + current + 1 > limit:
+        if limit == 0:
+            # Nothing is ever allowed, ask to retry when the window ends
+            return duration - elapsed
+        if current + 1 > limit:
+            # Wait for this window to end and enough of it to slide out
+            return duration - elapsed + duration * (1 - (limit - 1) / current)
+        return duration * (1 - (limit - 1 - current) / previous) - elapsed
+
+    try:
+        cache.incr(current_key)
+    except ValueError:
+        if not cache.add(current_key, 1, timeout=2 * duration):
+            cache.incr(current_key)
+    return None
+
+
+def check_rate(scope, ident):
+    """
+    Count a request for ident in scope, return None or seconds to wait.
+
+    Scopes without a rate in DEFAULT_THROTTLE_RATES are not limited.
+    """
+    if not settings.THROTTLE_ENABLED:
+        return None
+    rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+    if rate is None:
+        return None
+    return consume(scope, ident, rate)
+
+
+class ScopedSlidingWindowThrottle(BaseThrottle):
+    """
+    Rate limit views that declare a scope, per user or per anonymous IP.
+
+    Views set `throttle_scope`, viewsets may map actions to scopes with
+    `throttle_scopes`.
+    """
+
+    def get_scope(self, view):
+        scopes = getattr(view, "throttle_scopes", None)
+        if scopes is not None:
+            return scopes.get(getattr(view, "action", None))
+        return getattr(view, "throttle_scope", None)
+
+    def get_client_ident(self, request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return f"user:{user.pk}"
+        return f"ip:{self.get_ident(request)}"
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(view)
+        self.wait_seconds = None
+        if scope is not None:
+            self.wait_seconds = check_rate(scope, self.get_client_ident(request))
+        return self.wait_seconds is None
+
+    def wait(self):
+        return math.ceil(self.wait_seconds) if self.wait_seconds else None
@@ -1,9 +1,12 @@
 from django.urls import path
 
-from apps.core.views import HealthCheckView
+from apps.core.views import HealthCheckView, LivenessView, MetricsView, ReadinessView
 
 app_name = "core"
 
 urlpatterns = [
     path("", HealthCheckView.as_view(), name="health"),
+    path("health/live", LivenessView.as_view(), name="liveness"),
+    path("health/ready", ReadinessView.as_view(), name="readiness"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]
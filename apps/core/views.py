@@ -1,3 +1,9 @@
+import hmac
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.views import View
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
@@ -16,3 +22,55 @@ class HealthCheckView(APIView):
                 "version": "1.0.0",
             }
         )
+
+
+class LivenessView(APIView):
+    """Liveness probe: the process answers requests, checks nothing else."""
+
+    authentication_classes = []
+    permission_classes = []
+    # Probes, not part of the API
+    schema = None
+
+    def get(self, request):
+        return Response({"status": "ok"})
+
+
+class ReadinessView(APIView):
+    """
+    Readiness probe: warmed up, database, cache and mail outbox usable.
+
+    Results are memoized per process, see apps/core/health.py.
+    """
+
+    authentication_classes = []
+    permission_classes = []
+    # Probes, not part of the API
+    schema = None
+
+    def get(self, request):
+        from apps.core.health import readiness
+
+        ready, checks = readiness.check()
+        return Response(
+            {"status": "ok" if ready else "unavailable", "checks": checks},
+            status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
+
+
+class MetricsView(View):
+    """Request metrics in the Prometheus text format."""
+
+    def get(self, request):
+        from apps.core.metrics import REGISTRY
+
+        token = settings.METRICS_TOKEN
+        if not token and settings.METRICS_REQUIRE_TOKEN:
+            return HttpResponse(status=404)
+        if token and not hmac.compare_digest(
+            request.headers.get("Authorization", ""), f"Bearer {token}"
+        ):
+            return HttpResponse(status=401)
+        return HttpResponse(
+            REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
@@ -1,7 +1,9 @@
 from django.contrib import admin
+from django.db import transaction
 from unfold.admin import ModelAdmin
 
-from apps.events.models import Event, EventRegistration
+from apps.events.models import Event, EventRegistration, OutboxEmail
+from apps.events.services import RegistrationService
 
 
 @admin.register(Event)
@@ -19,12 +21,7 @@ class EventAdmin(ModelAdmin):
     search_fields = ["title", "description", "location"]
     search_help_text = "Search by title, description, or location"
     date_hierarchy = "date"
-    readonly_fields = ["created_at", "updated_at"]
-
-    def participants_count(self, obj):
-        return obj.registrations.count()
-
-    participants_count.short_description = "Participants"
+    readonly_fields = ["participants_count", "created_at", "updated_at"]
 
 
 @admin.register(EventRegistration)
@@ -35,3 +32,23 @@ class EventRegistrationAdmin(ModelAdmin):
     search_fields = ["user__username", "user__email", "event__title"]
     search_help_text = "Search by username, email, or event title"
     date_hierarchy = "registered_at"
+
+    @transaction.atomic
+    def delete_model(self, request, obj):
+        RegistrationService.release_seats(EventRegistration.objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+
+    @transaction.atomic
+    def delete_queryset(self, request, queryset):
+        RegistrationService.release_seats(queryset)
+        super().delete_queryset(request, queryset)
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(ModelAdmin):
+    list_display = ["id", "recipient", "subject", "status", "attempts", "created_at"]
+    list_display_links = ["id", "recipient"]
+    list_filter = ["status", "created_at"]
+    search_fields = ["recipient", "subject"]
+    search_help_text = "Search by recipient or subject"
+    readonly_fields = ["created_at", "sent_at", "last_error"]
@@ -5,3 +5,10 @@ class EventsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.events"
     verbose_name = "Events"
+
+    def ready(self):
+        from django.db.models.signals import post_migrate
+
+        from apps.events import signals
+
+        post_migrate.connect(signals.repair_search_index, sender=self)
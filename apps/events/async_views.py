@@ -0,0 +1,115 @@
+"""
+Native async versions of the register and participants endpoints.
+
+Routed ahead of EventViewSet when ASYNC_EVENT_VIEWS is enabled (ASGI
+deployments), so a request waiting on the database does not hold a worker
+thread. Responses match the EventViewSet actions byte for byte.
+
+Authentication, permission and throttle checks, error handling and
+rendering are done by an EventViewSet instance set up for the action, so
+the async views follow any change to the viewset's policies. Event lookups
+and the participants page use the async ORM. Django 4.2 has no async
+transactions, so the transactional registration unit still runs through
+sync_to_async.
+"""
+
+import logging
+
+from asgiref.sync import sync_to_async
+from rest_framework import exceptions, status
+from rest_framework.response import Response
+
+from apps.events.models import Event
+from apps.events.pagination import apaginate_participants
+from apps.events.services import RegistrationService
+from apps.events.views import EventViewSet
+
+logger = logging.getLogger(__name__)
+
+
+def action_view(request, action, **kwargs):
+    """Return an EventViewSet set up for the action as the router would."""
+    handler = getattr(EventViewSet, action)
+    view = EventViewSet(
+        action_map=dict(handler.mapping),
+        args=(),
+        kwargs=kwargs,
+        format_kwarg=None,
+        **handler.kwargs,
+    )
+    view.request = view.initialize_request(request, **kwargs)
+    view.headers = view.default_response_headers
+    return view
+
+
+def finalize(view, response):
+    response = view.finalize_response(view.request, response)
+    response.render()
+    return response
+
+
+async def dispatch(request, action, body, **kwargs):
+    """
+    Handle the request as EventViewSet.dispatch does, awaiting body(view).
+
+    The checks of APIView.initial() may query the database (users, rate
+    limits), so they run through sync_to_async.
+    """
+    view = action_view(request, action, **kwargs)
+    try:
+        await sync_to_async(view.initial)(view.request)
+        if view.action is None:
+            raise exceptions.MethodNotAllowed(request.method)
+        response = await body(view)
+    except Exception as exc:
+        response = await sync_to_async(view.handle_exception)(exc)
+    return await sync_to_async(finalize)(view, response)
+
+
+async def get_event(view):
+    """Async get_object() of the viewset, with its object permission checks."""
+    try:
+        event = await Event.objects.aget(pk=view.kwargs["pk"])
+    except Event.DoesNotExist:
+        # Same message as get_object_or_404 in the viewset
+        raise exceptions.NotFound("No Event matches the given query.")
+    view.check_object_permissions(view.request, event)
+    return event
+
+
+async def register(view):
+    event = await get_event(view)
+    user = view.request.user
+
+    if view.request.method == "POST":
+        await sync_to_async(RegistrationService.register_and_notify)(user, event)
+        logger.info("User %s registered for: %s", user.username, event.title)
+        return Response(
+            {"detail": "Successfully registered for the event."},
+            status=status.HTTP_201_CREATED,
+        )
+
+    await sync_to_async(RegistrationService.unregister_and_notify)(user, event)
+    logger.info("User %s unregistered from: %s", user.username, event.title)
+    return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+async def participants(view):
+    event = await get_event(view)
+    return await apaginate_participants(view.request, event, view)
+
+
+async def event_register(request, pk):
+    """Register or unregister current user for the event."""
+    return await dispatch(request, "register", register, pk=pk)
+
+
+async def event_participants(request, pk):
+    """List participants of the event, newest first, keyset paginated."""
+    return await dispatch(request, "participants", participants, pk=pk)
+
+
+# JWT requests carry no session cookie, same as DRF's csrf_exempt views.
+# Django 4.2's csrf_exempt decorator does not support coroutines.
+event_register.csrf_exempt = True
+event_participants.csrf_exempt = True
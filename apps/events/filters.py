@@ -1,7 +1,9 @@
 import django_filters
 from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend, OrderingFilter, SearchFilter
 
 from apps.events.models import Event
+from apps.events.search import search_events
 
 
 class EventFilter(django_filters.FilterSet):
@@ -45,3 +47,47 @@ class EventFilter(django_filters.FilterSet):
         if value:
             return queryset.filter(date__gt=timezone.now())
         return queryset
+
+
+class EventFullTextSearchFilter(BaseFilterBackend):
+    """
+    Full-text search on events via the `?q=` parameter.
+
+    Results are ordered by relevance unless `?ordering=` is given. Keyset
+    pagination orders by its own (field, id) key, so in cursor mode results
+    follow `?ordering=` (default `-date`) and the rank is ignored.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        queryset = search_events(queryset, query)
+        if OrderingFilter.ordering_param not in request.query_params:
+            queryset = queryset.order_by("-search_rank", "-date", "-id")
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search in title, location and description.",
+                "schema": {"type": "string"},
+            }
+        ]
+
+
+class ParticipantSearchFilter(SearchFilter):
+    """
+    `?search=` on participant username and email.
+
+    Used directly by the participants action, whose view-level search_fields
+    describe events.
+    """
+
+    def get_search_fields(self, view, request):
+        return ["user__username", "user__email"]
@@ -0,0 +1,13 @@
+from django.conf import settings
+
+from apps.core.health import CheckFailed
+from apps.events.services import MailOutboxService
+
+
+def check_outbox():
+    """Report how far the mail worker is behind, fail past the allowed lag."""
+    lag = round(MailOutboxService.lag(), 1)
+    max_lag = settings.READINESS_OUTBOX_MAX_LAG
+    if max_lag and lag > max_lag:
+        raise CheckFailed(f"Mail outbox is {lag:.0f}s behind")
+    return {"lag_seconds": lag}
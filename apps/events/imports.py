@@ -0,0 +1,200 @@
+"""
+Batch event creation from JSON arrays or NDJSON streams.
+
+Records are parsed incrementally from the input stream and validated and
+inserted one chunk at a time, so memory use is bounded by the chunk size
+and the largest single record, not by the size of the input.
+"""
+
+import codecs
+import json
+import re
+
+from django.conf import settings
+from django.db import transaction
+
+from apps.core.cache import bump_generations
+from apps.events.models import Event
+from apps.events.serializers import EventBatchSerializer, EventCreateUpdateSerializer
+
+READ_SIZE = 64 * 1024
+# A record that does not parse within this many characters is rejected
+MAX_RECORD_SIZE = 1024 * 1024
+
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+class ImportFormatError(ValueError):
+    """The input is not a JSON array or NDJSON and cannot be resumed."""
+
+
+class InvalidRecord:
+    """Placeholder for an NDJSON line that is not valid JSON."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def _text_chunks(stream):
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    while data := stream.read(READ_SIZE):
+        yield decoder.decode(data) if isinstance(data, bytes) else data
+    if tail := decoder.decode(b"", final=True):
+        yield tail
+
+
+def iter_records(stream):
+    """
+    Yield records from a binary or text stream of JSON or NDJSON.
+
+    The format is detected from the first character: `[` starts a JSON
+    array, anything else is read as one JSON document per line. Invalid
+    NDJSON lines are yielded as InvalidRecord so the rest still imports; a
+    malformed JSON array raises ImportFormatError.
+    """
+    chunks = _text_chunks(stream)
+    buffer = ""
+    for chunk in chunks:
+        buffer = (buffer + chunk).lstrip()
+        if buffer:
+            break
+    if buffer.startswith("["):
+        yield from _iter_array(buffer, 1, chunks)
+    elif buffer:
+        yield from _iter_lines(buffer, chunks)
+
+
+def _iter_lines(buffer, chunks):
+    while True:
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield from _parse_line(line)
+        if len(buffer) > MAX_RECORD_SIZE:
+            raise ImportFormatError(f"Line longer than {MAX_RECORD_SIZE} characters.")
+        chunk = next(chunks, None)
+        if chunk is None:
+            yield from _parse_line(buffer)
+            return
+        buffer += chunk
+
+
+def _parse_line(line):
+    if line.strip():
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            yield InvalidRecord(f"Invalid JSON: {exc}")
+
+
+def _iter_array(buffer, pos, chunks):
+    decoder = json.JSONDecoder()
+    expect_value = True
+    first = True
+    while True:
+        pos = WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            chunk = next(chunks, None)
+            if chunk is None:
+                raise ImportFormatError("Unexpected end of JSON array.")
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+
+        char = buffer[pos]
+        if char == "]" and (first or not expect_value):
+            return
+        if not expect_value:
+            if char != ",":
+                raise ImportFormatError(f"Expected ',' or ']', got {char!r}.")
+            pos += 1
+            expect_value = True
+            continue
+
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as exc:
+            record, end = exc, None
+        # A value reaching the end of the buffer may be cut off (a number or
+        # an incomplete object), so read on and decode it again
+        if end is None or end == len(buffer):
+            chunk = next(chunks, None)
+            if chunk is not None:
+                if len(buffer) - pos > MAX_RECORD_SIZE:
+                    raise ImportFormatError(
+                        f"Record longer than {MAX_RECORD_SIZE} characters."
+                    )
+                buffer, pos = buffer[pos:] + chunk, 0
+                continue
+            if end is None:
+                raise ImportFormatError(f"Invalid JSON: {record}")
+        yield record
+        pos, expect_value, first = end, False, False
+        if pos > READ_SIZE:
+            buffer, pos = buffer[pos:], 0
+
+
+def _chunked(records, size):
+    chunk = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def import_events(records, organizer, chunk_size=None):
+    """
+    Validate and create events for organizer, one chunk at a time.
+
+    Yields (created, errors) per chunk, where errors is a list of
+    {"row": n, "errors": {...}} with 1-based row numbers. Valid rows are
+    inserted with one bulk_create per chunk in its own transaction; invalid
+    rows are skipped. bulk_create sends no post_save signals, so cached
+    event lists are invalidated here.
+    """
+    chunk_size = chunk_size or settings.EVENT_IMPORT_CHUNK_SIZE
+    row = 0
+    for chunk in _chunked(records, chunk_size):
+        errors = {}
+        offsets = []
+        data = []
+        for offset, record in enumerate(chunk):
+            if isinstance(record, InvalidRecord):
+                errors[offset] = {"non_field_errors": [record.error]}
+            else:
+                offsets.append(offset)
+                data.append(record)
+
+        serializer = EventBatchSerializer(
+            child=EventCreateUpdateSerializer(), data=data
+        )
+        serializer.is_valid()
+        events = []
+        for offset, validated, row_errors in zip(
+            offsets, serializer.validated_data, serializer.row_errors
+        ):
+            if row_errors:
+                errors[offset] = row_errors
+            else:
+                events.append(Event(organizer=organizer, **validated))
+        row += len(chunk)
+
+        if events:
+            with transaction.atomic():
+                Event.objects.bulk_create(events)
+                bump_generations("events:list")
+        yield len(events), [
+            {"row": row - len(chunk) + offset + 1, "errors": errors[offset]}
+            for offset in sorted(errors)
+        ]
+
+
+def import_events_report(records, organizer, chunk_size=None):
+    """Run import_events to completion and return a summary dict."""
+    created = 0
+    errors = []
+    for chunk_created, chunk_errors in import_events(records, organizer, chunk_size):
+        created += chunk_created
+        errors.extend(chunk_errors)
+    return {"created": created, "failed": len(errors), "errors": errors}
@@ -0,0 +1,69 @@
+import json
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.imports import ImportFormatError, import_events, iter_records
+
+
+class Command(BaseCommand):
+    help = (
+        "Create events from a JSON array or NDJSON file, in chunks. "
+        "Invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, '-' reads stdin.")
+        parser.add_argument(
+            "--organizer",
+            required=True,
+            help="Username or id of the user who organizes the imported events.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=None,
+            help="Rows validated and inserted per transaction "
+            "(default: EVENT_IMPORT_CHUNK_SIZE).",
+        )
+
+    def handle(self, *args, **options):
+        organizer = self.get_organizer(options["organizer"])
+        created = failed = 0
+        with self.open(options["path"]) as stream:
+            try:
+                for chunk_created, errors in import_events(
+                    iter_records(stream), organizer, options["chunk_size"]
+                ):
+                    created += chunk_created
+                    failed += len(errors)
+                    for error in errors:
+                        self.stderr.write(
+                            f"row {error['row']}: {json.dumps(error['errors'])}"
+                        )
+                    if options["verbosity"] > 1:
+                        self.stdout.write(f"  created: {created}")
+            except ImportFormatError as exc:
+                raise CommandError(
+                    f"{exc} {created} events were created before the error."
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Created {created} events, {failed} rows failed.")
+        )
+
+    def get_organizer(self, value):
+        lookup = {"pk": value} if value.isdigit() else {"username": value}
+        try:
+            return User.objects.get(**lookup)
+        except User.DoesNotExist:
+            raise CommandError(f"User '{value}' does not exist.")
+
+    def open(self, path):
+        if path == "-":
+            return open(sys.stdin.fileno(), "rb", closefd=False)
+        try:
+            return open(path, "rb")
+        except OSError as exc:
+            raise CommandError(str(exc))
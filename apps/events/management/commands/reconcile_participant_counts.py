@@ -0,0 +1,67 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from apps.core.cache import bump_generations
+from apps.events.models import Event, EventRegistration
+
+
+class Command(BaseCommand):
+    help = "Repair drift between Event.participants_count and actual registrations."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of events fixed per UPDATE statement (default: 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drifted events, do not change anything.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        actual_count = Coalesce(
+            Subquery(
+                EventRegistration.objects.filter(event=OuterRef("pk"))
+                .order_by()
+                .values("event")
+                .annotate(total=Count("pk"))
+                .values("total")
+            ),
+            0,
+        )
+        drifted_ids = (
+            Event.objects.annotate(actual=actual_count)
+            .exclude(participants_count=F("actual"))
+            .order_by()
+            .values_list("pk", flat=True)
+        )
+
+        fixed = 0
+        batch = []
+        for pk in drifted_ids.iterator(chunk_size=batch_size):
+            batch.append(pk)
+            if len(batch) >= batch_size:
+                fixed += self._fix(batch, actual_count, options["dry_run"])
+                batch = []
+        if batch:
+            fixed += self._fix(batch, actual_count, options["dry_run"])
+
+        if fixed and not options["dry_run"]:
+            bump_generations("events:list")
+
+        verb = "Found" if options["dry_run"] else "Reconciled"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {fixed} drifted event(s)."))
+
+    @staticmethod
+    def _fix(pks, actual_count, dry_run):
+        # Recomputing inside the UPDATE keeps each row consistent even if
+        # registrations change while the command is running.
+        if dry_run:
+            return len(pks)
+        bump_generations(*(f"events:{pk}" for pk in pks))
+        return Event.objects.filter(pk__in=pks).update(participants_count=actual_count)
@@ -0,0 +1,60 @@
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from apps.events.services import MailOutboxService
+
+
+class Command(BaseCommand):
+    help = "Deliver queued outbox emails in batches over one SMTP connection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.MAIL_OUTBOX_BATCH_SIZE,
+            help="Number of emails claimed per batch.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5.0,
+            help="Seconds to sleep when the outbox is drained (default: 5).",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain currently due emails and exit.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        connection = get_connection(fail_silently=False)
+        total_sent = total_failed = 0
+
+        try:
+            while True:
+                sent, failed = MailOutboxService.deliver_batch(connection, batch_size)
+                total_sent += sent
+                total_failed += failed
+
+                # A full batch means more may be due, keep draining
+                if sent + failed >= batch_size:
+                    continue
+                if options["once"]:
+                    break
+                # Do not keep idle SMTP or stale DB sessions open between polls
+                connection.close()
+                close_old_connections()
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            connection.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Sent {total_sent} email(s), {total_failed} failed.")
+        )
@@ -0,0 +1,190 @@
+import random
+import time
+from array import array
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from apps.core.cache import bump_generations
+from apps.events.models import Event, EventRegistration
+
+TOPICS = [
+    "Python",
+    "Django",
+    "Data",
+    "Cloud",
+    "Security",
+    "DevOps",
+    "Frontend",
+    "Mobile",
+    "AI",
+    "Startup",
+]
+FORMATS = ["Conference", "Meetup", "Workshop", "Hackathon", "Summit", "Webinar"]
+CITIES = ["Kyiv", "Lviv", "Odesa", "Kharkiv", "Dnipro", "Warsaw", "Berlin", "Online"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, events and registrations at volume. "
+        "Deterministic for a given --seed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=10000)
+        parser.add_argument("--events", type=int, default=10000)
+        parser.add_argument(
+            "--registrations",
+            type=int,
+            default=100000,
+            help="Approximate number of registrations to create.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows per bulk INSERT, bounds memory use (default: 5000).",
+        )
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of event popularity, 0 means uniform.",
+        )
+        parser.add_argument(
+            "--prefix", default="seed", help="Username prefix of generated users."
+        )
+        parser.add_argument(
+            "--password",
+            default="SeedPass123!",
+            help="Password shared by all generated users.",
+        )
+
+    def handle(self, *args, **options):
+        for name in ("users", "events", "registrations"):
+            if options[name] < 0:
+                raise CommandError(f"--{name} must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if options["events"] and not options["users"]:
+            raise CommandError("Events need organizers, pass --users of at least 1.")
+        if User.objects.filter(username__startswith=options["prefix"]).exists():
+            raise CommandError(
+                f"Users with prefix '{options['prefix']}' already exist, "
+                f"pass a different --prefix."
+            )
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.verbosity = options["verbosity"]
+        self.now = timezone.now()
+        started = time.monotonic()
+
+        self.user_ids = self.create_users(
+            options["users"], options["prefix"], options["password"]
+        )
+        attendees = self.plan_attendance(
+            options["events"],
+            options["registrations"],
+            options["skew"],
+            len(self.user_ids),
+        )
+        created = self.create_events_and_registrations(attendees)
+        bump_generations("events:list")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {len(self.user_ids)} users, {len(attendees)} events and "
+                f"{created} registrations in {time.monotonic() - started:.1f}s."
+            )
+        )
+
+    def create_users(self, count, prefix, password):
+        """Insert users in chunks sharing one precomputed password hash."""
+        # Hashing once instead of per user is what makes volume feasible
+        password_hash = make_password(password)
+        for start in range(0, count, self.batch_size):
+            User.objects.bulk_create(
+                User(
+                    username=f"{prefix}{i}",
+                    email=f"{prefix}{i}@example.com",
+                    password=password_hash,
+                    date_joined=self.now
+                    - timedelta(minutes=self.rng.randint(0, 60 * 24 * 365)),
+                )
+                for i in range(start, min(start + self.batch_size, count))
+            )
+            self.progress("users", min(start + self.batch_size, count), count)
+        return array(
+            "q",
+            User.objects.filter(username__startswith=prefix)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+            .iterator(chunk_size=self.batch_size),
+        )
+
+    def plan_attendance(self, events, registrations, skew, users):
+        """
+        Return the number of attendees of every event.
+
+        Popularity follows a Zipf distribution over a random ranking of
+        events, so a few events are huge and the long tail is small.
+        """
+        ranks = array("q", range(1, events + 1))
+        self.rng.shuffle(ranks)
+        total_weight = sum(rank**-skew for rank in ranks)
+        return array(
+            "q",
+            (
+                min(users, round(registrations * rank**-skew / total_weight))
+                for rank in ranks
+            ),
+        )
+
+    def create_events_and_registrations(self, attendees):
+        created = 0
+        pending = []
+        for start in range(0, len(attendees), self.batch_size):
+            chunk = attendees[start : start + self.batch_size]
+            events = Event.objects.bulk_create(
+                self.build_event(start + i, count) for i, count in enumerate(chunk)
+            )
+            for event, count in zip(events, chunk):
+                for index in self.rng.sample(range(len(self.user_ids)), count):
+                    pending.append(
+                        EventRegistration(
+                            user_id=self.user_ids[index], event_id=event.pk
+                        )
+                    )
+                    if len(pending) >= self.batch_size:
+                        EventRegistration.objects.bulk_create(pending)
+                        created += len(pending)
+                        pending = []
+            self.progress("events", start + len(chunk), len(attendees))
+        if pending:
+            EventRegistration.objects.bulk_create(pending)
+            created += len(pending)
+        return created
+
+    def build_event(self, index, participants):
+        topic = self.rng.choice(TOPICS)
+        kind = self.rng.choice(FORMATS)
+        city = self.rng.choice(CITIES)
+        return Event(
+            title=f"{topic} {kind} #{index}",
+            description=(
+                f"A {kind.lower()} about {topic} in {city}. "
+                f"Talks, workshops and networking for the {topic} community."
+            ),
+            date=self.now + timedelta(hours=self.rng.randint(-24 * 365, 24 * 365)),
+            location=city,
+            organizer_id=self.rng.choice(self.user_ids),
+            participants_count=participants,
+        )
+
+    def progress(self, label, done, total):
+        if self.verbosity > 1 or done == total:
+            self.stdout.write(f"  {label}: {done}/{total}")
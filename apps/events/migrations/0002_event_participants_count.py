@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:49
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_participants_count(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    EventRegistration = apps.get_model("events", "EventRegistration")
+    counts = (
+        EventRegistration.objects.filter(event=OuterRef("pk"))
+        .order_by()
+        .values("event")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    Event.objects.update(participants_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="participants_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="participants"
+            ),
+        ),
+        migrations.RunPython(backfill_participants_count, migrations.RunPython.noop),
+    ]
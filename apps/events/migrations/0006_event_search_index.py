@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from apps.events.search import install_search_index
+
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from apps.events.search import uninstall_search_index
+
+    uninstall_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+    # Generated tsvector column + GIN index on PostgreSQL, FTS5 table on SQLite.
+    # The column is not part of the Event model, see apps/events/search.py.
+    dependencies = [
+        ("events", "0005_event_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0006_event_search_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="eventregistration",
+            index=models.Index(
+                fields=["event", "registered_at", "id"],
+                name="registration_event_time_idx",
+            ),
+        ),
+    ]
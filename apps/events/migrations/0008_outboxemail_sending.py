@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0007_eventregistration_event_time_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="outboxemail",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("sending", "Sending"),
+                    ("sent", "Sent"),
+                    ("dead", "Dead"),
+                ],
+                default="pending",
+                max_length=10,
+            ),
+        ),
+    ]
@@ -19,11 +19,24 @@ class Event(models.Model):
     organizer = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="organized_events"
     )
+    capacity = models.PositiveIntegerField(
+        blank=True, null=True, help_text="Maximum participants, empty for unlimited"
+    )
+    participants_count = models.PositiveIntegerField(
+        "participants", default=0, editable=False
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ["-date"]
+        # Composite (field, id) indexes back keyset pagination for every
+        # field in EventViewSet.ordering_fields
+        indexes = [
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+            models.Index(fields=["created_at", "id"], name="event_created_at_id_idx"),
+            models.Index(fields=["title", "id"], name="event_title_id_idx"),
+        ]
         verbose_name = "Event"
         verbose_name_plural = "Events"
 
@@ -36,9 +49,11 @@ class Event(models.Model):
         return self.date > timezone.now()
 
     @property
-    def participants_count(self):
-        """Get number of registered participants."""
-        return self.registrations.count()
+    def seats_left(self):
+        """Get number of free seats, or None if capacity is unlimited."""
+        if self.capacity is None:
+            return None
+        return max(self.capacity - self.participants_count, 0)
 
 
 class EventRegistration(models.Model):
@@ -57,6 +72,13 @@ class EventRegistration(models.Model):
     class Meta:
         unique_together = ["user", "event"]
         ordering = ["-registered_at"]
+        # Backs keyset pagination of an event's participants
+        indexes = [
+            models.Index(
+                fields=["event", "registered_at", "id"],
+                name="registration_event_time_idx",
+            ),
+        ]
         verbose_name = "Event Registration"
         verbose_name_plural = "Event Registrations"
 
@@ -67,7 +89,42 @@ class EventRegistration(models.Model):
         is_new = self.pk is None
         super().save(*args, **kwargs)
         if is_new:
-            logger.info(
-                f"User {self.user.username} registered for event: "
-                f"{self.event.title}"
-            )
+            # Ids only: the user and event may not be loaded
+            logger.debug("User %s registered for event %s", self.user_id, self.event_id)
+
+
+class OutboxEmail(models.Model):
+    """
+    Email queued in the same transaction as the change that triggered it.
+
+    Delivered asynchronously by the run_mail_worker management command.
+    A worker claims due emails as SENDING with next_attempt_at as the end
+    of its lease; emails still SENDING after that are claimed again.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        SENDING = "sending", "Sending"
+        SENT = "sent", "Sent"
+        DEAD = "dead", "Dead"
+
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ["next_attempt_at", "id"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+        verbose_name = "Outbox Email"
+        verbose_name_plural = "Outbox Emails"
+
+    def __str__(self):
+        return f"{self.subject} -> {self.recipient}"
@@ -0,0 +1,42 @@
+from apps.core.pagination import FixedKeysetPagination
+from apps.events.filters import ParticipantSearchFilter
+from apps.events.serializers import ParticipantSerializer
+
+
+class ParticipantPagination(FixedKeysetPagination):
+    """Newest registrations first, keyed on (registered_at, id)."""
+
+    ordering = "-registered_at"
+
+
+def participants_query(request, event, view=None):
+    """Return the filtered registrations and their total, if known."""
+    search_filter = ParticipantSearchFilter()
+    registrations = search_filter.filter_queryset(
+        request, event.registrations.select_related("user"), view
+    )
+    searching = bool(search_filter.get_search_terms(request))
+    return registrations, None if searching else event.participants_count
+
+
+def paginate_participants(request, event, view=None):
+    """
+    Return one page of the event's participants as a paginated Response.
+
+    Supports `?search=` on username/email. The total comes from the event's
+    participants_count; searches are not counted.
+    """
+    registrations, count = participants_query(request, event, view)
+    paginator = ParticipantPagination()
+    page = paginator.paginate_queryset(registrations, request, view, count=count)
+    serializer = ParticipantSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
+
+
+async def apaginate_participants(request, event, view=None):
+    """paginate_participants() fetching the page with the async ORM."""
+    registrations, count = participants_query(request, event, view)
+    paginator = ParticipantPagination()
+    page = await paginator.apaginate_queryset(registrations, request, view, count=count)
+    serializer = ParticipantSerializer(page, many=True)
+    return paginator.get_paginated_response(serializer.data)
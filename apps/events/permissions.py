@@ -15,3 +15,13 @@ class IsOrganizerOrReadOnly(permissions.BasePermission):
 
         # Write permissions only for organizer
         return obj.organizer == request.user
+
+
+class IsEventOrganizer(permissions.BasePermission):
+    """
+    Custom permission:
+    - Access only for the event organizer, for reads too
+    """
+
+    def has_object_permission(self, request, view, obj):
+        return obj.organizer == request.user
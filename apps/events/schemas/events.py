@@ -1,4 +1,11 @@
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import serializers
+
+from apps.events.serializers import (
+    EventCreateUpdateSerializer,
+    EventImportErrorSerializer,
+)
 
 TAGS_EVENTS = ["Events"]
 
@@ -38,6 +45,31 @@ destroy_event = extend_schema(
     tags=TAGS_EVENTS,
 )
 
+batch_create_events = extend_schema(
+    summary="Create events in batch",
+    description=(
+        "Create many events from a JSON array or an NDJSON body "
+        "(application/x-ndjson), organized by the current user. Rows are "
+        "validated and inserted in chunks; invalid rows are skipped and "
+        "reported with their 1-based row number."
+    ),
+    tags=TAGS_EVENTS,
+    request={
+        "application/json": EventCreateUpdateSerializer(many=True),
+        "application/x-ndjson": OpenApiTypes.STR,
+    },
+    responses={
+        200: inline_serializer(
+            "EventBatchResponse",
+            fields={
+                "created": serializers.IntegerField(),
+                "failed": serializers.IntegerField(),
+                "errors": EventImportErrorSerializer(many=True),
+            },
+        )
+    },
+)
+
 EVENT_SCHEMAS = {
     "list": list_events,
     "retrieve": retrieve_event,
@@ -45,4 +77,5 @@ EVENT_SCHEMAS = {
     "update": update_event,
     "partial_update": partial_update_event,
     "destroy": destroy_event,
+    "batch": batch_create_events,
 }
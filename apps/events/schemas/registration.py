@@ -1,16 +1,81 @@
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
+from rest_framework import serializers
 
-from apps.events.serializers import ParticipantSerializer
+from apps.events.serializers import (
+    BulkRegistrationResultSerializer,
+    BulkRegistrationSerializer,
+    ParticipantSerializer,
+)
 
 TAGS_REGISTRATION = ["Event Registration"]
 
 list_participants = extend_schema(
     summary="List event participants",
-    description="Get a list of all users registered for this event.",
+    description=(
+        "Get users registered for this event, newest first, in keyset pages. "
+        "`count` is the event's participant total and null when searching."
+    ),
+    tags=TAGS_REGISTRATION,
+    parameters=[
+        OpenApiParameter(
+            "search", OpenApiTypes.STR, description="Search username and email."
+        ),
+        OpenApiParameter("cursor", OpenApiTypes.STR),
+        OpenApiParameter("page_size", OpenApiTypes.INT),
+    ],
+    responses={
+        200: inline_serializer(
+            "PaginatedParticipantList",
+            fields={
+                "count": serializers.IntegerField(allow_null=True),
+                "next": serializers.URLField(allow_null=True),
+                "previous": serializers.URLField(allow_null=True),
+                "results": ParticipantSerializer(many=True),
+            },
+        )
+    },
+)
+
+export_participants = extend_schema(
+    summary="Export event participants",
+    description=(
+        "Stream all participants as CSV or newline-delimited JSON. "
+        "Only the organizer can export."
+    ),
+    tags=TAGS_REGISTRATION,
+    parameters=[
+        OpenApiParameter(
+            "format", OpenApiTypes.STR, enum=["csv", "ndjson"], default="csv"
+        )
+    ],
+    responses={(200, "text/csv"): OpenApiTypes.STR},
+)
+
+bulk_register = extend_schema(
+    summary="Register users in bulk",
+    description=(
+        "Register up to BULK_REGISTRATION_MAX_USERS users, given by id or "
+        "email, and queue their confirmation emails. Reports the outcome per "
+        "user; users beyond the remaining capacity are skipped as "
+        "`event_full`. Only the organizer can register others."
+    ),
     tags=TAGS_REGISTRATION,
-    responses={200: ParticipantSerializer(many=True)},
+    request=BulkRegistrationSerializer,
+    responses={
+        200: inline_serializer(
+            "BulkRegistrationResponse",
+            fields={
+                "created": serializers.IntegerField(),
+                "skipped": serializers.IntegerField(),
+                "results": BulkRegistrationResultSerializer(many=True),
+            },
+        )
+    },
 )
 
 REGISTRATION_SCHEMAS = {
     "participants": list_participants,
+    "export_participants": export_participants,
+    "bulk_register": bulk_register,
 }
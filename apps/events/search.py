@@ -0,0 +1,183 @@
+"""
+Full-text search over event title, location and description.
+
+PostgreSQL keeps a weighted tsvector in a generated column with a GIN index.
+SQLite (local development) keeps an external-content FTS5 table in sync with
+triggers. Both are maintained by the database itself, so bulk inserts and
+queryset updates stay indexed too.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from apps.events.models import Event
+
+EVENT_TABLE = Event._meta.db_table
+FTS_TABLE = f"{EVENT_TABLE}_fts"
+SEARCH_CONFIG = "english"
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+POSTGRES_SETUP = [
+    f"""
+    ALTER TABLE {EVENT_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(location, '')), 'B')
+        || setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    f"""
+    CREATE INDEX IF NOT EXISTS {EVENT_TABLE}_search_vector_idx
+    ON {EVENT_TABLE} USING gin (search_vector)
+    """,
+]
+
+POSTGRES_TEARDOWN = [
+    f"DROP INDEX IF EXISTS {EVENT_TABLE}_search_vector_idx",
+    f"ALTER TABLE {EVENT_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {EVENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {EVENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON {EVENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, location, description)
+        VALUES ('delete', old.id, old.title, old.location, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, location, description)
+        VALUES (new.id, new.title, new.location, new.description);
+    END
+    """,
+]
+
+
+def install_search_index(connection):
+    """Create the search index for the connection's backend."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for sql in POSTGRES_SETUP:
+                cursor.execute(sql)
+        elif connection.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"title, location, description, content='{EVENT_TABLE}', "
+                f"content_rowid='id', tokenize='porter unicode61')"
+            )
+            for sql in SQLITE_TRIGGERS:
+                cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def repair_search_triggers(connection):
+    """
+    Re-create lost SQLite sync triggers and rebuild the FTS table.
+
+    Django rebuilds SQLite tables to apply most ALTERs, and dropping the
+    old table drops its triggers, so this runs after every migrate.
+    """
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE name = %s", [FTS_TABLE]
+        )
+        if not cursor.fetchone()[0]:
+            return
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' "
+            "AND tbl_name = %s",
+            [EVENT_TABLE],
+        )
+        if cursor.fetchone()[0] >= len(SQLITE_TRIGGERS):
+            return
+    install_search_index(connection)
+
+
+def uninstall_search_index(connection):
+    """Drop the search index created by install_search_index."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            for sql in POSTGRES_TEARDOWN:
+                cursor.execute(sql)
+        elif connection.vendor == "sqlite":
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def search_events(queryset, query):
+    """
+    Filter an Event queryset by a free-text query.
+
+    Matches every word of the query, the last one as a prefix so results
+    update while the user types. Matching rows are annotated with
+    `search_rank` (higher is more relevant); title matches weigh most,
+    then location, then description.
+    """
+    tokens = TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return queryset.none()
+
+    vendor = connections[queryset.db].vendor
+    if vendor == "postgresql":
+        tsquery = " & ".join(tokens) + ":*"
+        return (
+            queryset.alias(
+                search_match=RawSQL(
+                    f"{EVENT_TABLE}.search_vector @@ to_tsquery(%s::regconfig, %s)",
+                    [SEARCH_CONFIG, tsquery],
+                    output_field=BooleanField(),
+                )
+            )
+            .filter(search_match=True)
+            .annotate(
+                search_rank=RawSQL(
+                    f"ts_rank_cd({EVENT_TABLE}.search_vector, "
+                    f"to_tsquery(%s::regconfig, %s))",
+                    [SEARCH_CONFIG, tsquery],
+                    output_field=FloatField(),
+                )
+            )
+        )
+
+    if vendor == "sqlite":
+        match = " ".join(f'"{token}"' for token in tokens) + "*"
+        # bm25() is lower-is-better, negate it to match the PostgreSQL rank
+        return queryset.filter(
+            pk__in=RawSQL(
+                f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"(SELECT -bm25({FTS_TABLE}, 10.0, 5.0, 1.0) FROM {FTS_TABLE} "
+                f"WHERE {FTS_TABLE} MATCH %s AND rowid = {EVENT_TABLE}.id)",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    # Other backends: unranked containment matching
+    condition = Q()
+    for token in tokens:
+        condition &= (
+            Q(title__icontains=token)
+            | Q(location__icontains=token)
+            | Q(description__icontains=token)
+        )
+    return queryset.filter(condition).annotate(
+        search_rank=RawSQL("0", [], output_field=FloatField())
+    )
@@ -1,6 +1,10 @@
+from django.conf import settings
 from django.contrib.auth.models import User
-from rest_framework import serializers
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
 
+from apps.core.metrics import timed_serializer
 from apps.events.models import Event, EventRegistration
 
 
@@ -13,12 +17,33 @@ class OrganizerSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
 
-class EventListSerializer(serializers.ModelSerializer):
+class RegistrationStatusMixin:
+    """Provides is_registered for the current user."""
+
+    def get_is_registered(self, obj) -> bool:
+        """
+        Check if current user is registered for this event.
+
+        EventViewSet annotates the flag set-wise with Exists(), the query
+        here is only a fallback for events loaded without the annotation.
+        """
+        if hasattr(obj, "is_registered"):
+            return obj.is_registered
+        request = self.context.get("request")
+        if request and request.user.is_authenticated:
+            return obj.registrations.filter(user=request.user).exists()
+        return False
+
+
+class EventListSerializer(RegistrationStatusMixin, serializers.ModelSerializer):
     """Serializer for event list view."""
 
     organizer = OrganizerSerializer(read_only=True)
     participants_count = serializers.IntegerField(read_only=True)
     is_upcoming = serializers.BooleanField(read_only=True)
+    is_registered = serializers.SerializerMethodField(
+        help_text="Whether the current user is registered for the event."
+    )
 
     class Meta:
         model = Event
@@ -30,16 +55,110 @@ class EventListSerializer(serializers.ModelSerializer):
             "organizer",
             "participants_count",
             "is_upcoming",
+            "is_registered",
+        ]
+
+
+def datetime_representation():
+    """
+    DateTimeField.to_representation with the settings looked up once.
+
+    The field reads DATETIME_FORMAT and the current time zone on every
+    call, which dominates serializing plain rows. Formats other than
+    ISO 8601 with time zone support go through the field itself.
+    """
+    field = serializers.DateTimeField()
+    output_format = api_settings.DATETIME_FORMAT
+    field_timezone = field.default_timezone()
+    if (
+        output_format is None
+        or output_format.lower() != ISO_8601
+        or field_timezone is None
+    ):
+        return field.to_representation
+
+    def to_representation(value):
+        if value is None:
+            return None
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return to_representation
+
+
+class EventListValues:
+    """
+    EventListSerializer output built from .values() rows.
+
+    The list endpoint serializes pages of plain dicts straight from the
+    database row, without model instances and without DRF's per-field
+    machinery. The result must stay identical to EventListSerializer,
+    which the parity tests in apps/events/tests check byte for byte; add
+    a field to both or to neither.
+    """
+
+    columns = (
+        "id",
+        "title",
+        "date",
+        "location",
+        "organizer_id",
+        "organizer__username",
+        "organizer__email",
+        "participants_count",
+    )
+
+    @classmethod
+    def values(cls, queryset, ordering_fields=()):
+        """
+        Return the queryset as rows with the columns serialize() reads.
+
+        `ordering_fields` are selected as well, so keyset pagination can
+        build cursors from the rows. An is_registered annotation is kept.
+        """
+        columns = list(cls.columns)
+        columns += [name for name in ordering_fields if name not in columns]
+        if "is_registered" in queryset.query.annotations:
+            columns.append("is_registered")
+        return queryset.values(*columns)
+
+    @staticmethod
+    @timed_serializer
+    def serialize(rows):
+        """Return the EventListSerializer representation of values() rows."""
+        date = datetime_representation()
+        now = timezone.now()
+        return [
+            {
+                "id": row["id"],
+                "title": row["title"],
+                "date": date(row["date"]),
+                "location": row["location"],
+                "organizer": {
+                    "id": row["organizer_id"],
+                    "username": row["organizer__username"],
+                    "email": row["organizer__email"],
+                },
+                "participants_count": row["participants_count"],
+                "is_upcoming": row["date"] > now,
+                "is_registered": row.get("is_registered", False),
+            }
+            for row in rows
         ]
 
 
-class EventDetailSerializer(serializers.ModelSerializer):
+class EventDetailSerializer(RegistrationStatusMixin, serializers.ModelSerializer):
     """Serializer for event detail view."""
 
     organizer = OrganizerSerializer(read_only=True)
     participants_count = serializers.IntegerField(read_only=True)
+    seats_left = serializers.IntegerField(read_only=True, allow_null=True)
     is_upcoming = serializers.BooleanField(read_only=True)
-    is_registered = serializers.SerializerMethodField()
+    is_registered = serializers.SerializerMethodField(
+        help_text="Whether the current user is registered for the event."
+    )
 
     class Meta:
         model = Event
@@ -50,27 +169,34 @@ class EventDetailSerializer(serializers.ModelSerializer):
             "date",
             "location",
             "organizer",
+            "capacity",
             "participants_count",
+            "seats_left",
             "is_upcoming",
             "is_registered",
             "created_at",
             "updated_at",
         ]
 
-    def get_is_registered(self, obj):
-        """Check if current user is registered for this event."""
-        request = self.context.get("request")
-        if request and request.user.is_authenticated:
-            return obj.registrations.filter(user=request.user).exists()
-        return False
-
 
 class EventCreateUpdateSerializer(serializers.ModelSerializer):
     """Serializer for creating/updating events."""
 
     class Meta:
         model = Event
-        fields = ["id", "title", "description", "date", "location"]
+        fields = ["id", "title", "description", "date", "location", "capacity"]
+
+    def validate_capacity(self, value):
+        """Validate capacity is not below current number of participants."""
+        if (
+            value is not None
+            and self.instance is not None
+            and value < self.instance.participants_count
+        ):
+            raise serializers.ValidationError(
+                "Capacity cannot be less than the number of registered participants."
+            )
+        return value
 
     def create(self, validated_data):
         """Set organizer to current user."""
@@ -78,6 +204,39 @@ class EventCreateUpdateSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class EventBatchSerializer(serializers.ListSerializer):
+    """
+    Validates a batch of events row by row.
+
+    Unlike a plain ListSerializer, one invalid row does not fail the batch:
+    validated_data holds None for invalid rows and row_errors holds the
+    errors of each row ({} when valid), in input order.
+    """
+
+    def to_internal_value(self, data):
+        if not isinstance(data, list):
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Expected a list of events."]}
+            )
+        validated = []
+        self.row_errors = []
+        for item in data:
+            try:
+                validated.append(self.child.run_validation(item))
+                self.row_errors.append({})
+            except serializers.ValidationError as exc:
+                validated.append(None)
+                self.row_errors.append(exc.detail)
+        return validated
+
+
+class EventImportErrorSerializer(serializers.Serializer):
+    """Validation errors of one row of a batch."""
+
+    row = serializers.IntegerField()
+    errors = serializers.DictField()
+
+
 class EventRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for event registration."""
 
@@ -99,3 +258,38 @@ class ParticipantSerializer(serializers.ModelSerializer):
     class Meta:
         model = EventRegistration
         fields = ["id", "username", "email", "registered_at"]
+
+
+class BulkRegistrationSerializer(serializers.Serializer):
+    """Users to register, each given by id or email."""
+
+    users = serializers.ListField(
+        child=serializers.CharField(),
+        allow_empty=False,
+        max_length=settings.BULK_REGISTRATION_MAX_USERS,
+    )
+
+    def validate_users(self, value):
+        """Validate every entry is a user id or an email address."""
+        invalid = [item for item in value if not item.isdigit() and "@" not in item]
+        if invalid:
+            raise serializers.ValidationError(
+                f"Expected user ids or emails, got: {', '.join(invalid[:5])}"
+            )
+        return value
+
+
+class BulkRegistrationResultSerializer(serializers.Serializer):
+    """Outcome of a bulk registration for one requested user."""
+
+    user = serializers.CharField()
+    user_id = serializers.IntegerField(allow_null=True)
+    status = serializers.ChoiceField(
+        choices=[
+            "created",
+            "already_registered",
+            "duplicate",
+            "not_found",
+            "event_full",
+        ]
+    )
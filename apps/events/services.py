@@ -1,24 +1,228 @@
 import logging
+from contextlib import suppress
+from datetime import timedelta
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.contrib.auth.models import User
+from django.core.mail import EmailMessage
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Greatest, Lower
+from django.utils import timezone
 
-from apps.events.models import EventRegistration
+from apps.core.cache import bump_generations
+from apps.core.exceptions import (
+    AlreadyRegisteredError,
+    EventFullError,
+    NotRegisteredError,
+)
+from apps.events.models import Event, EventRegistration, OutboxEmail
 
 logger = logging.getLogger(__name__)
 
 
+class RegistrationService:
+    """Service for registering users to events without overbooking."""
+
+    @staticmethod
+    @transaction.atomic
+    def register(user, event: Event) -> EventRegistration:
+        """
+        Register user for the event.
+
+        The INSERT relies on the unique (user, event) constraint instead of
+        a separate existence check, and the seat is claimed with a single
+        conditional UPDATE that only matches while seats are left. Both run
+        in one transaction, so a full event rolls the registration back.
+        """
+        registration = EventRegistration(user=user, event=event)
+        registration._participants_counted = True
+        try:
+            registration.save()
+        except IntegrityError:
+            raise AlreadyRegisteredError()
+
+        seat_claimed = (
+            Event.objects.filter(pk=event.pk)
+            .filter(Q(capacity__isnull=True) | Q(participants_count__lt=F("capacity")))
+            .update(participants_count=F("participants_count") + 1)
+        )
+        if not seat_claimed:
+            raise EventFullError()
+        return registration
+
+    @staticmethod
+    # Like Django's own deletes: no savepoint inside an outer transaction
+    @transaction.atomic(savepoint=False)
+    def unregister(user, event: Event):
+        """Remove user's registration for the event and give the seat back."""
+        deleted, _ = EventRegistration.objects.filter(user=user, event=event).delete()
+        if not deleted:
+            raise NotRegisteredError()
+        Event.objects.filter(pk=event.pk, participants_count__gt=0).update(
+            participants_count=F("participants_count") - 1
+        )
+        bump_generations("events:list", f"events:{event.pk}")
+
+    @staticmethod
+    def release_seats(registrations):
+        """
+        Decrement the counters of events for registrations about to be deleted.
+
+        Registrations send no delete signals, so Django removes them, also in
+        cascades from a user or an event, with a single DELETE. Code deleting
+        them otherwise than through unregister() calls this first, in the
+        same transaction, to adjust all affected events with one UPDATE.
+        """
+        event_ids = list(
+            registrations.order_by().values_list("event_id", flat=True).distinct()
+        )
+        if not event_ids:
+            return
+        removed = (
+            registrations.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        Event.objects.filter(pk__in=event_ids).update(
+            participants_count=Greatest(F("participants_count") - Subquery(removed), 0)
+        )
+        bump_generations("events:list", *(f"events:{pk}" for pk in event_ids))
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_register(event: Event, identifiers) -> list:
+        """
+        Register many users, given by id or email, for the event.
+
+        Returns one result per identifier, in order, with a status of
+        created, already_registered, duplicate, not_found or event_full.
+        Registrations are inserted with bulk_create per chunk, which skips
+        the post_save signals, so the counter and cached responses are
+        updated here and confirmations are queued as one batch.
+
+        The event row is locked first. A concurrent register() can only
+        commit after claiming its seat on that row, so no other insert for
+        this event can land between the existence check and ours and the
+        counter is incremented by exactly the rows inserted.
+        """
+        chunk_size = settings.BULK_REGISTRATION_CHUNK_SIZE
+        event = Event.objects.select_for_update().get(pk=event.pk)
+        users = RegistrationService._resolve_users(identifiers, chunk_size)
+
+        user_ids = list({user.pk for user in users.values()})
+        registered = set()
+        for start in range(0, len(user_ids), chunk_size):
+            registered.update(
+                EventRegistration.objects.filter(
+                    event=event, user_id__in=user_ids[start : start + chunk_size]
+                ).values_list("user_id", flat=True)
+            )
+
+        seats = None
+        if event.capacity is not None:
+            seats = max(event.capacity - event.participants_count, 0)
+        results = []
+        seen = set()
+        new_users = []
+        for identifier in identifiers:
+            user = users.get(identifier.lower())
+            if user is None:
+                status = "not_found"
+            elif user.pk in seen:
+                status = "duplicate"
+            elif user.pk in registered:
+                status = "already_registered"
+            elif seats is not None and len(new_users) >= seats:
+                status = "event_full"
+            else:
+                status = "created"
+                new_users.append(user)
+            if user is not None:
+                seen.add(user.pk)
+            results.append(
+                {
+                    "user": identifier,
+                    "user_id": user.pk if user else None,
+                    "status": status,
+                }
+            )
+
+        if new_users:
+            EventRegistration.objects.bulk_create(
+                (EventRegistration(user=user, event=event) for user in new_users),
+                batch_size=chunk_size,
+                ignore_conflicts=True,
+            )
+            Event.objects.filter(pk=event.pk).update(
+                participants_count=F("participants_count") + len(new_users)
+            )
+            bump_generations("events:list", f"events:{event.pk}")
+            EmailNotificationService.send_registration_confirmations(event, new_users)
+        return results
+
+    @staticmethod
+    def _resolve_users(identifiers, chunk_size) -> dict:
+        """Map lowercased ids and emails to users, looked up in chunks."""
+        ids = sorted({int(i) for i in identifiers if i.isdigit()})
+        emails = sorted({i.lower() for i in identifiers if not i.isdigit()})
+        users = {}
+        fields = ("id", "username", "email")
+        for start in range(0, len(ids), chunk_size):
+            for user in User.objects.filter(
+                pk__in=ids[start : start + chunk_size]
+            ).only(*fields):
+                users[str(user.pk)] = user
+        for start in range(0, len(emails), chunk_size):
+            # Ordered, so the oldest account wins if an email is not unique
+            for user in (
+                User.objects.annotate(email_lower=Lower("email"))
+                .filter(email_lower__in=emails[start : start + chunk_size])
+                .order_by("-pk")
+                .only(*fields)
+            ):
+                users[user.email_lower] = user
+        return users
+
+    @staticmethod
+    @transaction.atomic
+    def register_and_notify(user, event: Event) -> EventRegistration:
+        """Register user and queue the confirmation in the same transaction."""
+        registration = RegistrationService.register(user, event)
+        EmailNotificationService.send_registration_confirmation(registration)
+        return registration
+
+    @staticmethod
+    @transaction.atomic
+    def unregister_and_notify(user, event: Event):
+        """Unregister user and queue the notification in the same transaction."""
+        RegistrationService.unregister(user, event)
+        EmailNotificationService.send_unregistration_notification(user, event)
+
+
 class EmailNotificationService:
-    """Service for sending email notifications."""
+    """
+    Service for email notifications.
+
+    Emails are written to the outbox, so call these inside the transaction
+    that makes the change; run_mail_worker delivers them afterwards.
+    """
 
     @staticmethod
     def send_registration_confirmation(registration: EventRegistration):
         """
-        Send email confirmation when user registers for an event.
+        Queue email confirmation when user registers for an event.
         """
         user = registration.user
-        event = registration.event
+        subject, message = EmailNotificationService._registration_message(
+            user, registration.event
+        )
+        return MailOutboxService.enqueue(user.email, subject, message)
 
+    @staticmethod
+    def _registration_message(user, event):
         subject = f"Registration Confirmed: {event.title}"
         message = (
             f"Hello {user.username},\n\n"
@@ -29,27 +233,22 @@ class EmailNotificationService:
             f"See you there!\n"
             f"Event Management Team"
         )
+        return subject, message
 
-        try:
-            send_mail(
-                subject=subject,
-                message=message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
-            )
-            logger.info(
-                f"Registration email sent to {user.email} " f"for event {event.title}"
-            )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send registration email to {user.email}: {e}")
-            return False
+    @staticmethod
+    def send_registration_confirmations(event, users):
+        """
+        Queue confirmations for users registered in bulk, one INSERT per batch.
+        """
+        return MailOutboxService.enqueue_many(
+            (user.email, *EmailNotificationService._registration_message(user, event))
+            for user in users
+        )
 
     @staticmethod
     def send_unregistration_notification(user, event):
         """
-        Send email when user unregisters from an event.
+        Queue email when user unregisters from an event.
         """
         subject = f"Unregistered from: {event.title}"
         message = (
@@ -60,19 +259,151 @@ class EmailNotificationService:
             f"We hope to see you at other events!\n"
             f"Event Management Team"
         )
+        return MailOutboxService.enqueue(user.email, subject, message)
 
-        try:
-            send_mail(
-                subject=subject,
-                message=message,
+
+class MailOutboxService:
+    """Service for queueing emails and delivering them in batches."""
+
+    # Due pending emails, and claimed ones whose lease ran out
+    CLAIMABLE = (OutboxEmail.Status.PENDING, OutboxEmail.Status.SENDING)
+
+    @staticmethod
+    def enqueue(recipient, subject, body) -> OutboxEmail:
+        """Queue a single email, a plain INSERT on the request path."""
+        return OutboxEmail.objects.create(
+            recipient=recipient, subject=subject, body=body
+        )
+
+    @staticmethod
+    def enqueue_many(messages, batch_size=1000) -> int:
+        """Queue (recipient, subject, body) tuples with batched INSERTs."""
+        emails = [
+            OutboxEmail(recipient=recipient, subject=subject, body=body)
+            for recipient, subject, body in messages
+        ]
+        OutboxEmail.objects.bulk_create(emails, batch_size=batch_size)
+        return len(emails)
+
+    @staticmethod
+    def retry_delay(attempts):
+        """Exponential backoff before the next delivery attempt."""
+        delay = settings.MAIL_OUTBOX_RETRY_BACKOFF * 2 ** (attempts - 1)
+        return timedelta(seconds=min(delay, settings.MAIL_OUTBOX_MAX_BACKOFF))
+
+    @staticmethod
+    def lag() -> float:
+        """Seconds the longest overdue pending email has been waiting."""
+        oldest = (
+            OutboxEmail.objects.filter(
+                status__in=MailOutboxService.CLAIMABLE,
+                next_attempt_at__lte=timezone.now(),
+            )
+            .order_by("next_attempt_at")
+            .values_list("next_attempt_at", flat=True)
+            .first()
+        )
+        if oldest is None:
+            return 0.0
+        return (timezone.now() - oldest).total_seconds()
+
+    @staticmethod
+    def claim_batch(batch_size) -> list:
+        """
+        Lease a batch of due emails to this worker and count the attempt.
+
+        Rows are locked with SKIP LOCKED (where supported) only while they
+        are marked SENDING, so several workers can drain the outbox and no
+        transaction stays open while messages are sent. Emails of a worker
+        that died are claimed again once MAIL_OUTBOX_LEASE has passed, and
+        count against MAIL_OUTBOX_MAX_ATTEMPTS.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            batch = list(
+                OutboxEmail.objects.select_for_update(skip_locked=True).filter(
+                    status__in=MailOutboxService.CLAIMABLE, next_attempt_at__lte=now
+                )[:batch_size]
+            )
+            claimed = []
+            for email in batch:
+                if (
+                    email.status == OutboxEmail.Status.SENDING
+                    and email.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS
+                ):
+                    # Every attempt ended without a result, e.g. in a crash
+                    email.status = OutboxEmail.Status.DEAD
+                    email.last_error = "Lease expired on the last attempt"
+                    logger.error("Email %s moved to dead letters", email.pk)
+                    continue
+                email.status = OutboxEmail.Status.SENDING
+                email.attempts += 1
+                email.next_attempt_at = now + timedelta(
+                    seconds=settings.MAIL_OUTBOX_LEASE
+                )
+                claimed.append(email)
+            OutboxEmail.objects.bulk_update(
+                batch, ["status", "attempts", "next_attempt_at", "last_error"]
+            )
+        return claimed
+
+    @staticmethod
+    def deliver_batch(connection, batch_size=None):
+        """
+        Deliver one batch of due emails over an already created connection.
+
+        The batch is claimed in one short transaction, sent without any open
+        transaction, and the results are recorded in a second one. Returns
+        (sent, failed).
+        """
+        batch = MailOutboxService.claim_batch(
+            batch_size or settings.MAIL_OUTBOX_BATCH_SIZE
+        )
+        sent_ids = []
+        failed = []
+        for email in batch:
+            message = EmailMessage(
+                subject=email.subject,
+                body=email.body,
                 from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[user.email],
-                fail_silently=False,
+                to=[email.recipient],
+                connection=connection,
             )
+            try:
+                connection.open()
+                connection.send_messages([message])
+                sent_ids.append(email.pk)
+            except Exception as e:
+                logger.error("Failed to send email %s: %s", email.pk, e)
+                email.last_error = str(e)
+                failed.append(email)
+                # Drop a possibly broken session, next message reconnects
+                with suppress(Exception):
+                    connection.close()
+
+        now = timezone.now()
+        for email in failed:
+            if email.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = OutboxEmail.Status.DEAD
+                logger.error("Email %s moved to dead letters", email.pk)
+            else:
+                email.status = OutboxEmail.Status.PENDING
+                email.next_attempt_at = now + MailOutboxService.retry_delay(
+                    email.attempts
+                )
+        with transaction.atomic():
+            if sent_ids:
+                OutboxEmail.objects.filter(pk__in=sent_ids).update(
+                    status=OutboxEmail.Status.SENT,
+                    sent_at=now,
+                    last_error="",
+                )
+            OutboxEmail.objects.bulk_update(
+                failed, ["status", "next_attempt_at", "last_error"]
+            )
+
+        if batch:
             logger.info(
-                f"Unregistration email sent to {user.email} " f"for event {event.title}"
+                "Mail outbox batch: %d sent, %d failed", len(sent_ids), len(failed)
             )
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send unregistration email to {user.email}: {e}")
-            return False
+        return len(sent_ids), len(failed)
@@ -0,0 +1,55 @@
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.core.cache import bump_generations
+from apps.events.models import Event, EventRegistration
+from apps.events.search import repair_search_triggers
+from apps.events.services import RegistrationService
+
+
+@receiver(post_save, sender=EventRegistration)
+def increment_participants_count(sender, instance, created, raw=False, **kwargs):
+    """
+    Keep Event.participants_count in sync when a registration is added.
+
+    RegistrationService.register claims the seat itself with a conditional
+    UPDATE and marks the instance, so it is not counted twice here.
+    """
+    if not created or raw or getattr(instance, "_participants_counted", False):
+        return
+    Event.objects.filter(pk=instance.event_id).update(
+        participants_count=F("participants_count") + 1
+    )
+
+
+@receiver(pre_delete, sender=User)
+def release_user_seats(sender, instance, **kwargs):
+    """
+    Give back the seats of a deleted user's registrations.
+
+    Registrations deliberately have no delete receivers, which would make
+    Django load and signal every row of a cascade instead of deleting them
+    with one query; see RegistrationService.release_seats.
+    """
+    RegistrationService.release_seats(EventRegistration.objects.filter(user=instance))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_responses(sender, instance, **kwargs):
+    """Drop cached list and detail responses of a changed event."""
+    bump_generations("events:list", f"events:{instance.pk}")
+
+
+@receiver(post_save, sender=EventRegistration)
+def invalidate_registration_responses(sender, instance, **kwargs):
+    """Drop cached responses showing the event's participants count."""
+    bump_generations("events:list", f"events:{instance.event_id}")
+
+
+def repair_search_index(sender, using, **kwargs):
+    """Restore full-text search triggers dropped by SQLite table rebuilds."""
+    repair_search_triggers(connections[using])
@@ -1,13 +1,32 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from io import BytesIO, StringIO
 
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import AsyncRequestFactory, RequestFactory
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.utils import timezone
 from rest_framework import status
+from rest_framework.mixins import ListModelMixin
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
 
-from apps.events.models import Event, EventRegistration
+from apps.core.exceptions import AlreadyRegisteredError, EventFullError
+from apps.events import async_views, exports, imports
+from apps.events.exports import stream_participants
+from apps.events.models import Event, EventRegistration, OutboxEmail
+from apps.events.serializers import EventListSerializer, EventListValues
+from apps.events.services import MailOutboxService, RegistrationService
+from apps.events.views import EventViewSet
 
 
 @pytest.fixture
@@ -115,6 +134,89 @@ class TestEventCreate:
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+def event_row(i, **overrides):
+    return {
+        "title": f"Imported {i}",
+        "description": "Imported description",
+        "date": (timezone.now() + timedelta(days=7)).isoformat(),
+        "location": "Kyiv",
+        **overrides,
+    }
+
+
+@pytest.mark.django_db
+class TestEventBatchCreate:
+    """Tests for batch event creation and import_events."""
+
+    def test_json_array_reports_row_errors(self, api_client, create_user):
+        """Test valid rows are created and invalid rows reported by number."""
+        user = create_user()
+        api_client.force_authenticate(user=user)
+        rows = [event_row(0), event_row(1, date="soon"), event_row(2), 42]
+        response = api_client.post(reverse("events:event-batch"), rows, format="json")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 2
+        assert [error["row"] for error in response.data["errors"]] == [2, 4]
+        assert "date" in response.data["errors"][0]["errors"]
+        assert set(Event.objects.values_list("organizer", flat=True)) == {user.pk}
+
+    def test_ndjson_body_in_chunks(self, api_client, create_user, settings):
+        """Test NDJSON is imported across chunks, bad lines do not stop it."""
+        settings.EVENT_IMPORT_CHUNK_SIZE = 2
+        api_client.force_authenticate(user=create_user())
+        lines = [json.dumps(event_row(i)) for i in range(5)]
+        lines.insert(3, "{not json")
+        response = api_client.generic(
+            "POST",
+            reverse("events:event-batch"),
+            "\n".join(lines),
+            content_type="application/x-ndjson",
+        )
+
+        assert response.data["created"] == 5
+        assert [error["row"] for error in response.data["errors"]] == [4]
+        assert Event.objects.count() == 5
+
+    def test_malformed_array_is_rejected(self, api_client, create_user):
+        """Test a JSON array that cannot be parsed returns 400."""
+        api_client.force_authenticate(user=create_user())
+        response = api_client.generic(
+            "POST",
+            reverse("events:event-batch"),
+            '[{"title": "a"} {"title": "b"}]',
+            content_type="application/json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize("read_size", [1, 3, 7, 64])
+    def test_records_split_across_reads(self, monkeypatch, read_size):
+        """Test records cut at any read boundary parse the same."""
+        monkeypatch.setattr(imports, "READ_SIZE", read_size)
+        records = [{"title": "a, ]"}, 12345, [1, {"b": None}], "x"]
+        body = " [ " + ",\n".join(json.dumps(record) for record in records) + " ] "
+
+        assert list(imports.iter_records(BytesIO(body.encode()))) == records
+
+    def test_import_command_streams_large_file(self, create_user, tmp_path):
+        """Test a file larger than the read buffer is imported completely."""
+        organizer = create_user()
+        path = tmp_path / "events.json"
+        path.write_text(json.dumps([event_row(i) for i in range(3000)]))
+        stdout = StringIO()
+        call_command(
+            "import_events",
+            str(path),
+            organizer=organizer.username,
+            chunk_size=500,
+            stdout=stdout,
+        )
+
+        assert "Created 3000 events, 0 rows failed." in stdout.getvalue()
+        assert Event.objects.filter(organizer=organizer).count() == 3000
+
+
 @pytest.mark.django_db
 class TestEventUpdate:
     """Tests for event update endpoint."""
@@ -237,4 +339,1058 @@ class TestEventRegistration:
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2
+        assert response.data["count"] == 2
+        assert len(response.data["results"]) == 2
+
+    def test_participants_keyset_pages(self, api_client, create_event, create_user):
+        """Test participants are paged newest first without gaps or repeats."""
+        event = create_event()
+        for i in range(5):
+            RegistrationService.register(
+                create_user(username=f"user{i}", email=f"u{i}@test.com"), event
+            )
+        url = reverse("events:event-participants", kwargs={"pk": event.pk})
+
+        seen = []
+        response = api_client.get(url, {"page_size": 2})
+        while True:
+            assert response.data["count"] == 5
+            seen += [row["username"] for row in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = api_client.get(response.data["next"])
+
+        assert seen == [f"user{i}" for i in reversed(range(5))]
+
+    def test_participants_search(self, api_client, create_event, create_user):
+        """Test ?search= matches username and email."""
+        event = create_event()
+        for name, email in [("alice", "a@corp.com"), ("bob", "bob@home.com")]:
+            RegistrationService.register(create_user(username=name, email=email), event)
+        url = reverse("events:event-participants", kwargs={"pk": event.pk})
+
+        by_email = api_client.get(url, {"search": "corp"}).data
+        by_name = api_client.get(url, {"search": "BO"}).data
+
+        assert [row["username"] for row in by_email["results"]] == ["alice"]
+        assert [row["username"] for row in by_name["results"]] == ["bob"]
+        assert by_email["count"] is None
+
+
+@pytest.mark.django_db
+class TestParticipantsCount:
+    """Tests for the stored Event.participants_count counter."""
+
+    def test_counter_follows_registrations(self, create_event, create_user):
+        """Test counter is incremented and decremented with registrations."""
+        event = create_event()
+        user = create_user(username="user1", email="u1@test.com")
+        EventRegistration.objects.create(user=user, event=event)
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+        RegistrationService.unregister(user, event)
+        event.refresh_from_db()
+        assert event.participants_count == 0
+
+    def test_counter_follows_user_cascade(self, create_event, create_user):
+        """Test deleting a user decrements counts of their events."""
+        user = create_user(username="user1", email="u1@test.com")
+        other = create_user(username="user2", email="u2@test.com")
+        events = [create_event(organizer=other) for _ in range(2)]
+        for event in events:
+            EventRegistration.objects.create(user=user, event=event)
+        EventRegistration.objects.create(user=other, event=events[0])
+
+        user.delete()
+
+        counts = Event.objects.order_by("pk").values_list(
+            "participants_count", flat=True
+        )
+        assert list(counts) == [1, 0]
+
+    def test_released_seats_of_many_registrations(self, create_event, create_user):
+        """Test release_seats subtracts each event's deleted registrations."""
+        event = create_event()
+        users = [
+            create_user(username=f"user{i}", email=f"u{i}@test.com") for i in range(3)
+        ]
+        for user in users:
+            EventRegistration.objects.create(user=user, event=event)
+        doomed = EventRegistration.objects.filter(user__in=users[:2])
+
+        RegistrationService.release_seats(doomed)
+        doomed.delete()
+
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+    def test_event_delete_removes_registrations_in_one_query(
+        self, create_event, create_user
+    ):
+        """Test registrations are deleted without loading them one by one."""
+        event = create_event()
+        users = User.objects.bulk_create(
+            User(username=f"bulk{i}", email=f"b{i}@test.com") for i in range(50)
+        )
+        EventRegistration.objects.bulk_create(
+            EventRegistration(user=user, event=event) for user in users
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            event.delete()
+
+        registration_queries = [
+            query["sql"]
+            for query in queries
+            if "events_eventregistration" in query["sql"]
+        ]
+        assert len(registration_queries) == 1
+        assert registration_queries[0].startswith("DELETE")
+        assert not EventRegistration.objects.exists()
+
+    def test_list_query_count_is_constant(
+        self, api_client, create_event, create_user, django_assert_num_queries
+    ):
+        """Test listing events does not run a query per row."""
+        organizer = create_user()
+        for i in range(10):
+            event = create_event(title=f"Event {i}", organizer=organizer)
+            EventRegistration.objects.create(
+                user=User.objects.create_user(
+                    username=f"p{i}", email=f"p{i}@test.com", password="pass123!"
+                ),
+                event=event,
+            )
+        url = reverse("events:event-list")
+        # COUNT(*) for pagination + one page SELECT joined with organizer
+        with django_assert_num_queries(2):
+            response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert all(row["participants_count"] == 1 for row in response.data["results"])
+
+    def test_authenticated_list_resolves_is_registered_set_wise(
+        self, api_client, create_event, create_user, django_assert_num_queries
+    ):
+        """Test is_registered on the list costs no per-row queries."""
+        user = create_user()
+        events = [create_event(title=f"Event {i}", organizer=user) for i in range(10)]
+        for event in events[:3]:
+            EventRegistration.objects.create(user=user, event=event)
+        api_client.force_authenticate(user=user)
+        url = reverse("events:event-list")
+        with django_assert_num_queries(2):
+            response = api_client.get(url)
+        # Cache hit: one IN query for the page's flags
+        with django_assert_num_queries(1):
+            cached = api_client.get(url)
+
+        registered = {event.pk for event in events[:3]}
+        for data in (response.data["results"], cached.json()["results"]):
+            assert {row["id"] for row in data if row["is_registered"]} == registered
+
+    def test_seed_data_generates_consistent_rows(self):
+        """Test seed_data creates skewed, counter-consistent data."""
+        call_command(
+            "seed_data",
+            users=50,
+            events=40,
+            registrations=400,
+            batch_size=16,
+            stdout=StringIO(),
+        )
+        counts = sorted(
+            Event.objects.values_list("participants_count", flat=True), reverse=True
+        )
+
+        assert User.objects.count() == 50
+        assert len(counts) == 40
+        assert sum(counts) == EventRegistration.objects.count()
+        assert counts[0] > 10 * counts[len(counts) // 2]
+        out = StringIO()
+        call_command("reconcile_participant_counts", "--dry-run", stdout=out)
+        assert "Found 0 drifted" in out.getvalue()
+
+    @pytest.mark.parametrize(
+        "options",
+        [{"users": 0, "events": 5}, {"registrations": -1}, {"batch_size": 0}],
+    )
+    def test_seed_data_rejects_invalid_arguments(self, options):
+        """Test seed_data validates its arguments before writing anything."""
+        with pytest.raises(CommandError):
+            call_command("seed_data", **options, stdout=StringIO())
+
+        assert not User.objects.exists()
+
+    def test_reconcile_command_repairs_drift(self, create_event, create_user):
+        """Test reconcile_participant_counts fixes drifted counters."""
+        event = create_event()
+        user = create_user(username="user1", email="u1@test.com")
+        EventRegistration.objects.create(user=user, event=event)
+        Event.objects.filter(pk=event.pk).update(participants_count=42)
+
+        call_command("reconcile_participant_counts", stdout=StringIO())
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+
+@pytest.mark.django_db
+class TestEventCapacity:
+    """Tests for event capacity and seat allocation."""
+
+    def test_register_when_full_fails(self, api_client, create_user, create_event):
+        """Test registration is rejected once capacity is reached."""
+        event = create_event()
+        Event.objects.filter(pk=event.pk).update(capacity=1)
+        first = create_user(username="user1", email="u1@test.com")
+        second = create_user(username="user2", email="u2@test.com")
+        RegistrationService.register(first, event)
+
+        api_client.force_authenticate(user=second)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+        response = api_client.post(url)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "event_full"
+        assert not EventRegistration.objects.filter(user=second).exists()
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+    def test_duplicate_register_maps_to_already_registered(
+        self, create_user, create_event
+    ):
+        """Test unique constraint violation surfaces as AlreadyRegisteredError."""
+        event = create_event()
+        user = create_user(username="user1", email="u1@test.com")
+        RegistrationService.register(user, event)
+
+        with pytest.raises(AlreadyRegisteredError):
+            RegistrationService.register(user, event)
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests for cursor pagination of the event list."""
+
+    @pytest.fixture
+    def events(self, create_user):
+        organizer = create_user()
+        same_date = timezone.now() + timedelta(days=3)
+        # Shared dates and titles force tie-breaking on id
+        return Event.objects.bulk_create(
+            Event(
+                title=f"Event {i % 4}",
+                description="Description",
+                date=same_date if i % 2 else same_date + timedelta(days=i),
+                organizer=organizer,
+            )
+            for i in range(25)
+        )
+
+    def collect(self, api_client, params):
+        url = reverse("events:event-list")
+        response = api_client.get(url, {**params, "pagination": "cursor"})
+        pages = [response.data]
+        while response.data["next"]:
+            response = api_client.get(response.data["next"])
+            pages.append(response.data)
+        return pages
+
+    @pytest.mark.parametrize("ordering", ["-date", "date", "title", "-created_at"])
+    def test_walks_every_event_once(self, api_client, events, ordering):
+        """Test keyset pages cover all events without duplicates."""
+        pages = self.collect(api_client, {"ordering": ordering})
+        ids = [row["id"] for page in pages for row in page["results"]]
+
+        assert len(pages) == 3
+        assert "count" not in pages[0]
+        assert sorted(ids) == sorted(event.pk for event in events)
+        assert len(ids) == len(set(ids))
+
+    def test_previous_link_returns_previous_page(self, api_client, events):
+        """Test previous link returns the same rows as the page before."""
+        pages = self.collect(api_client, {"ordering": "title"})
+        response = api_client.get(pages[1]["previous"])
+
+        assert response.data["results"] == pages[0]["results"]
+        assert response.data["previous"] is None
+
+    def test_invalid_cursor(self, api_client):
+        """Test a malformed cursor returns 404."""
+        url = reverse("events:event-list")
+        response = api_client.get(url, {"cursor": "bogus"})
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_estimated_count_used_when_unfiltered(
+        self, api_client, events, settings, monkeypatch
+    ):
+        """Test unfiltered lists report the estimate instead of COUNT(*)."""
+        settings.PAGINATION_ESTIMATED_COUNT = True
+        settings.PAGINATION_ESTIMATE_THRESHOLD = 1
+        monkeypatch.setattr(
+            "apps.core.pagination.estimate_row_count", lambda queryset: 1000
+        )
+        url = reverse("events:event-list")
+
+        assert api_client.get(url).data["count"] == 1000
+        assert api_client.get(url, {"title": "Event 1"}).data["count"] == 6
+
+
+@pytest.mark.django_db
+class TestListValues:
+    """Tests the values() list fast path matches EventListSerializer."""
+
+    @pytest.fixture(autouse=True)
+    def uncached(self, settings):
+        settings.RESPONSE_CACHE_ENABLED = False
+
+    @pytest.fixture
+    def events(self, create_user):
+        organizer = create_user(username="organizer", email="Ørganizer@example.com")
+        other = create_user(username="other", email="other@example.com")
+        now = timezone.now()
+        events = [
+            Event.objects.create(
+                title=f'Event {i % 3} «ünïcode» "quoted"',
+                description="Description",
+                date=now + timedelta(days=i - 5, microseconds=i * 1001),
+                location=None if i % 4 == 0 else f"Room {i}",
+                organizer=organizer if i % 2 else other,
+            )
+            for i in range(12)
+        ]
+        for event in events[::3]:
+            RegistrationService.register(other, event)
+        return events
+
+    def responses(self, api_client, monkeypatch, params):
+        """Return the list response bytes of the fast path and the serializer."""
+        url = reverse("events:event-list")
+        fast = api_client.get(url, params)
+        monkeypatch.setattr(EventViewSet, "list_values", ListModelMixin.list)
+        slow = api_client.get(url, params)
+        monkeypatch.undo()
+        assert fast.status_code == slow.status_code == status.HTTP_200_OK
+        return fast.content, slow.content
+
+    @pytest.mark.parametrize("authenticated", [False, True])
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {},
+            {"ordering": "title"},
+            {"ordering": "-created_at", "page_size": 5},
+            {"pagination": "cursor", "ordering": "date", "page_size": 5},
+            {"location": "room", "upcoming": "true"},
+            {"q": "event"},
+            {"page": 2, "page_size": 5},
+        ],
+    )
+    def test_matches_serializer(
+        self, api_client, monkeypatch, events, authenticated, params
+    ):
+        """Test the fast path renders the same bytes as the serializer."""
+        if authenticated:
+            api_client.force_authenticate(User.objects.get(username="other"))
+        fast, slow = self.responses(api_client, monkeypatch, params)
+
+        assert fast == slow
+        assert json.loads(fast)["results"]
+
+    def test_matches_serializer_on_every_cursor_page(
+        self, api_client, monkeypatch, events
+    ):
+        """Test cursors built from rows lead to the same pages."""
+        params = {"pagination": "cursor", "ordering": "-created_at", "page_size": 5}
+        pages = 0
+        while params:
+            fast, slow = self.responses(api_client, monkeypatch, params)
+            assert fast == slow
+            pages += 1
+            next_url = json.loads(fast)["next"]
+            params = next_url and dict(QueryDict(next_url.split("?", 1)[1]).items())
+
+        assert pages == 3
+
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            {"TIME_ZONE": "America/St_Johns"},
+            {"USE_TZ": False},
+            {"REST_FRAMEWORK": {"DATETIME_FORMAT": "%d.%m.%Y %H:%M"}},
+        ],
+    )
+    def test_matches_serializer_with_date_settings(
+        self, create_event, settings, overrides
+    ):
+        """Test dates follow the time zone and DATETIME_FORMAT settings."""
+        create_event(location=None)
+        for name, value in overrides.items():
+            setattr(settings, name, value)
+        queryset = Event.objects.select_related("organizer")
+        renderer = JSONRenderer()
+
+        assert renderer.render(
+            EventListValues.serialize(EventListValues.values(queryset))
+        ) == renderer.render(EventListSerializer(queryset, many=True).data)
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    """Tests for full-text search with ?q=."""
+
+    def test_search_ranks_title_matches_first(
+        self, api_client, create_event, create_user
+    ):
+        """Test matches are found in any field and title matches rank first."""
+        organizer = create_user()
+        in_description = create_event(
+            title="Meetup", description="Talks about python", organizer=organizer
+        )
+        in_title = create_event(
+            title="Python Conference", description="Talks", organizer=organizer
+        )
+        create_event(title="Rust Meetup", description="Talks", organizer=organizer)
+
+        url = reverse("events:event-list")
+        response = api_client.get(url, {"q": "python"})
+
+        ids = [row["id"] for row in response.data["results"]]
+        assert ids == [in_title.pk, in_description.pk]
+
+    def test_search_ties_ordered_by_id(self, api_client, create_event, create_user):
+        """Test events with equal rank and date are ordered newest id first."""
+        organizer = create_user()
+        date = timezone.now() + timedelta(days=3)
+        events = [
+            create_event(title="Python", date=date, organizer=organizer)
+            for _ in range(3)
+        ]
+        url = reverse("events:event-list")
+        response = api_client.get(url, {"q": "python"})
+
+        ids = [row["id"] for row in response.data["results"]]
+        assert ids == [event.pk for event in reversed(events)]
+
+    def test_search_in_cursor_mode_follows_ordering(
+        self, api_client, create_event, create_user
+    ):
+        """Test keyset pages of a search are ordered by date, not rank."""
+        organizer = create_user()
+        later = create_event(
+            title="Meetup",
+            description="python",
+            date=timezone.now() + timedelta(days=9),
+            organizer=organizer,
+        )
+        sooner = create_event(
+            title="Python Python",
+            date=timezone.now() + timedelta(days=2),
+            organizer=organizer,
+        )
+        url = reverse("events:event-list")
+        response = api_client.get(url, {"q": "python", "pagination": "cursor"})
+
+        ids = [row["id"] for row in response.data["results"]]
+        assert ids == [later.pk, sooner.pk]
+
+    def test_search_matches_prefix_and_stems(self, api_client, create_event):
+        """Test the last word matches as a prefix and words are stemmed."""
+        event = create_event(title="Django workshops")
+        url = reverse("events:event-list")
+
+        assert api_client.get(url, {"q": "djan"}).data["results"][0]["id"] == event.pk
+        assert api_client.get(url, {"q": "workshop django"}).data["count"] == 1
+        assert api_client.get(url, {"q": "flask"}).data["count"] == 0
+
+    def test_search_index_follows_updates(self, api_client, create_event):
+        """Test updated and deleted events are reindexed."""
+        event = create_event(title="Old name")
+        Event.objects.filter(pk=event.pk).update(title="Renamed")
+        url = reverse("events:event-list")
+
+        assert api_client.get(url, {"q": "old"}).data["count"] == 0
+        assert api_client.get(url, {"q": "renamed"}).data["count"] == 1
+        event.delete()
+        assert api_client.get(url, {"q": "renamed"}).data["count"] == 0
+
+    def test_search_combines_with_filters(self, api_client, create_event, create_user):
+        """Test ?q= works alongside EventFilter parameters."""
+        organizer = create_user()
+        create_event(title="Python Kyiv", location="Kyiv", organizer=organizer)
+        create_event(title="Python Lviv", location="Lviv", organizer=organizer)
+        url = reverse("events:event-list")
+        response = api_client.get(url, {"q": "python", "location": "lviv"})
+
+        assert [row["title"] for row in response.data["results"]] == ["Python Lviv"]
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Tests for the versioned list/detail response cache."""
+
+    def test_anonymous_list_served_from_cache(
+        self, api_client, create_event, django_assert_num_queries
+    ):
+        """Test a repeated list request is served without queries."""
+        create_event()
+        url = reverse("events:event-list")
+        first = api_client.get(url, {"ordering": "-date", "title": "Test"})
+        with django_assert_num_queries(0):
+            second = api_client.get(url, {"title": "Test", "ordering": "-date"})
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+
+    def test_registration_invalidates_cached_responses(
+        self, api_client, create_event, create_user
+    ):
+        """Test registering bumps the generation of list and detail."""
+        event = create_event()
+        list_url = reverse("events:event-list")
+        detail_url = reverse("events:event-detail", kwargs={"pk": event.pk})
+        api_client.get(list_url)
+        api_client.get(detail_url)
+
+        RegistrationService.register(
+            create_user(username="user1", email="u1@test.com"), event
+        )
+
+        response = api_client.get(list_url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["results"][0]["participants_count"] == 1
+        assert api_client.get(detail_url).data["participants_count"] == 1
+
+    def test_padded_pk_follows_event_generation(
+        self, api_client, create_event, create_user
+    ):
+        """Test a detail URL with a zero-padded pk is invalidated too."""
+        event = create_event()
+        url = f"{reverse('events:event-list')}0{event.pk}/"
+        assert api_client.get(url).data["participants_count"] == 0
+
+        RegistrationService.register(
+            create_user(username="user1", email="u1@test.com"), event
+        )
+
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.data["participants_count"] == 1
+
+    def test_non_numeric_pk_not_found(self, api_client):
+        """Test a pk that is not a number is a plain 404."""
+        response = api_client.get(f"{reverse('events:event-list')}abc/")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_is_registered_layered_per_user(
+        self, api_client, create_event, create_user
+    ):
+        """Test the shared cached body never leaks another user's flag."""
+        event = create_event()
+        registered = create_user(username="user1", email="u1@test.com")
+        other = create_user(username="user2", email="u2@test.com")
+        EventRegistration.objects.create(user=registered, event=event)
+        url = reverse("events:event-detail", kwargs={"pk": event.pk})
+
+        api_client.force_authenticate(user=registered)
+        assert api_client.get(url).json()["is_registered"] is True
+
+        api_client.force_authenticate(user=other)
+        response = api_client.get(url)
+        assert response["X-Cache"] == "HIT"
+        assert response.json()["is_registered"] is False
+
+        api_client.force_authenticate(user=None)
+        assert api_client.get(url).json()["is_registered"] is False
+
+        api_client.force_authenticate(user=registered)
+        assert api_client.get(url).json()["is_registered"] is True
+
+
+class FailingConnection:
+    """Email backend stand-in whose every delivery fails."""
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        raise ConnectionError("relay unavailable")
+
+
+@pytest.mark.django_db
+class TestMailOutbox:
+    """Tests for the transactional email outbox."""
+
+    def test_register_queues_email_without_sending(
+        self, api_client, create_user, create_event
+    ):
+        """Test registration writes to the outbox instead of sending."""
+        user = create_user(username="user1", email="u1@test.com")
+        event = create_event()
+        api_client.force_authenticate(user=user)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+        api_client.post(url)
+
+        assert len(mail.outbox) == 0
+        queued = OutboxEmail.objects.get()
+        assert queued.recipient == "u1@test.com"
+        assert queued.status == OutboxEmail.Status.PENDING
+
+    def test_worker_delivers_pending_emails(self):
+        """Test run_mail_worker drains the outbox."""
+        for i in range(3):
+            MailOutboxService.enqueue(f"u{i}@test.com", "Subject", "Body")
+
+        call_command("run_mail_worker", "--once", stdout=StringIO())
+
+        assert len(mail.outbox) == 3
+        assert not OutboxEmail.objects.exclude(status=OutboxEmail.Status.SENT).exists()
+
+    def test_failed_delivery_is_retried_then_dead_lettered(self, settings):
+        """Test failures back off and end in the dead state."""
+        settings.MAIL_OUTBOX_MAX_ATTEMPTS = 2
+        email = MailOutboxService.enqueue("u1@test.com", "Subject", "Body")
+
+        assert MailOutboxService.deliver_batch(FailingConnection()) == (0, 1)
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.PENDING
+        assert email.attempts == 1
+        assert email.next_attempt_at > timezone.now()
+        assert "relay unavailable" in email.last_error
+
+        OutboxEmail.objects.update(next_attempt_at=timezone.now())
+        MailOutboxService.deliver_batch(FailingConnection())
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.DEAD
+
+    def test_sends_outside_transaction_with_lease(self):
+        """Test messages are sent after the claim committed, under a lease."""
+        email = MailOutboxService.enqueue("u1@test.com", "Subject", "Body")
+        seen = []
+
+        class RecordingConnection(FailingConnection):
+            def send_messages(self, messages):
+                seen.append(
+                    (
+                        len(connection.savepoint_ids),
+                        OutboxEmail.objects.get(pk=email.pk),
+                        MailOutboxService.claim_batch(10),
+                    )
+                )
+                return len(messages)
+
+        # Inside the test case's transaction, atomic() adds a savepoint
+        test_depth = len(connection.savepoint_ids)
+        assert MailOutboxService.deliver_batch(RecordingConnection()) == (1, 0)
+
+        [(depth, claimed, other_worker_batch)] = seen
+        assert depth == test_depth
+        assert claimed.status == OutboxEmail.Status.SENDING
+        assert claimed.next_attempt_at > timezone.now()
+        assert other_worker_batch == []
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.SENT
+        assert email.attempts == 1
+
+    def test_expired_lease_is_claimed_again(self, settings):
+        """Test emails of a crashed worker are retried, then dead-lettered."""
+        settings.MAIL_OUTBOX_MAX_ATTEMPTS = 2
+        email = MailOutboxService.enqueue("u1@test.com", "Subject", "Body")
+        for _ in range(2):
+            assert MailOutboxService.claim_batch(10) == [email]
+            # The worker dies and its lease runs out
+            OutboxEmail.objects.update(next_attempt_at=timezone.now())
+
+        assert MailOutboxService.claim_batch(10) == []
+        email.refresh_from_db()
+        assert email.status == OutboxEmail.Status.DEAD
+        assert email.attempts == 2
+
+
+@pytest.mark.django_db
+class TestParticipantExport:
+    """Tests for the streaming participant export."""
+
+    def register_users(self, event, count, create_user):
+        for i in range(count):
+            EventRegistration.objects.create(
+                user=create_user(username=f"user{i}", email=f"u{i}@test.com"),
+                event=event,
+            )
+
+    def test_csv_export_streams_all_participants(
+        self, api_client, create_user, create_event
+    ):
+        """Test the organizer gets a CSV stream in registration order."""
+        event = create_event()
+        self.register_users(event, 3, create_user)
+        api_client.force_authenticate(user=event.organizer)
+        url = reverse("events:event-export-participants", kwargs={"pk": event.pk})
+        response = api_client.get(url, {"format": "csv"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.streaming
+        assert response["Content-Type"] == "text/csv; charset=utf-8"
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        assert lines[0] == "id,username,email,registered_at"
+        assert [line.split(",")[1] for line in lines[1:]] == [
+            "user0",
+            "user1",
+            "user2",
+        ]
+
+    def test_ndjson_export_matches_participants(
+        self, api_client, create_user, create_event
+    ):
+        """Test NDJSON rows are the same objects the participants action returns."""
+        event = create_event()
+        self.register_users(event, 3, create_user)
+        api_client.force_authenticate(user=event.organizer)
+        url = reverse("events:event-export-participants", kwargs={"pk": event.pk})
+        response = api_client.get(url, HTTP_ACCEPT="application/x-ndjson")
+
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        participants = api_client.get(
+            reverse("events:event-participants", kwargs={"pk": event.pk})
+        ).json()["results"]
+        assert rows == sorted(participants, key=lambda row: row["id"])
+
+    def test_asgi_export_streams_async(self, create_user, create_event):
+        """Test ASGI requests get an async body, Django would buffer a sync one."""
+        event = create_event()
+        self.register_users(event, 2, create_user)
+        request = AsyncRequestFactory().get("/")
+        response = stream_participants(request, event, "csv")
+
+        async def consume():
+            return b"".join([part async for part in response.streaming_content])
+
+        assert response.is_async
+        assert async_to_sync(consume)().count(b"\n") == 3
+
+    def test_export_without_server_side_cursors(
+        self, create_user, create_event, monkeypatch
+    ):
+        """Test keyset pages return the same rows as the chunked iterator."""
+        event = create_event()
+        self.register_users(event, 5, create_user)
+        # Same registration time for all, so pages continue by id
+        EventRegistration.objects.update(registered_at=timezone.now())
+        request = RequestFactory().get("/")
+        expected = b"".join(stream_participants(request, event, "csv"))
+
+        monkeypatch.setattr(exports, "CHUNK_SIZE", 2)
+        monkeypatch.setitem(
+            connection.settings_dict, "DISABLE_SERVER_SIDE_CURSORS", True
+        )
+        with CaptureQueriesContext(connection) as queries:
+            body = b"".join(stream_participants(request, event, "csv"))
+
+        assert body == expected
+        assert len(queries) == 3
+
+    def test_export_is_organizer_only(self, api_client, create_user, create_event):
+        """Test other users cannot export the attendee list."""
+        event = create_event()
+        url = reverse("events:event-export-participants", kwargs={"pk": event.pk})
+
+        assert api_client.get(url).status_code == status.HTTP_401_UNAUTHORIZED
+        api_client.force_authenticate(
+            user=create_user(username="user1", email="u1@test.com")
+        )
+        assert api_client.get(url).status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+class TestBulkRegistration:
+    """Tests for the organizer bulk registration endpoint."""
+
+    def post(self, api_client, event, users):
+        api_client.force_authenticate(user=event.organizer)
+        url = reverse("events:event-bulk-register", kwargs={"pk": event.pk})
+        return api_client.post(url, {"users": users}, format="json")
+
+    def test_reports_outcome_per_user(self, api_client, create_user, create_event):
+        """Test ids and emails are registered and every skip is explained."""
+        event = create_event()
+        users = [
+            create_user(username=f"user{i}", email=f"u{i}@test.com") for i in range(3)
+        ]
+        EventRegistration.objects.create(user=users[2], event=event)
+        response = self.post(
+            api_client,
+            event,
+            [str(users[0].pk), "U1@TEST.com", str(users[2].pk), "u0@test.com", "999"],
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["created"] == 2
+        assert response.data["skipped"] == 3
+        assert [row["status"] for row in response.data["results"]] == [
+            "created",
+            "created",
+            "already_registered",
+            "duplicate",
+            "not_found",
+        ]
+        event.refresh_from_db()
+        assert event.participants_count == 3
+        assert sorted(OutboxEmail.objects.values_list("recipient", flat=True)) == [
+            "u0@test.com",
+            "u1@test.com",
+        ]
+
+    def test_stops_at_capacity(self, api_client, create_user, create_event):
+        """Test users beyond the remaining seats are skipped as event_full."""
+        event = create_event()
+        Event.objects.filter(pk=event.pk).update(capacity=2)
+        users = [
+            create_user(username=f"user{i}", email=f"u{i}@test.com") for i in range(4)
+        ]
+        response = self.post(api_client, event, [str(user.pk) for user in users])
+
+        assert [row["status"] for row in response.data["results"]] == [
+            "created",
+            "created",
+            "event_full",
+            "event_full",
+        ]
+        event.refresh_from_db()
+        assert event.participants_count == event.registrations.count() == 2
+
+    def test_thousands_of_users_in_batched_queries(
+        self, api_client, create_event, settings, django_assert_max_num_queries
+    ):
+        """Test users are looked up and inserted in batches, not per row."""
+        settings.BULK_REGISTRATION_CHUNK_SIZE = 500
+        event = create_event()
+        User.objects.bulk_create(
+            User(username=f"bulk{i}", email=f"bulk{i}@test.com", password="!")
+            for i in range(2000)
+        )
+        ids = User.objects.filter(username__startswith="bulk").values_list(
+            "pk", flat=True
+        )
+
+        # SQLite caps the parameters per statement, so its INSERT batches
+        # are smaller than the chunk size; still a few dozen queries at most
+        with django_assert_max_num_queries(50):
+            response = self.post(api_client, event, [str(pk) for pk in ids])
+
+        assert response.data["created"] == 2000
+        assert event.registrations.count() == 2000
+        assert OutboxEmail.objects.count() == 2000
+
+    def test_organizer_only(self, api_client, create_user, create_event):
+        """Test other users cannot register people for the event."""
+        event = create_event()
+        other = create_user(username="user1", email="u1@test.com")
+        api_client.force_authenticate(user=other)
+        url = reverse("events:event-bulk-register", kwargs={"pk": event.pk})
+        response = api_client.post(url, {"users": [str(other.pk)]}, format="json")
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert not EventRegistration.objects.exists()
+
+
+@pytest.mark.django_db
+class TestAsyncEventViews:
+    """Tests for the async register and participants views."""
+
+    @staticmethod
+    def call(view, method, user=None, **kwargs):
+        headers = {}
+        if user is not None:
+            headers["Authorization"] = f"Bearer {AccessToken.for_user(user)}"
+        request = getattr(AsyncRequestFactory(), method)("/", headers=headers)
+        return async_to_sync(view)(request, **kwargs)
+
+    def test_register_and_unregister(self, create_user, create_event):
+        """Test the async view registers, unregisters and queues emails."""
+        user = create_user(username="user1", email="u1@test.com")
+        event = create_event()
+
+        response = self.call(async_views.event_register, "post", user, pk=event.pk)
+        assert response.status_code == status.HTTP_201_CREATED
+        event.refresh_from_db()
+        assert event.participants_count == 1
+
+        response = self.call(async_views.event_register, "delete", user, pk=event.pk)
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert not EventRegistration.objects.exists()
+        assert OutboxEmail.objects.count() == 2
+
+    def test_register_errors_match_viewset(self, api_client, create_user, create_event):
+        """Test error bodies and status codes are the same as the viewset's."""
+        user = create_user(username="user1", email="u1@test.com")
+        event = create_event()
+        EventRegistration.objects.create(user=user, event=event)
+        api_client.force_authenticate(user=user)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+
+        cases = [
+            (("post", user, event.pk), api_client.post(url)),
+            (("post", None, event.pk), APIClient().post(url)),
+            (
+                ("post", user, event.pk + 1),
+                api_client.post(
+                    reverse("events:event-register", kwargs={"pk": event.pk + 1})
+                ),
+            ),
+            (("get", user, event.pk), api_client.get(url)),
+        ]
+        for (method, as_user, pk), expected in cases:
+            response = self.call(async_views.event_register, method, as_user, pk=pk)
+            assert response.status_code == expected.status_code
+            assert response.content == expected.content
+
+    def test_participants_match_viewset(self, api_client, create_user, create_event):
+        """Test the async participants body is identical to the viewset's."""
+        event = create_event()
+        for i in range(3):
+            EventRegistration.objects.create(
+                user=create_user(username=f"user{i}", email=f"u{i}@test.com"),
+                event=event,
+            )
+        url = reverse("events:event-participants", kwargs={"pk": event.pk})
+
+        response = self.call(async_views.event_participants, "get", pk=event.pk)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.content == api_client.get(url).content
+
+    def test_participants_pages_match_viewset(
+        self, api_client, create_user, create_event
+    ):
+        """Test cursor and search pages from the async ORM match the viewset's."""
+        event = create_event()
+        for i in range(5):
+            EventRegistration.objects.create(
+                user=create_user(username=f"user{i}", email=f"u{i}@test.com"),
+                event=event,
+            )
+        url = reverse("events:event-participants", kwargs={"pk": event.pk})
+        first = api_client.get(url, {"page_size": 2}).data
+
+        cursor = QueryDict(first["next"].split("?", 1)[1])["cursor"]
+
+        for params in ({"cursor": cursor}, {"search": "user"}):
+            params = {**params, "page_size": 2}
+            request = AsyncRequestFactory().get(url, params)
+            response = async_to_sync(async_views.event_participants)(
+                request, pk=event.pk
+            )
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.content == api_client.get(url, params).content
+
+
+@pytest.mark.django_db
+class TestThrottling:
+    """Tests for the register and list rate limits."""
+
+    @pytest.fixture(autouse=True)
+    def rates(self, settings):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"register": "2/min", "list": "3/min"},
+        }
+
+    def test_register_limited_per_user(self, api_client, create_user, create_event):
+        """Test a user over the register rate gets 429 with Retry-After."""
+        user = create_user(username="user1", email="u1@test.com")
+        event = create_event()
+        api_client.force_authenticate(user=user)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+
+        assert api_client.post(url).status_code == status.HTTP_201_CREATED
+        assert api_client.delete(url).status_code == status.HTTP_204_NO_CONTENT
+        response = api_client.post(url)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        # Up to two windows: the current one must end and partly slide out
+        assert 0 < int(response["Retry-After"]) <= 120
+
+        other = create_user(username="user2", email="u2@test.com")
+        api_client.force_authenticate(user=other)
+        assert api_client.post(url).status_code == status.HTTP_201_CREATED
+
+    def test_async_register_shares_limit(self, api_client, create_user, create_event):
+        """Test the async view counts against the same scope and responds alike."""
+        user = create_user(username="user1", email="u1@test.com")
+        event = create_event()
+        api_client.force_authenticate(user=user)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+        api_client.post(url)
+        api_client.delete(url)
+
+        response = TestAsyncEventViews.call(
+            async_views.event_register, "post", user, pk=event.pk
+        )
+        expected = api_client.post(url)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response.content == expected.content
+        assert response["Retry-After"] == expected["Retry-After"]
+
+    def test_list_limited_per_ip(self, api_client, create_event):
+        """Test anonymous clients are limited by IP on the event list."""
+        create_event()
+        url = reverse("events:event-list")
+
+        for _ in range(3):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+        assert api_client.get(url).status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        other = api_client.get(url, REMOTE_ADDR="10.0.0.2")
+        assert other.status_code == status.HTTP_200_OK
+
+    def test_unscoped_actions_not_limited(self, api_client, create_event):
+        """Test actions without a scope, like retrieve, are never throttled."""
+        event = create_event()
+        url = reverse("events:event-detail", kwargs={"pk": event.pk})
+
+        for _ in range(5):
+            assert api_client.get(url).status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_registrations_do_not_overbook(create_event, create_user):
+    """Test hundreds of simultaneous registrations never exceed capacity."""
+    capacity = 50
+    attempts = 300
+    event = create_event()
+    Event.objects.filter(pk=event.pk).update(capacity=capacity)
+    users = User.objects.bulk_create(
+        User(username=f"racer{i}", email=f"racer{i}@test.com", password="!")
+        for i in range(attempts)
+    )
+
+    def register(user):
+        try:
+            RegistrationService.register(user, event)
+            return "registered"
+        except EventFullError:
+            return "full"
+        finally:
+            connection.close()
+
+    with ThreadPoolExecutor(max_workers=32) as pool:
+        results = list(pool.map(register, users))
+
+    event.refresh_from_db()
+    assert results.count("registered") == capacity
+    assert results.count("full") == attempts - capacity
+    assert EventRegistration.objects.filter(event=event).count() == capacity
+    assert event.participants_count == capacity
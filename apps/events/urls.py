@@ -1,6 +1,8 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from apps.events import async_views
 from apps.events.views import EventViewSet
 
 app_name = "events"
@@ -8,6 +10,23 @@ app_name = "events"
 router = DefaultRouter()
 router.register("", EventViewSet, basename="event")
 
-urlpatterns = [
+urlpatterns = []
+
+if settings.ASYNC_EVENT_VIEWS:
+    # Same names as the router routes, so reverse() resolves to these
+    urlpatterns += [
+        path(
+            "<int:pk>/register/",
+            async_views.event_register,
+            name="event-register",
+        ),
+        path(
+            "<int:pk>/participants/",
+            async_views.event_participants,
+            name="event-participants",
+        ),
+    ]
+
+urlpatterns += [
     path("", include(router.urls)),
 ]
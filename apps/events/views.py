@@ -1,22 +1,29 @@
 import logging
 
+from django.db.models import Exists, OuterRef
+from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema_view
-from rest_framework import permissions, status, viewsets
+from rest_framework import exceptions, filters, permissions, status, viewsets
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
-from apps.core.exceptions import AlreadyRegisteredError, NotRegisteredError
-from apps.events.filters import EventFilter
+from apps.core.cache import CachedResponseMixin
+from apps.core.pagination import PageNumberOrKeysetPagination
+from apps.events.exports import CSVRenderer, NDJSONRenderer, stream_participants
+from apps.events.filters import EventFilter, EventFullTextSearchFilter
+from apps.events.imports import ImportFormatError, import_events_report, iter_records
 from apps.events.models import Event, EventRegistration
-from apps.events.permissions import IsOrganizerOrReadOnly
+from apps.events.pagination import paginate_participants
+from apps.events.permissions import IsEventOrganizer, IsOrganizerOrReadOnly
 from apps.events.schemas import EVENT_SCHEMAS, REGISTRATION_SCHEMAS
 from apps.events.serializers import (
+    BulkRegistrationSerializer,
     EventCreateUpdateSerializer,
     EventDetailSerializer,
     EventListSerializer,
-    ParticipantSerializer,
+    EventListValues,
 )
-from apps.events.services import EmailNotificationService
+from apps.events.services import RegistrationService
 
 logger = logging.getLogger(__name__)
 
@@ -29,12 +36,13 @@ logger = logging.getLogger(__name__)
     partial_update=EVENT_SCHEMAS["partial_update"],
     destroy=EVENT_SCHEMAS["destroy"],
 )
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(CachedResponseMixin, viewsets.ModelViewSet):
     """
     ViewSet for Event CRUD operations.
 
     Provides list, create, retrieve, update, and delete actions.
     Includes filtering by title, location, date, and upcoming status.
+    List and detail responses are served from the response cache.
     """
 
     queryset = Event.objects.select_related("organizer").all()
@@ -42,10 +50,74 @@ class EventViewSet(viewsets.ModelViewSet):
         permissions.IsAuthenticatedOrReadOnly,
         IsOrganizerOrReadOnly,
     ]
+    pagination_class = PageNumberOrKeysetPagination
+    # Full-text search runs last so its relevance ordering wins by default
+    filter_backends = [
+        DjangoFilterBackend,
+        filters.SearchFilter,
+        filters.OrderingFilter,
+        EventFullTextSearchFilter,
+    ]
     filterset_class = EventFilter
     search_fields = ["title", "description", "location"]
     ordering_fields = ["date", "created_at", "title"]
     ordering = ["-date"]
+    personal_fields = {"is_registered": False}
+    # Rate limits per action, see DEFAULT_THROTTLE_RATES
+    throttle_scopes = {"list": "list", "register": "register"}
+
+    def get_cache_generations(self):
+        if self.action == "retrieve":
+            pk = self.kwargs["pk"]
+            try:
+                # /api/events/01/ shows event 1 and must expire along with it
+                return [f"events:{int(pk)}"]
+            except ValueError:
+                # Matches no event, and a 404 response is never cached
+                return ["events:list"]
+        return ["events:list"]
+
+    def personalize_rows(self, request, rows):
+        """Set is_registered for the current user with a single query."""
+        ids = [row["id"] for row in rows if "is_registered" in row]
+        if not ids:
+            return
+        registered = set(
+            EventRegistration.objects.filter(
+                user=request.user, event_id__in=ids
+            ).values_list("event_id", flat=True)
+        )
+        for row in rows:
+            if "is_registered" in row:
+                row["is_registered"] = row["id"] in registered
+
+    def get_queryset(self):
+        """Annotate is_registered for the current user in the same query."""
+        queryset = super().get_queryset()
+        user = self.request.user
+        if self.action in ("list", "retrieve") and user.is_authenticated:
+            queryset = queryset.annotate(
+                is_registered=Exists(
+                    EventRegistration.objects.filter(event=OuterRef("pk"), user=user)
+                )
+            )
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        return self.dispatch_cached(self.list_values, request, *args, **kwargs)
+
+    def list_values(self, request, *args, **kwargs):
+        """ListModelMixin.list on values() rows, see EventListValues."""
+        queryset = EventListValues.values(
+            self.filter_queryset(self.get_queryset()), self.ordering_fields
+        )
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return Response(EventListValues.serialize(queryset))
+        return self.get_paginated_response(EventListValues.serialize(page))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.dispatch_cached(super().retrieve, request, *args, **kwargs)
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
@@ -58,7 +130,30 @@ class EventViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         """Log event creation."""
         event = serializer.save()
-        logger.info(f"Event created: {event.title} by {self.request.user.username}")
+        logger.info("Event created: %s by %s", event.title, self.request.user.username)
+
+    @EVENT_SCHEMAS["batch"]
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """
+        Create many events from a JSON array or NDJSON body.
+
+        The body is parsed as a stream instead of through request.data, so
+        large feeds are validated and inserted chunk by chunk.
+        """
+        if request.stream is None:
+            raise exceptions.ParseError("Expected a JSON array or NDJSON body.")
+        try:
+            report = import_events_report(iter_records(request.stream), request.user)
+        except ImportFormatError as exc:
+            raise exceptions.ParseError(str(exc))
+        logger.info(
+            "Batch import by %s: %d created, %d failed",
+            request.user.username,
+            report["created"],
+            report["failed"],
+        )
+        return Response(report)
 
     @action(
         detail=True,
@@ -71,33 +166,68 @@ class EventViewSet(viewsets.ModelViewSet):
         user = request.user
 
         if request.method == "POST":
-            if EventRegistration.objects.filter(user=user, event=event).exists():
-                raise AlreadyRegisteredError()
-
-            registration = EventRegistration.objects.create(user=user, event=event)
-            EmailNotificationService.send_registration_confirmation(registration)
+            RegistrationService.register_and_notify(user, event)
 
-            logger.info(f"User {user.username} registered for: {event.title}")
+            logger.info("User %s registered for: %s", user.username, event.title)
             return Response(
                 {"detail": "Successfully registered for the event."},
                 status=status.HTTP_201_CREATED,
             )
 
         # DELETE
-        try:
-            registration = EventRegistration.objects.get(user=user, event=event)
-            registration.delete()
-            EmailNotificationService.send_unregistration_notification(user, event)
-            logger.info(f"User {user.username} unregistered from: {event.title}")
-            return Response(status=status.HTTP_204_NO_CONTENT)
-        except EventRegistration.DoesNotExist:
-            raise NotRegisteredError()
+        RegistrationService.unregister_and_notify(user, event)
+        logger.info("User %s unregistered from: %s", user.username, event.title)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @REGISTRATION_SCHEMAS["bulk_register"]
+    @action(
+        detail=True,
+        methods=["post"],
+        url_path="register/bulk",
+        permission_classes=[permissions.IsAuthenticated, IsEventOrganizer],
+    )
+    def bulk_register(self, request, pk=None):
+        """Register many users for the event, organizer only."""
+        event = self.get_object()
+        serializer = BulkRegistrationSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
 
+        results = RegistrationService.bulk_register(
+            event, serializer.validated_data["users"]
+        )
+        created = sum(result["status"] == "created" for result in results)
+        logger.info(
+            "%s registered %d users for: %s",
+            request.user.username,
+            created,
+            event.title,
+        )
+        return Response(
+            {"created": created, "skipped": len(results) - created, "results": results}
+        )
+
+    # ?search= applies to participants here, not to the event lookup
     @REGISTRATION_SCHEMAS["participants"]
-    @action(detail=True, methods=["get"])
+    @action(detail=True, methods=["get"], filter_backends=[])
     def participants(self, request, pk=None):
-        """List all participants registered for the event."""
+        """List participants of the event, newest first, keyset paginated."""
+        event = self.get_object()
+        return paginate_participants(request, event, self)
+
+    @REGISTRATION_SCHEMAS["export_participants"]
+    @action(
+        detail=True,
+        methods=["get"],
+        url_path="participants/export",
+        permission_classes=[permissions.IsAuthenticated, IsEventOrganizer],
+        renderer_classes=[CSVRenderer, NDJSONRenderer],
+    )
+    def export_participants(self, request, pk=None):
+        """Stream all participants as CSV or NDJSON, organizer only."""
         event = self.get_object()
-        registrations = event.registrations.select_related("user").all()
-        serializer = ParticipantSerializer(registrations, many=True)
-        return Response(serializer.data)
+        logger.info(
+            "Participants of %s exported by %s", event.title, request.user.username
+        )
+        return stream_participants(
+            request._request, event, request.accepted_renderer.format
+        )
@@ -3,6 +3,7 @@ from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth.models import User
 from unfold.admin import ModelAdmin
 
+from apps.users.models import BlacklistedToken
 
 admin.site.unregister(User)
 
@@ -15,3 +16,12 @@ class UserAdmin(ModelAdmin, BaseUserAdmin):
     list_display_links = ("id", "username")
     ordering = ("username",)
     list_filter = ("is_staff", "is_superuser", "is_active")
+
+
+@admin.register(BlacklistedToken)
+class BlacklistedTokenAdmin(ModelAdmin):
+    list_display = ["id", "jti", "blacklisted_at", "expires_at"]
+    list_display_links = ["id", "jti"]
+    search_fields = ["jti"]
+    search_help_text = "Search by token id (jti)"
+    date_hierarchy = "blacklisted_at"
@@ -0,0 +1,104 @@
+"""
+JWT authentication without a user query on every request.
+
+CachedJWTAuthentication is a drop-in replacement for simplejwt's
+JWTAuthentication. Validated tokens are kept until they expire, and users
+are kept in a bounded per-process LRU cache. Each cached user is stamped
+with the `users:<id>` cache generation, which is bumped whenever the user is
+saved or deleted (apps/users/signals.py), so changes made by any process,
+such as deactivation or a password change, apply on the next request.
+"""
+
+import copy
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from apps.core.cache import LocalTTLCache, bump_generations, get_generations
+
+token_cache = LocalTTLCache(
+    settings.AUTH_TOKEN_CACHE_SIZE,
+    api_settings.ACCESS_TOKEN_LIFETIME.total_seconds(),
+)
+user_cache = LocalTTLCache(settings.AUTH_USER_CACHE_SIZE, settings.AUTH_USER_CACHE_TTL)
+
+
+def user_generation(user_id):
+    return f"users:{user_id}"
+
+
+def forget_user(user_id):
+    """Drop a user from the cache of this process and of all others."""
+    user_cache.delete(str(user_id))
+    bump_generations(user_generation(user_id))
+
+
+def clear_auth_caches():
+    token_cache.clear()
+    user_cache.clear()
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that caches validated tokens and resolved users.
+
+    Costs one shared cache read per request (the user's generation) instead
+    of a database query. QuerySet.update() on users sends no signals, so
+    callers doing bulk updates must call forget_user() for each user.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = token_cache.get(raw_token)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            token_cache.set(
+                raw_token, validated_token, validated_token["exp"] - time.time()
+            )
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = self.get_cached_user(user_id)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
+
+    def get_cached_user(self, user_id):
+        key = str(user_id)
+        (generation,) = get_generations([user_generation(user_id)])
+        entry = user_cache.get(key)
+        if entry is not None and entry[1] == generation:
+            # A copy, so attributes set during one request do not leak
+            return copy.copy(entry[0])
+
+        try:
+            user = self.user_model.objects.get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist as e:
+            raise AuthenticationFailed(
+                _("User not found"), code="user_not_found"
+            ) from e
+        # Stamped with the generation read before the query, so a save that
+        # races with it makes the next request reload
+        user_cache.set(key, (user, generation))
+        return copy.copy(user)
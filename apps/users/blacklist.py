@@ -0,0 +1,128 @@
+"""
+In-process negative lookup filter for the refresh token blacklist.
+
+Every refresh asks whether the presented token was revoked, and nearly
+always the answer is no. A Bloom filter over all blacklisted jtis answers
+"definitely not" from memory; only possible matches (blacklisted tokens and
+rare false positives) are checked in the database.
+
+Each process loads rows blacklisted since its last sync at most every
+TOKEN_BLACKLIST_FILTER_SYNC seconds, so steady refresh traffic does not
+query the blacklist table. Until then, tokens blacklisted by other
+processes are found through a short-lived marker in the shared cache,
+written with every insert. The filter is rebuilt from scratch periodically,
+which drops purged tokens and resizes it to the current blacklist.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+from apps.users.models import BlacklistedToken
+
+# Rows committed slightly out of blacklisted_at order are still picked up
+SYNC_OVERLAP = timedelta(seconds=30)
+
+
+def recent_key(jti):
+    return f"token-blacklist:{jti}"
+
+
+def remember_recent(jti):
+    """Mark a jti as blacklisted until every process has synced it."""
+    timeout = 2 * settings.TOKEN_BLACKLIST_FILTER_SYNC + SYNC_OVERLAP.seconds
+    caches["default"].set(recent_key(jti), 1, timeout)
+
+
+class BloomFilter:
+    """Set membership with no false negatives and a bounded false positive rate."""
+
+    def __init__(self, capacity, error_rate=0.001):
+        capacity = max(capacity, 1)
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        # Double hashing: k positions from two independent 64-bit hashes
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+
+class BlacklistFilter:
+    """Bloom filter of blacklisted jtis, kept in sync with the database."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = None
+        self._synced_at = None
+        self._built_at = None
+        self._checked_at = None
+
+    def might_contain(self, jti):
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._bloom is None
+                or now - self._built_at > settings.TOKEN_BLACKLIST_FILTER_REBUILD
+            ):
+                self._rebuild()
+            elif now - self._checked_at > settings.TOKEN_BLACKLIST_FILTER_SYNC:
+                self._sync()
+            if jti in self._bloom:
+                return True
+        # Blacklisted by another process since this one last synced
+        return caches["default"].get(recent_key(jti)) is not None
+
+    def add(self, jti):
+        with self._lock:
+            if self._bloom is not None:
+                self._bloom.add(jti)
+
+    def clear(self):
+        with self._lock:
+            self._bloom = None
+
+    def _rebuild(self):
+        synced_at = timezone.now()
+        live = BlacklistedToken.objects.filter(expires_at__gt=synced_at)
+        bloom = BloomFilter(
+            max(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, 2 * live.count()),
+            settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE,
+        )
+        for jti in live.values_list("jti", flat=True).iterator(chunk_size=5000):
+            bloom.add(jti)
+        self._bloom = bloom
+        self._synced_at = synced_at
+        self._built_at = self._checked_at = time.monotonic()
+
+    def _sync(self):
+        synced_at = timezone.now()
+        recent = BlacklistedToken.objects.filter(
+            blacklisted_at__gte=self._synced_at - SYNC_OVERLAP
+        ).values_list("jti", flat=True)
+        for jti in recent:
+            self._bloom.add(jti)
+        self._synced_at = synced_at
+        self._checked_at = time.monotonic()
+
+
+blacklist_filter = BlacklistFilter()
@@ -0,0 +1,134 @@
+"""
+Password hashers with costs from settings, run on a bounded worker pool.
+
+PASSWORD_HASHER picks the algorithm new hashes use (first entry of
+PASSWORD_HASHERS); the others stay listed so existing hashes still verify.
+Django rehashes a password on the next successful login whenever its
+algorithm or cost differs from the current setting.
+
+Hashing and verification run on HashingPool threads. At most
+PASSWORD_HASHING_WORKERS hashes run at once, up to PASSWORD_HASHING_QUEUE
+more wait, and callers that cannot get a slot within
+PASSWORD_HASHING_TIMEOUT seconds fail with PasswordHashingBusyError (503)
+instead of piling CPU work onto every worker. All three algorithms release
+the GIL while hashing.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from apps.core.exceptions import PasswordHashingBusyError
+
+
+class HashingPool:
+    """Bounded thread pool with back-pressure for CPU-heavy hashing."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._executor = None
+        self._slots = None
+
+    def _mark_worker(self):
+        self._local.worker = True
+
+    def _start(self):
+        with self._lock:
+            if self._executor is None:
+                workers = settings.PASSWORD_HASHING_WORKERS
+                self._executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="password-hashing",
+                    initializer=self._mark_worker,
+                )
+                self._slots = threading.BoundedSemaphore(
+                    workers + settings.PASSWORD_HASHING_QUEUE
+                )
+            return self._executor, self._slots
+
+    def run(self, func, *args):
+        # Hashers call each other (PBKDF2 verify calls encode), run those inline
+        if settings.PASSWORD_HASHING_WORKERS <= 0 or getattr(
+            self._local, "worker", False
+        ):
+            return func(*args)
+
+        executor, slots = self._start()
+        if not slots.acquire(timeout=settings.PASSWORD_HASHING_TIMEOUT):
+            raise PasswordHashingBusyError()
+        try:
+            future = executor.submit(func, *args)
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        return future.result()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+            self._executor = None
+            self._slots = None
+
+
+hashing_pool = HashingPool()
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(setting, **kwargs):
+    if setting in ("PASSWORD_HASHING_WORKERS", "PASSWORD_HASHING_QUEUE"):
+        hashing_pool.shutdown()
+
+
+class PooledHasherMixin:
+    def encode(self, password, salt, *args):
+        return hashing_pool.run(super().encode, password, salt, *args)
+
+    def verify(self, password, encoded):
+        return hashing_pool.run(super().verify, password, encoded)
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.ARGON2_PARALLELISM
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return settings.SCRYPT_WORK_FACTOR
+
+    @property
+    def block_size(self):
+        return settings.SCRYPT_BLOCK_SIZE
+
+    @property
+    def parallelism(self):
+        return settings.SCRYPT_PARALLELISM
+
+    @property
+    def maxmem(self):
+        # Exactly what OpenSSL needs; its 32 MiB default is too small for
+        # work factors above 2 ** 14
+        return 128 * self.block_size * (self.work_factor + self.parallelism + 2)
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PBKDF2_ITERATIONS
@@ -0,0 +1,6 @@
+from apps.users.blacklist import blacklist_filter
+
+
+def warm_up_blacklist_filter():
+    """Build the refresh token blacklist filter before the first refresh."""
+    blacklist_filter.might_contain("")
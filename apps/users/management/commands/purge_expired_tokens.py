@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from apps.users.services import TokenBlacklistService
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete blacklisted refresh tokens that have expired. "
+        "Run periodically, e.g. daily from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of tokens deleted per DELETE statement (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        purged = TokenBlacklistService.purge_expired(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Purged {purged} expired token(s)."))
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="BlacklistedToken",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("jti", models.CharField(max_length=255, unique=True)),
+                ("expires_at", models.DateTimeField()),
+                ("blacklisted_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "verbose_name": "Blacklisted Token",
+                "verbose_name_plural": "Blacklisted Tokens",
+                "ordering": ["-blacklisted_at"],
+                "indexes": [
+                    models.Index(fields=["expires_at"], name="blacklist_expires_idx"),
+                    models.Index(fields=["blacklisted_at"], name="blacklist_time_idx"),
+                ],
+            },
+        ),
+    ]
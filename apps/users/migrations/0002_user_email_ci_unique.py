@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# Same as apps.users.models.USER_EMAIL_INDEX
+INDEX_NAME = "auth_user_email_ci_uniq"
+
+
+def check_duplicates(apps, schema_editor):
+    User = apps.get_model("auth", "User")
+    duplicates = list(
+        User.objects.using(schema_editor.connection.alias)
+        .exclude(email="")
+        .values(email_ci=Lower("email"))
+        .annotate(total=Count("pk"))
+        .filter(total__gt=1)
+        .values_list("email_ci", flat=True)[:20]
+    )
+    if duplicates:
+        raise RuntimeError(
+            "Cannot add a unique index on auth_user.email, these emails are "
+            f"used by several users (case-insensitive): {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+    # auth.User is not ours, so the index is created with plain SQL. Blank
+    # emails (e.g. from createsuperuser) are left out.
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("users", "0001_blacklistedtoken"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.RunSQL(
+            f"CREATE UNIQUE INDEX {INDEX_NAME} ON auth_user (LOWER(email)) "
+            "WHERE email <> ''",
+            f"DROP INDEX {INDEX_NAME}",
+        ),
+    ]
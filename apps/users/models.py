@@ -1 +1,34 @@
 from django.contrib.auth.models import User  # noqa: F401
+from django.db import models
+
+# Case-insensitive unique index on auth_user.email (migration 0002), named in
+# the IntegrityError raised for a duplicate email
+USER_EMAIL_INDEX = "auth_user_email_ci_uniq"
+
+
+class BlacklistedToken(models.Model):
+    """
+    Refresh token that may no longer be used, identified by its jti.
+
+    Only revoked tokens are stored, never every issued one, and rows are
+    deleted once the token has expired (`manage.py purge_expired_tokens`),
+    so the table stays proportional to rotations within one token lifetime.
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField()
+    blacklisted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-blacklisted_at"]
+        indexes = [
+            # Backs purging and rebuilding the in-process filter
+            models.Index(fields=["expires_at"], name="blacklist_expires_idx"),
+            # Backs incremental filter syncs
+            models.Index(fields=["blacklisted_at"], name="blacklist_time_idx"),
+        ]
+        verbose_name = "Blacklisted Token"
+        verbose_name_plural = "Blacklisted Tokens"
+
+    def __str__(self):
+        return self.jti
@@ -1,7 +1,22 @@
+from drf_spectacular.contrib.rest_framework_simplejwt import (
+    SimpleJWTScheme,
+    TokenRefreshSerializerExtension,
+)
 from drf_spectacular.utils import extend_schema
 
 TAGS_AUTH = ["Authentication"]
 
+
+class CachedJWTScheme(SimpleJWTScheme):
+    """Document CachedJWTAuthentication as the same `jwtAuth` bearer scheme."""
+
+    target_class = "apps.users.authentication.CachedJWTAuthentication"
+
+
+class BlacklistTokenRefreshSerializerExtension(TokenRefreshSerializerExtension):
+    target_class = "apps.users.serializers.TokenRefreshSerializer"
+
+
 register_user = extend_schema(
     summary="Register a new user",
     description="Create a new user account with username, email and password.",
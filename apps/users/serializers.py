@@ -3,6 +3,12 @@ import logging
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import (
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+)
+
+from apps.users.services import UserService
+from apps.users.tokens import BlacklistRefreshToken
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +31,8 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "password", "password_confirm"]
         extra_kwargs = {
             "email": {"required": True},
+            # Uniqueness is enforced by the INSERT in UserService.register
+            "username": {"validators": [User.username_validator]},
         }
 
     def validate(self, attrs):
@@ -35,21 +43,14 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
             )
         return attrs
 
-    def validate_email(self, value):
-        """Validate email is unique."""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("User with this email already exists.")
-        return value
-
     def create(self, validated_data):
         """Create user with hashed password."""
-        validated_data.pop("password_confirm")
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            password=validated_data["password"],
+        user = UserService.register(
+            validated_data["username"],
+            validated_data["email"],
+            validated_data["password"],
         )
-        logger.info(f"New user registered: {user.username}")
+        logger.info("New user registered: %s", user.username)
         return user
 
 
@@ -60,3 +61,9 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ["id", "username", "email", "date_joined"]
         read_only_fields = ["id", "date_joined"]
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """Rotate refresh tokens, blacklisting the used one (SIMPLE_JWT settings)."""
+
+    token_class = BlacklistRefreshToken
@@ -0,0 +1,74 @@
+from datetime import datetime
+from datetime import timezone as dt_timezone
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from apps.core.exceptions import EmailAlreadyExistsError, UsernameAlreadyExistsError
+from apps.users.blacklist import blacklist_filter, remember_recent
+from apps.users.models import USER_EMAIL_INDEX, BlacklistedToken
+
+
+class UserService:
+    """Service for creating user accounts."""
+
+    @staticmethod
+    def register(username, email, password) -> User:
+        """
+        Create a user with a single INSERT.
+
+        Uniqueness of username and email (case-insensitive) is left to the
+        database constraints instead of checking first, which is also the
+        only check that holds for concurrent signups.
+        """
+        try:
+            with transaction.atomic():
+                return User.objects.create_user(
+                    username=username, email=email, password=password
+                )
+        except IntegrityError as exc:
+            if USER_EMAIL_INDEX in str(exc):
+                raise EmailAlreadyExistsError()
+            if "username" in str(exc):
+                raise UsernameAlreadyExistsError()
+            raise
+
+
+class TokenBlacklistService:
+    """Service for revoking refresh tokens by jti."""
+
+    @staticmethod
+    def is_blacklisted(jti) -> bool:
+        """Check the in-process filter first, the database only on a match."""
+        if not blacklist_filter.might_contain(jti):
+            return False
+        return BlacklistedToken.objects.filter(jti=jti).exists()
+
+    @staticmethod
+    def blacklist(jti, exp) -> bool:
+        """
+        Blacklist the token with the given jti and exp (epoch seconds).
+
+        Returns False if it was already blacklisted, so of two concurrent
+        refreshes with the same token only one may rotate it.
+        """
+        expires_at = datetime.fromtimestamp(exp, tz=dt_timezone.utc)
+        try:
+            with transaction.atomic():
+                BlacklistedToken.objects.create(jti=jti, expires_at=expires_at)
+        except IntegrityError:
+            return False
+        blacklist_filter.add(jti)
+        remember_recent(jti)
+        return True
+
+    @staticmethod
+    def purge_expired(batch_size=1000) -> int:
+        """Delete blacklisted tokens past their expiry, batch_size rows at a time."""
+        now = timezone.now()
+        expired = BlacklistedToken.objects.filter(expires_at__lte=now)
+        purged = 0
+        while pks := list(expired.order_by().values_list("pk", flat=True)[:batch_size]):
+            purged += BlacklistedToken.objects.filter(pk__in=pks).delete()[0]
+        return purged
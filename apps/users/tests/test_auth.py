@@ -1,8 +1,31 @@
+import threading
+import uuid
+from datetime import timedelta
+from io import StringIO
+
 import pytest
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.core.cache import bump_generations
+from apps.users.authentication import (
+    CachedJWTAuthentication,
+    token_cache,
+    user_generation,
+)
+from apps.users.blacklist import BloomFilter, blacklist_filter
+from apps.users.hashers import hashing_pool
+from apps.users.models import BlacklistedToken
+from apps.users.services import TokenBlacklistService
 
 
 @pytest.fixture
@@ -56,11 +79,49 @@ class TestUserRegistration:
 
     def test_register_duplicate_email(self, api_client, user_data, create_user):
         """Test registration fails with duplicate email."""
-        create_user()
+        create_user(username="other")
+        url = reverse("users:register")
+        response = api_client.post(url, user_data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "email_exists"
+
+    def test_register_duplicate_email_case_insensitive(
+        self, api_client, user_data, create_user
+    ):
+        """Test emails differing only in case count as duplicates."""
+        create_user(username="other", email="TEST@Example.com")
+        url = reverse("users:register")
+        response = api_client.post(url, user_data, format="json")
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "email_exists"
+
+    def test_register_duplicate_username(self, api_client, user_data, create_user):
+        """Test registration fails with duplicate username."""
+        create_user(email="other@example.com")
         url = reverse("users:register")
         response = api_client.post(url, user_data, format="json")
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["code"] == "username_exists"
+
+    def test_register_single_insert(self, api_client, user_data):
+        """Test registration checks uniqueness with the INSERT alone."""
+        url = reverse("users:register")
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(url, user_data, format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        statements = [query["sql"].split()[0] for query in queries]
+        assert statements == ["SAVEPOINT", "INSERT", "RELEASE"]
+
+    def test_blank_emails_not_unique(self, create_user):
+        """Test users without an email, e.g. from createsuperuser, can coexist."""
+        create_user(username="first", email="")
+        create_user(username="second", email="")
+
+        assert User.objects.filter(email="").count() == 2
 
     def test_register_weak_password(self, api_client, user_data):
         """Test registration fails with weak password."""
@@ -88,6 +149,26 @@ class TestUserLogin:
         assert "access" in response.data
         assert "refresh" in response.data
 
+    @override_settings(
+        REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": {"login": "3/min"},
+        }
+    )
+    def test_login_rate_limited(self, api_client, create_user):
+        """Test repeated logins from one IP are answered with 429."""
+        create_user()
+        url = reverse("users:login")
+        credentials = {"username": "testuser", "password": "wrong"}
+
+        for _ in range(3):
+            response = api_client.post(url, credentials, format="json")
+            assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        response = api_client.post(url, credentials, format="json")
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert "Retry-After" in response
+
     def test_login_invalid_credentials(self, api_client, create_user):
         """Test login fails with invalid credentials."""
         create_user()
@@ -119,3 +200,266 @@ class TestCurrentUser:
         response = api_client.get(url)
 
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.django_db
+class TestCachedJWTAuthentication:
+    """Tests for cached token validation and user resolution."""
+
+    def get_me(self, api_client, user):
+        api_client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(user)}"
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.get(reverse("users:current_user"))
+        return response, queries
+
+    def test_repeat_request_skips_user_query(self, api_client, create_user):
+        """Test the user is loaded once, then served from the cache."""
+        user = create_user()
+
+        response, queries = self.get_me(api_client, user)
+        assert response.status_code == status.HTTP_200_OK
+        assert len(queries) == 1
+        assert len(token_cache) == 1
+
+        response, queries = self.get_me(api_client, user)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["username"] == user.username
+        assert len(queries) == 0
+
+    def test_deactivation_invalidates(self, api_client, create_user):
+        """Test a deactivated user is rejected on the next request."""
+        user = create_user()
+        self.get_me(api_client, user)
+
+        user.is_active = False
+        user.save()
+        response, queries = self.get_me(api_client, user)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data["code"] == "user_inactive"
+
+    def test_other_process_save_invalidates(self, api_client, create_user):
+        """Test a generation bump from another process reloads the user."""
+        user = create_user()
+        self.get_me(api_client, user)
+
+        # Signals only run in the saving process, others see the generation
+        User.objects.filter(pk=user.pk).update(email="changed@example.com")
+        bump_generations(user_generation(user.pk))
+        response, queries = self.get_me(api_client, user)
+
+        assert response.data["email"] == "changed@example.com"
+        assert len(queries) == 1
+
+    def test_deleted_user_rejected(self, api_client, create_user):
+        """Test a deleted user's token stops working."""
+        user = create_user()
+        self.get_me(api_client, user)
+
+        User.objects.filter(pk=user.pk).delete()
+        response, _ = self.get_me(api_client, user)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_cached_user_is_a_copy(self, create_user):
+        """Test each request gets its own user instance."""
+        user = create_user()
+        authentication = CachedJWTAuthentication()
+        token = authentication.get_validated_token(str(AccessToken.for_user(user)))
+
+        first = authentication.get_user(token)
+        first.first_name = "changed"
+        second = authentication.get_user(token)
+
+        assert second is not first
+        assert second.first_name == ""
+
+
+@pytest.mark.django_db
+class TestTokenBlacklist:
+    """Tests for refresh token rotation and the blacklist filter."""
+
+    def refresh(self, api_client, token):
+        return api_client.post(
+            reverse("users:token_refresh"), {"refresh": str(token)}, format="json"
+        )
+
+    def test_rotated_token_is_rejected(self, api_client, create_user):
+        """Test a refresh token works once, then is blacklisted."""
+        token = RefreshToken.for_user(create_user())
+
+        response = self.refresh(api_client, token)
+        assert response.status_code == status.HTTP_200_OK
+        assert "refresh" in response.data
+        assert BlacklistedToken.objects.filter(jti=token["jti"]).exists()
+
+        response = self.refresh(api_client, token)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_new_refresh_token_works(self, api_client, create_user):
+        """Test the rotated refresh token can be used in turn."""
+        token = RefreshToken.for_user(create_user())
+        rotated = self.refresh(api_client, token).data["refresh"]
+
+        assert self.refresh(api_client, rotated).status_code == status.HTTP_200_OK
+
+    def test_blacklist_once(self):
+        """Test only the first of two blacklist calls for one token succeeds."""
+        exp = int((timezone.now() + timedelta(days=1)).timestamp())
+
+        assert TokenBlacklistService.blacklist("jti-1", exp) is True
+        assert TokenBlacklistService.blacklist("jti-1", exp) is False
+
+    def test_unknown_token_skips_database(self):
+        """Test the filter answers for tokens that were never blacklisted."""
+        exp = int((timezone.now() + timedelta(days=1)).timestamp())
+        TokenBlacklistService.blacklist("revoked", exp)
+        TokenBlacklistService.is_blacklisted("warm-up")
+
+        with CaptureQueriesContext(connection) as queries:
+            assert TokenBlacklistService.is_blacklisted(uuid.uuid4().hex) is False
+        assert len(queries) == 0
+        assert TokenBlacklistService.is_blacklisted("revoked") is True
+
+    def test_filter_follows_other_processes(self, settings):
+        """Test tokens blacklisted elsewhere are seen before and after a sync."""
+        TokenBlacklistService.is_blacklisted("warm-up")
+        exp = int((timezone.now() + timedelta(days=1)).timestamp())
+        TokenBlacklistService.blacklist("elsewhere", exp)
+        # Another process: its filter has not seen the insert
+        blacklist_filter.clear()
+        TokenBlacklistService.is_blacklisted("warm-up")
+        BlacklistedToken.objects.create(
+            jti="unmarked", expires_at=timezone.now() + timedelta(days=1)
+        )
+
+        assert TokenBlacklistService.is_blacklisted("elsewhere") is True
+        assert TokenBlacklistService.is_blacklisted("unmarked") is False
+        settings.TOKEN_BLACKLIST_FILTER_SYNC = 0
+        assert TokenBlacklistService.is_blacklisted("unmarked") is True
+
+    def test_warm_refresh_skips_blacklist_select(self, api_client, create_user):
+        """Test refreshes in a row only insert, never read the blacklist."""
+        token = str(RefreshToken.for_user(create_user()))
+        token = self.refresh(api_client, token).data["refresh"]
+
+        for _ in range(3):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.refresh(api_client, token)
+            assert response.status_code == status.HTTP_200_OK
+            token = response.data["refresh"]
+            reads = [
+                query["sql"]
+                for query in queries
+                if query["sql"].startswith("SELECT")
+                and "users_blacklistedtoken" in query["sql"]
+            ]
+            assert reads == []
+
+    def test_purge_expired_tokens(self):
+        """Test the command deletes expired tokens only."""
+        now = timezone.now()
+        BlacklistedToken.objects.bulk_create(
+            [
+                BlacklistedToken(jti=f"old-{i}", expires_at=now - timedelta(hours=1))
+                for i in range(5)
+            ]
+            + [BlacklistedToken(jti="live", expires_at=now + timedelta(hours=1))]
+        )
+        out = StringIO()
+
+        call_command("purge_expired_tokens", "--batch-size", "2", stdout=out)
+
+        assert "Purged 5 expired token(s)." in out.getvalue()
+        assert list(BlacklistedToken.objects.values_list("jti", flat=True)) == ["live"]
+
+    def test_bloom_filter_error_rate(self):
+        """Test the filter has no false negatives and few false positives."""
+        bloom = BloomFilter(10000, 0.01)
+        members = [uuid.uuid4().hex for _ in range(10000)]
+        for member in members:
+            bloom.add(member)
+
+        assert all(member in bloom for member in members)
+        false_positives = sum(uuid.uuid4().hex in bloom for _ in range(10000))
+        assert false_positives < 200
+
+
+@pytest.mark.django_db
+class TestPasswordHashing:
+    """Tests for configurable hashers, rehashing and the hashing pool."""
+
+    def login(self, api_client, user):
+        return api_client.post(
+            reverse("users:login"),
+            {"username": user.username, "password": "TestPass123!"},
+            format="json",
+        )
+
+    def test_new_passwords_use_preferred_algorithm(self, create_user):
+        """Test new users get an argon2 hash by default."""
+        assert create_user().password.startswith("argon2$argon2id$")
+
+    def test_login_rehashes_other_algorithm(self, api_client, create_user):
+        """Test a PBKDF2 hash is replaced by the preferred one on login."""
+        with override_settings(
+            PASSWORD_HASHERS=[
+                "apps.users.hashers.PBKDF2PasswordHasher",
+                "apps.users.hashers.Argon2PasswordHasher",
+            ]
+        ):
+            user = create_user()
+        assert user.password.startswith("pbkdf2_sha256$")
+
+        response = self.login(api_client, user)
+
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert user.password.startswith("argon2$")
+
+    def test_login_rehashes_changed_cost(self, api_client, create_user):
+        """Test raising the cost setting upgrades hashes on login."""
+        user = create_user()
+
+        with override_settings(ARGON2_TIME_COST=3):
+            response = self.login(api_client, user)
+
+        assert response.status_code == status.HTTP_200_OK
+        user.refresh_from_db()
+        assert ",t=3," in user.password
+
+    def test_hashing_runs_on_pool(self):
+        """Test hashes are computed on a pool thread."""
+        names = hashing_pool.run(lambda: threading.current_thread().name)
+
+        assert names.startswith("password-hashing")
+
+    @override_settings(
+        PASSWORD_HASHING_WORKERS=1,
+        PASSWORD_HASHING_QUEUE=0,
+        PASSWORD_HASHING_TIMEOUT=0.05,
+    )
+    def test_full_pool_rejects_with_503(self, api_client, user_data):
+        """Test a signup is turned away while every hashing slot is busy."""
+        started, release = threading.Event(), threading.Event()
+
+        def hold_slot():
+            started.set()
+            release.wait()
+
+        busy = threading.Thread(target=hashing_pool.run, args=(hold_slot,))
+        busy.start()
+        try:
+            started.wait()
+            response = api_client.post(
+                reverse("users:register"), user_data, format="json"
+            )
+        finally:
+            release.set()
+            busy.join()
+
+        assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+        assert response.data["code"] == "hashing_busy"
+        assert not User.objects.filter(username=user_data["username"]).exists()
@@ -0,0 +1,26 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.users.services import TokenBlacklistService
+
+
+class BlacklistRefreshToken(RefreshToken):
+    """
+    RefreshToken checked against the project blacklist (TokenBlacklistService).
+
+    Replaces simplejwt's token_blacklist app, which also stores every issued
+    token as an OutstandingToken row and checks the database on each use.
+    """
+
+    def verify(self):
+        super().verify()
+        if TokenBlacklistService.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        if not TokenBlacklistService.blacklist(
+            self.payload[api_settings.JTI_CLAIM], self.payload["exp"]
+        ):
+            raise TokenError(_("Token is blacklisted"))
@@ -5,6 +5,7 @@ from drf_spectacular.utils import extend_schema_view
 from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from rest_framework_simplejwt.views import TokenObtainPairView
 
 from apps.users.schemas import AUTH_SCHEMAS, USER_SCHEMAS
 from apps.users.serializers import UserRegistrationSerializer, UserSerializer
@@ -23,12 +24,13 @@ class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = "signup"
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.save()
-        logger.info(f"User registered successfully: {user.username}")
+        logger.info("User registered successfully: %s", user.username)
         return Response(
             {
                 "message": "User registered successfully.",
@@ -38,6 +40,12 @@ class UserRegistrationView(generics.CreateAPIView):
         )
 
 
+class LoginView(TokenObtainPairView):
+    """Obtain an access and refresh token pair, rate limited per IP."""
+
+    throttle_scope = "login"
+
+
 @extend_schema_view(get=USER_SCHEMAS["current_user"])
 class CurrentUserView(APIView):
     """Get current authenticated user's profile."""
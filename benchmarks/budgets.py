@@ -0,0 +1,41 @@
+"""
+Per-endpoint budgets enforced by the benchmark suite.
+
+`queries` is the maximum number of SQL queries a single request may run
+with the response cache disabled (the cold path). The suite runs inside a
+transaction, so transaction.atomic() blocks show up as SAVEPOINT/RELEASE
+queries. The first request of each user includes the user lookup, later
+ones resolve the user from the authentication cache. `p95_ms` is the 95th
+percentile latency; scale it for slower machines with
+BENCHMARK_LATENCY_FACTOR. Lower a budget when an optimization lands.
+"""
+
+BUDGETS = {
+    # apps/events/urls.py
+    "event-list:get:anonymous": {"queries": 2, "p95_ms": 50},
+    "event-list:get:authenticated": {"queries": 3, "p95_ms": 50},
+    "event-list:get:cursor": {"queries": 1, "p95_ms": 50},
+    "event-list:get:search": {"queries": 2, "p95_ms": 500},
+    "event-list:post": {"queries": 2, "p95_ms": 75},
+    # 50 events per request
+    "event-batch:post": {"queries": 4, "p95_ms": 50},
+    "event-detail:get": {"queries": 1, "p95_ms": 50},
+    "event-detail:put": {"queries": 3, "p95_ms": 75},
+    "event-detail:patch": {"queries": 3, "p95_ms": 75},
+    "event-detail:delete": {"queries": 4, "p95_ms": 75},
+    "event-register:post": {"queries": 9, "p95_ms": 75},
+    "event-register:delete": {"queries": 8, "p95_ms": 75},
+    # 100 users per request
+    "event-bulk-register:post": {"queries": 10, "p95_ms": 150},
+    "event-participants:get": {"queries": 2, "p95_ms": 25},
+    "event-participants:get:search": {"queries": 2, "p95_ms": 50},
+    "event-export-participants:get": {"queries": 3, "p95_ms": 100},
+    # apps/users/urls.py (register and login are dominated by password
+    # hashing, see benchmarks/password_hashing.py)
+    "register:post": {"queries": 3, "p95_ms": 150},
+    "login:post": {"queries": 1, "p95_ms": 150},
+    # Rotation blacklists the used token (INSERT in a savepoint); the first
+    # refresh of a process also builds the blacklist filter (2 queries)
+    "token_refresh:post": {"queries": 6, "p95_ms": 50},
+    "current_user:get": {"queries": 1, "p95_ms": 50},
+}
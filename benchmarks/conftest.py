@@ -0,0 +1,36 @@
+import json
+import os
+
+import pytest
+from django.db import transaction
+
+from benchmarks.dataset import seed
+
+
+@pytest.fixture(scope="module")
+def dataset(django_db_setup, django_db_blocker):
+    """Seed a large dataset once per module and roll it back afterwards."""
+    scale = int(os.getenv("BENCHMARK_SCALE", 1))
+    with django_db_blocker.unblock():
+        with transaction.atomic():
+            yield seed(scale=scale)
+            transaction.set_rollback(True)
+
+
+@pytest.fixture(scope="module")
+def benchmark_report(request):
+    """Collect per-endpoint results and write them as JSON at module end."""
+    results = []
+    yield results
+    path = request.config.getoption("benchmark_report") or os.getenv("BENCHMARK_REPORT")
+    if path and results:
+        with open(path, "w") as report:
+            json.dump(
+                {
+                    "commit": os.getenv("GIT_COMMIT", ""),
+                    "scale": int(os.getenv("BENCHMARK_SCALE", 1)),
+                    "results": sorted(results, key=lambda row: row["endpoint"]),
+                },
+                report,
+                indent=2,
+            )
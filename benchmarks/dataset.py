@@ -0,0 +1,27 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+
+from apps.events.models import Event
+
+PASSWORD = "BenchPass123!"
+
+
+def seed(scale=1, seed_value=42):
+    """Populate users, events and registrations for benchmarks."""
+    call_command(
+        "seed_data",
+        users=200 * scale,
+        events=500 * scale,
+        registrations=5000 * scale,
+        seed=seed_value,
+        prefix="bench",
+        password=PASSWORD,
+        stdout=StringIO(),
+    )
+    return {
+        "users": list(User.objects.filter(username__startswith="bench")[:200]),
+        "events": list(Event.objects.order_by("pk")[:10]),
+        "busiest_event": Event.objects.order_by("-participants_count").first(),
+    }
@@ -0,0 +1,149 @@
+"""
+Compare throughput and latency of running servers under concurrent load.
+
+Start the servers to compare against the same database, for example:
+
+    python manage.py runserver 8000 --noreload
+    ASYNC_EVENT_VIEWS=True gunicorn config.asgi:application \\
+        -c gunicorn.conf.py --bind 127.0.0.1:8001
+
+then run:
+
+    python benchmarks/load_compare.py \\
+        --target wsgi=http://127.0.0.1:8000 --target asgi=http://127.0.0.1:8001
+
+Users are taken from `manage.py seed_data` (--prefix/--password). Each
+client thread logs in as its own user and then repeats the scenario.
+"""
+
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+class Client:
+    """Keep-alive HTTP client bound to one server and one user."""
+
+    def __init__(self, base_url):
+        parts = urlsplit(base_url)
+        self.connection = http.client.HTTPConnection(parts.hostname, parts.port)
+        self.headers = {"Content-Type": "application/json"}
+
+    def request(self, method, path, data=None):
+        body = json.dumps(data) if data is not None else None
+        self.connection.request(method, path, body=body, headers=self.headers)
+        response = self.connection.getresponse()
+        content = response.read()
+        return response.status, content
+
+    def login(self, username, password):
+        status, content = self.request(
+            "POST",
+            "/api/users/login/",
+            {"username": username, "password": password},
+        )
+        if status != 200:
+            raise RuntimeError(f"Login as {username} failed with {status}")
+        self.headers["Authorization"] = f"Bearer {json.loads(content)['access']}"
+
+
+def participants(client, event_id):
+    status, _ = client.request("GET", f"/api/events/{event_id}/participants/")
+    return [status == 200]
+
+
+def register(client, event_id):
+    url = f"/api/events/{event_id}/register/"
+    created, _ = client.request("POST", url)
+    deleted, _ = client.request("DELETE", url)
+    return [created == 201, deleted == 204]
+
+
+SCENARIOS = {"participants": participants, "register": register}
+
+
+def run(base_url, scenario, event_id, users, password, requests_per_client):
+    latencies = []
+    errors = 0
+    lock = threading.Lock()
+    ready = threading.Barrier(len(users) + 1)
+
+    def worker(username):
+        nonlocal errors
+        client = Client(base_url)
+        client.login(username, password)
+        ready.wait()
+        local_latencies = []
+        local_errors = 0
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            results = SCENARIOS[scenario](client, event_id)
+            elapsed = (time.perf_counter() - started) / len(results)
+            local_latencies.extend([elapsed] * len(results))
+            local_errors += results.count(False)
+        with lock:
+            latencies.extend(local_latencies)
+            errors += local_errors
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in users]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--target",
+        action="append",
+        required=True,
+        help="name=base_url, repeat once per server.",
+    )
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), action="append", default=None
+    )
+    parser.add_argument("--event", type=int, required=True, help="Event id to hit.")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=50, help="Per client.")
+    parser.add_argument("--prefix", default="seed")
+    parser.add_argument("--password", default="SeedPass123!")
+    args = parser.parse_args()
+
+    users = [f"{args.prefix}{i}" for i in range(args.concurrency)]
+    print(
+        f"{'target':<10} {'scenario':<14} {'requests':>8} {'errors':>6} "
+        f"{'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+    for scenario in args.scenario or sorted(SCENARIOS):
+        for target in args.target:
+            name, base_url = target.split("=", 1)
+            result = run(
+                base_url, scenario, args.event, users, args.password, args.requests
+            )
+            print(
+                f"{name:<10} {scenario:<14} {result['requests']:>8} "
+                f"{result['errors']:>6} {result['rps']:>8.1f} {result['p50']:>8.1f} "
+                f"{result['p95']:>8.1f} {result['p99']:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Measure password hashing throughput and latency per algorithm and cost.
+
+Hashes run through the same hashers and worker pool as the API, so
+`--concurrency` above PASSWORD_HASHING_WORKERS shows queueing in the
+latency columns. Run from the project root:
+
+    python benchmarks/password_hashing.py
+    python benchmarks/password_hashing.py --workers 4 --concurrency 16 \\
+        --config argon2:ARGON2_MEMORY_COST=19456,ARGON2_TIME_COST=2
+
+Each --config is `algorithm[:SETTING=value,...]`; without any, a default
+grid of costs for every algorithm is measured.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.hashers import check_password, make_password  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+DEFAULT_CONFIGS = [
+    "argon2:ARGON2_MEMORY_COST=19456,ARGON2_TIME_COST=2",
+    "argon2:ARGON2_MEMORY_COST=47104,ARGON2_TIME_COST=1",
+    "argon2:ARGON2_MEMORY_COST=102400,ARGON2_TIME_COST=2",
+    "scrypt:SCRYPT_WORK_FACTOR=16384",
+    "scrypt:SCRYPT_WORK_FACTOR=65536",
+    "scrypt:SCRYPT_WORK_FACTOR=131072",
+    "pbkdf2:PBKDF2_ITERATIONS=210000",
+    "pbkdf2:PBKDF2_ITERATIONS=600000",
+]
+PASSWORD = "BenchPass123!"
+
+
+def parse_config(value):
+    algorithm, _, params = value.partition(":")
+    overrides = {"PASSWORD_HASHER": algorithm}
+    for item in filter(None, params.split(",")):
+        name, number = item.split("=")
+        overrides[name] = int(number)
+    return overrides
+
+
+def hasher_settings(overrides):
+    from django.conf import settings
+
+    algorithm = overrides["PASSWORD_HASHER"]
+    classes = settings.PASSWORD_HASHER_CLASSES
+    return {
+        **overrides,
+        "PASSWORD_HASHERS": [classes[algorithm]]
+        + [path for name, path in classes.items() if name != algorithm],
+    }
+
+
+def measure(operation, concurrency, total):
+    """Run operation total times over concurrency threads."""
+    latencies = []
+    lock = threading.Lock()
+    per_thread = max(total // concurrency, 1)
+
+    def worker():
+        local = []
+        for _ in range(per_thread):
+            started = time.perf_counter()
+            operation()
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rate": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[max(int(len(latencies) * 0.95) - 1, 0)] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--config", action="append", default=None)
+    parser.add_argument(
+        "--workers", type=int, default=None, help="PASSWORD_HASHING_WORKERS."
+    )
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--hashes", type=int, default=20, help="Per measurement.")
+    args = parser.parse_args()
+
+    pool = {"PASSWORD_HASHING_QUEUE": args.concurrency}
+    if args.workers is not None:
+        pool["PASSWORD_HASHING_WORKERS"] = args.workers
+
+    print(f"{'config':<56} {'operation':<9} {'per sec':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for config in args.config or DEFAULT_CONFIGS:
+        with override_settings(**pool, **hasher_settings(parse_config(config))):
+            encoded = make_password(PASSWORD)
+            operations = {
+                "hash": lambda: make_password(PASSWORD),
+                "verify": lambda: check_password(PASSWORD, encoded),
+            }
+            for name, operation in operations.items():
+                result = measure(operation, args.concurrency, args.hashes)
+                print(
+                    f"{config:<56} {name:<9} {result['rate']:>8.1f} "
+                    f"{result['p50']:>8.1f} {result['p95']:>8.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+"""
+Latency and query-count budgets for every API route.
+
+Query counts are checked with the normal suite. Latency depends on the
+machine, so those checks are marked `benchmark` and deselected unless run
+with `pytest -m benchmark benchmarks --benchmark-report=report.json`; use
+BENCHMARK_SCALE to grow the seeded dataset.
+"""
+
+import math
+import os
+from dataclasses import dataclass, field
+from datetime import timedelta
+from time import perf_counter
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from apps.events import urls as event_urls
+from apps.events.models import Event
+from apps.events.services import RegistrationService
+from apps.users import urls as user_urls
+from benchmarks.budgets import BUDGETS
+from benchmarks.dataset import PASSWORD
+
+WARMUP = 2
+ITERATIONS = 30
+SLOW_ITERATIONS = 5
+# Query counts do not vary between runs, a few requests cover cold and warm
+QUERY_ITERATIONS = 2
+LATENCY_FACTOR = float(os.getenv("BENCHMARK_LATENCY_FACTOR", 1))
+
+
+@dataclass
+class Call:
+    method: str
+    url: str
+    data: dict = field(default_factory=dict)
+    user: User = None
+    expected_status: int = 200
+
+
+def event_payload(i):
+    return {
+        "title": f"Bench created {i}",
+        "description": "Created by the benchmark suite",
+        "date": (timezone.now() + timedelta(days=30)).isoformat(),
+        "location": "Kyiv",
+    }
+
+
+def new_event(organizer):
+    return Event.objects.create(
+        title="Bench scratch",
+        description="Scratch",
+        date=timezone.now() + timedelta(days=30),
+        organizer=organizer,
+    )
+
+
+def fresh_user(i):
+    return User.objects.create(username=f"bench_fresh_{i}", password="!")
+
+
+def build_call(name, data, i):
+    """Prepare one request for a scenario, setup here is not timed."""
+    users, events = data["users"], data["events"]
+    user = users[i % len(users)]
+    event = events[0]
+    list_url = reverse("events:event-list")
+    detail_url = reverse("events:event-detail", kwargs={"pk": event.pk})
+
+    if name == "event-list:get:anonymous":
+        return Call("get", list_url)
+    if name == "event-list:get:authenticated":
+        return Call("get", list_url, user=user)
+    if name == "event-list:get:cursor":
+        return Call("get", list_url, {"pagination": "cursor", "ordering": "date"})
+    if name == "event-list:get:search":
+        return Call("get", list_url, {"q": "python work"})
+    if name == "event-list:post":
+        return Call("post", list_url, event_payload(i), user, 201)
+    if name == "event-batch:post":
+        payload = [event_payload(i * 100 + n) for n in range(50)]
+        return Call("post", reverse("events:event-batch"), payload, user)
+    if name == "event-detail:get":
+        return Call("get", detail_url)
+    if name == "event-detail:put":
+        return Call("put", detail_url, event_payload(i), event.organizer)
+    if name == "event-detail:patch":
+        return Call("patch", detail_url, {"title": f"Patched {i}"}, event.organizer)
+    if name == "event-detail:delete":
+        scratch = new_event(user)
+        url = reverse("events:event-detail", kwargs={"pk": scratch.pk})
+        return Call("delete", url, user=user, expected_status=204)
+    if name == "event-register:post":
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+        return Call("post", url, user=fresh_user(i), expected_status=201)
+    if name == "event-register:delete":
+        attendee = fresh_user(i)
+        RegistrationService.register(attendee, event)
+        url = reverse("events:event-register", kwargs={"pk": event.pk})
+        return Call("delete", url, user=attendee, expected_status=204)
+    if name == "event-bulk-register:post":
+        delegation = User.objects.bulk_create(
+            User(username=f"bench_bulk_{i}_{n}", password="!") for n in range(100)
+        )
+        url = reverse("events:event-bulk-register", kwargs={"pk": event.pk})
+        payload = {"users": [str(user.pk) for user in delegation]}
+        return Call("post", url, payload, event.organizer)
+    if name == "event-participants:get":
+        busiest = data["busiest_event"]
+        url = reverse("events:event-participants", kwargs={"pk": busiest.pk})
+        return Call("get", url)
+    if name == "event-participants:get:search":
+        busiest = data["busiest_event"]
+        url = reverse("events:event-participants", kwargs={"pk": busiest.pk})
+        return Call("get", url, {"search": "bench1"})
+    if name == "event-export-participants:get":
+        busiest = data["busiest_event"]
+        url = reverse("events:event-export-participants", kwargs={"pk": busiest.pk})
+        return Call("get", url, {"format": "ndjson"}, busiest.organizer)
+    if name == "register:post":
+        payload = {
+            "username": f"bench_signup_{i}",
+            "email": f"bench_signup_{i}@example.com",
+            "password": PASSWORD,
+            "password_confirm": PASSWORD,
+        }
+        return Call("post", reverse("users:register"), payload, expected_status=201)
+    if name == "login:post":
+        payload = {"username": user.username, "password": PASSWORD}
+        return Call("post", reverse("users:login"), payload)
+    if name == "token_refresh:post":
+        payload = {"refresh": str(RefreshToken.for_user(user))}
+        return Call("post", reverse("users:token_refresh"), payload)
+    if name == "current_user:get":
+        return Call("get", reverse("users:current_user"), user=user)
+    raise KeyError(name)
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def run_scenario(name, data, iterations=None):
+    """Run a scenario, returning (max query count, latency samples in ms)."""
+    if iterations is None:
+        slow = BUDGETS[name]["p95_ms"] >= 1000
+        iterations = SLOW_ITERATIONS if slow else ITERATIONS
+    client = APIClient()
+    max_queries = 0
+    samples = []
+
+    for i in range(WARMUP + iterations):
+        call = build_call(name, data, i)
+        client.credentials()
+        if call.user is not None:
+            token = AccessToken.for_user(call.user)
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        request = getattr(client, call.method)
+        kwargs = {"format": "json"} if call.method != "get" else {}
+
+        with CaptureQueriesContext(connection) as queries:
+            start = perf_counter()
+            response = request(call.url, call.data, **kwargs)
+            if response.streaming:
+                b"".join(response.streaming_content)
+            elapsed = (perf_counter() - start) * 1000
+
+        assert response.status_code == call.expected_status, (
+            name,
+            response.status_code,
+            getattr(response, "data", None),
+        )
+        max_queries = max(max_queries, len(queries))
+        if i >= WARMUP:
+            samples.append(elapsed)
+    return max_queries, samples
+
+
+@pytest.fixture(autouse=True)
+def uncached_responses(settings):
+    """Measure the cold path, the response cache would hide regressions."""
+    settings.RESPONSE_CACHE_ENABLED = False
+    # Every scenario comes from one client IP and repeats faster than any rate
+    settings.THROTTLE_ENABLED = False
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_endpoint_within_query_budget(name, dataset):
+    budget = BUDGETS[name]
+    max_queries, _ = run_scenario(name, dataset, QUERY_ITERATIONS)
+
+    assert (
+        max_queries <= budget["queries"]
+    ), f"{name} ran {max_queries} queries, budget is {budget['queries']}"
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", sorted(BUDGETS))
+def test_endpoint_within_budget(name, dataset, benchmark_report):
+    budget = BUDGETS[name]
+    max_queries, samples = run_scenario(name, dataset)
+    p50, p95 = percentile(samples, 50), percentile(samples, 95)
+    benchmark_report.append(
+        {
+            "endpoint": name,
+            "iterations": len(samples),
+            "queries": max_queries,
+            "p50_ms": round(p50, 3),
+            "p95_ms": round(p95, 3),
+            "budget": budget,
+        }
+    )
+
+    assert (
+        max_queries <= budget["queries"]
+    ), f"{name} ran {max_queries} queries, budget is {budget['queries']}"
+    assert (
+        p95 <= budget["p95_ms"] * LATENCY_FACTOR
+    ), f"{name} p95 is {p95:.1f} ms, budget is {budget['p95_ms']} ms"
+
+
+def route_names(patterns):
+    names = set()
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+def test_every_route_has_a_budget():
+    """New routes must get a budget before they can be merged."""
+    budgeted = {name.split(":")[0] for name in BUDGETS}
+    # The router registers EventViewSet at "", so its api-root view is
+    # shadowed by event-list at the same URL
+    routes = route_names(event_urls.urlpatterns) - {"api-root"}
+    routes |= route_names(user_urls.urlpatterns)
+    assert routes - budgeted == set()
@@ -0,0 +1,50 @@
+"""
+Speed of the event list fast path against EventListSerializer.
+
+Both serialize the same 100-row page of the seeded dataset, from the
+database rows to rendered JSON, and must produce identical bytes. Marked
+`benchmark`, run with `pytest -m benchmark benchmarks`; the parity tests
+in apps/events/tests run with the normal suite.
+"""
+
+import os
+from time import perf_counter
+
+import pytest
+from rest_framework.renderers import JSONRenderer
+
+from apps.events.models import Event
+from apps.events.serializers import EventListSerializer, EventListValues
+
+PAGE_SIZE = 100
+ROUNDS = 20
+MIN_SPEEDUP = float(os.getenv("BENCHMARK_MIN_SPEEDUP", 3))
+
+
+def best_of(func):
+    """Fastest of ROUNDS runs in ms, the least disturbed by other load."""
+    timings = []
+    for _ in range(ROUNDS):
+        started = perf_counter()
+        func()
+        timings.append((perf_counter() - started) * 1000)
+    return min(timings)
+
+
+@pytest.mark.benchmark
+@pytest.mark.django_db
+def test_values_serialization_speedup(dataset):
+    queryset = Event.objects.select_related("organizer").order_by("-date")
+    instances = list(queryset[:PAGE_SIZE])
+    rows = list(EventListValues.values(queryset)[:PAGE_SIZE])
+    renderer = JSONRenderer()
+
+    def serializer():
+        return renderer.render(EventListSerializer(instances, many=True).data)
+
+    def values():
+        return renderer.render(EventListValues.serialize(rows))
+
+    assert values() == serializer()
+    speedup = best_of(serializer) / best_of(values)
+    assert speedup >= MIN_SPEEDUP, f"fast path is {speedup:.1f}x, expected 3x"
@@ -41,6 +41,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Outermost, so the timings cover all other middleware
+    "apps.core.middleware.MetricsMiddleware",
+    # Next, so shed requests cost as little as possible
+    "apps.core.middleware.ConcurrencyLimitMiddleware",
+    # Before anything reads the database, e.g. sessions
+    "apps.core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -71,6 +77,59 @@ TEMPLATES = [
 WSGI_APPLICATION = "config.wsgi.application"
 
 
+# Cache
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
+    }
+}
+
+# Versioned cache of rendered list/detail responses, see apps/core/cache.py
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+RESPONSE_CACHE_ALIAS = "default"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 300))
+
+# Route register/participants to native async views (apps/events/async_views.py).
+# Only worthwhile under ASGI, where they do not hold a worker thread while waiting.
+ASYNC_EVENT_VIEWS = os.getenv("ASYNC_EVENT_VIEWS", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+
+# Password hashing (apps/users/hashers.py). New hashes use PASSWORD_HASHER,
+# older ones are rehashed on the next login.
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "argon2")
+PASSWORD_HASHER_CLASSES = {
+    "argon2": "apps.users.hashers.Argon2PasswordHasher",
+    "scrypt": "apps.users.hashers.ScryptPasswordHasher",
+    "pbkdf2": "apps.users.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHERS = [PASSWORD_HASHER_CLASSES[PASSWORD_HASHER]] + [
+    path for name, path in PASSWORD_HASHER_CLASSES.items() if name != PASSWORD_HASHER
+]
+# Argon2id: passes, memory in KiB, lanes
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", 2))
+ARGON2_MEMORY_COST = int(os.getenv("ARGON2_MEMORY_COST", 19456))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", 1))
+SCRYPT_WORK_FACTOR = int(os.getenv("SCRYPT_WORK_FACTOR", 2**14))
+SCRYPT_BLOCK_SIZE = int(os.getenv("SCRYPT_BLOCK_SIZE", 8))
+SCRYPT_PARALLELISM = int(os.getenv("SCRYPT_PARALLELISM", 1))
+PBKDF2_ITERATIONS = int(os.getenv("PBKDF2_ITERATIONS", 600000))
+# Hashing threads per process (0 hashes on the request thread), callers
+# allowed to wait for one, and seconds they wait before a 503
+PASSWORD_HASHING_WORKERS = int(os.getenv("PASSWORD_HASHING_WORKERS", 2))
+PASSWORD_HASHING_QUEUE = int(os.getenv("PASSWORD_HASHING_QUEUE", 16))
+PASSWORD_HASHING_TIMEOUT = float(os.getenv("PASSWORD_HASHING_TIMEOUT", 10))
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -101,7 +160,7 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 # Django REST Framework
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "apps.users.authentication.CachedJWTAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticatedOrReadOnly",
@@ -111,11 +170,83 @@ REST_FRAMEWORK = {
         "rest_framework.filters.SearchFilter",
         "rest_framework.filters.OrderingFilter",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "apps.core.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # Only views with a throttle scope are limited, see apps/core/throttling.py
+    "DEFAULT_THROTTLE_CLASSES": [
+        "apps.core.throttling.ScopedSlidingWindowThrottle",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        # Per IP
+        "login": os.getenv("THROTTLE_RATE_LOGIN", "10/min"),
+        "signup": os.getenv("THROTTLE_RATE_SIGNUP", "20/hour"),
+        # Per user, per IP for anonymous clients
+        "register": os.getenv("THROTTLE_RATE_REGISTER", "30/min"),
+        "list": os.getenv("THROTTLE_RATE_LIST", "120/min"),
+    },
+    # Proxies in front of the app, so rate limits see the client IP
+    "NUM_PROXIES": int(os.getenv("NUM_PROXIES", 0)),
 }
 
+THROTTLE_ENABLED = os.getenv("THROTTLE_ENABLED", "True").lower() in ("true", "1", "yes")
+# Shared by all processes; Redis in production
+THROTTLE_CACHE_ALIAS = "default"
+
+# Read replicas (apps/core/db/routers.py): database aliases that safe
+# requests read from, none by default
+DATABASE_ROUTERS = ["apps.core.db.routers.PrimaryReplicaRouter"]
+DATABASE_REPLICAS = [
+    alias for alias in os.getenv("DATABASE_REPLICAS", "").split(",") if alias
+]
+# Seconds a user's reads stay on the primary after they wrote
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", 10))
+
+# Load shedding (apps/core/middleware.py): requests in flight per process
+# before answering 503, 0 disables it
+MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", 0))
+LOAD_SHEDDING_RETRY_AFTER = int(os.getenv("LOAD_SHEDDING_RETRY_AFTER", 1))
+LOAD_SHEDDING_EXEMPT_PATHS = ["/", "/health/live", "/health/ready", "/metrics"]
+
+# Probes (apps/core/health.py): seconds readiness results are reused
+READINESS_CACHE_TTL = float(os.getenv("READINESS_CACHE_TTL", 5))
+READINESS_CHECKS = {
+    "database": "apps.core.health.check_database",
+    "cache": "apps.core.health.check_cache",
+    "outbox": "apps.events.health.check_outbox",
+}
+# Seconds the oldest due email may wait before the worker is not ready,
+# 0 only reports the lag
+READINESS_OUTBOX_MAX_LAG = int(os.getenv("READINESS_OUTBOX_MAX_LAG", 0))
+# Run once per worker before it reports ready
+WARM_UP_HOOKS = [
+    "apps.core.health.connect_databases",
+    "apps.core.health.load_urlconf",
+    "apps.users.health.warm_up_blacklist_filter",
+]
+
+# Request metrics (apps/core/metrics.py): Server-Timing header and /metrics
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() in ("true", "1", "yes")
+SERVER_TIMING = os.getenv("SERVER_TIMING", "True").lower() in ("true", "1", "yes")
+# Bearer token required by /metrics; without one /metrics is open, or not
+# served (404) when METRICS_REQUIRE_TOKEN is set, as in production
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_REQUIRE_TOKEN = os.getenv("METRICS_REQUIRE_TOKEN", "False").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+# Shared by the workers of one server so /metrics covers all of them,
+# per-process metrics only when empty
+METRICS_DIR = os.getenv("METRICS_DIR", "")
+METRICS_FLUSH_INTERVAL = int(os.getenv("METRICS_FLUSH_INTERVAL", 10))
+
+# Use the planner's row estimate instead of COUNT(*) for unfiltered lists
+PAGINATION_ESTIMATED_COUNT = os.getenv(
+    "PAGINATION_ESTIMATED_COUNT", "False"
+).lower() in ("true", "1", "yes")
+PAGINATION_ESTIMATE_THRESHOLD = int(os.getenv("PAGINATION_ESTIMATE_THRESHOLD", 100000))
+
 
 # JWT Settings
 SIMPLE_JWT = {
@@ -124,8 +255,48 @@ SIMPLE_JWT = {
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": True,
     "AUTH_HEADER_TYPES": ("Bearer",),
+    # Blacklists rotated tokens in apps.users (no token_blacklist app)
+    "TOKEN_REFRESH_SERIALIZER": "apps.users.serializers.TokenRefreshSerializer",
 }
 
+# Refresh token blacklist, see apps/users/blacklist.py
+# Expected blacklisted tokens and false positive rate of the in-process filter
+TOKEN_BLACKLIST_FILTER_CAPACITY = int(
+    os.getenv("TOKEN_BLACKLIST_FILTER_CAPACITY", 100000)
+)
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = float(
+    os.getenv("TOKEN_BLACKLIST_FILTER_ERROR_RATE", 0.001)
+)
+# Seconds between loads of newly blacklisted tokens; the shared cache covers
+# the gap for tokens blacklisted by other processes
+TOKEN_BLACKLIST_FILTER_SYNC = int(os.getenv("TOKEN_BLACKLIST_FILTER_SYNC", 10))
+# Seconds between full rebuilds, which drop purged tokens
+TOKEN_BLACKLIST_FILTER_REBUILD = int(os.getenv("TOKEN_BLACKLIST_FILTER_REBUILD", 3600))
+
+# Per-process caches of CachedJWTAuthentication (apps/users/authentication.py)
+AUTH_USER_CACHE_SIZE = int(os.getenv("AUTH_USER_CACHE_SIZE", 10000))
+# Seconds; saves invalidate immediately, this only bounds staleness of memory
+AUTH_USER_CACHE_TTL = int(os.getenv("AUTH_USER_CACHE_TTL", 300))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", 10000))
+
+
+# Mail outbox (delivered by `manage.py run_mail_worker`)
+MAIL_OUTBOX_BATCH_SIZE = int(os.getenv("MAIL_OUTBOX_BATCH_SIZE", 100))
+MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("MAIL_OUTBOX_MAX_ATTEMPTS", 5))
+# Seconds before the first retry, doubled after every failed attempt
+MAIL_OUTBOX_RETRY_BACKOFF = int(os.getenv("MAIL_OUTBOX_RETRY_BACKOFF", 60))
+MAIL_OUTBOX_MAX_BACKOFF = int(os.getenv("MAIL_OUTBOX_MAX_BACKOFF", 3600))
+# Seconds a worker has to send a claimed batch before others may claim it
+MAIL_OUTBOX_LEASE = int(os.getenv("MAIL_OUTBOX_LEASE", 300))
+
+# Events per validation batch and bulk INSERT for batch creation/import_events
+EVENT_IMPORT_CHUNK_SIZE = int(os.getenv("EVENT_IMPORT_CHUNK_SIZE", 1000))
+
+# Organizer bulk registration (POST /api/events/{id}/register/bulk/)
+BULK_REGISTRATION_MAX_USERS = int(os.getenv("BULK_REGISTRATION_MAX_USERS", 5000))
+# Rows per lookup and INSERT
+BULK_REGISTRATION_CHUNK_SIZE = int(os.getenv("BULK_REGISTRATION_CHUNK_SIZE", 1000))
+
 
 # drf-spectacular (Swagger/OpenAPI)
 SPECTACULAR_SETTINGS = {
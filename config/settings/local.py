@@ -7,7 +7,16 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",  # noqa: F405
-    }
+        # File-backed test database: in-memory shared-cache SQLite fails
+        # concurrent writers immediately instead of waiting for the lock.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},  # noqa: F405
+    },
+    # Stands in for a read replica, enable with DATABASE_REPLICAS=replica
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",  # noqa: F405
+        "TEST": {"MIRROR": "default"},
+    },
 }
 
 # Console email backend - prints emails to console/logs
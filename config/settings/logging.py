@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
@@ -6,46 +7,56 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent
 LOGS_DIR = BASE_DIR / "docs" / "logs"
 LOGS_DIR.mkdir(parents=True, exist_ok=True)
 
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# "logger=rate,..." keeps that fraction of a logger's records below WARNING,
+# e.g. "apps.events.views=0.1" for the registration log lines
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split("=") for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if item
+    )
+}
+
+# Records are written as JSON lines by a background thread, see apps/core/logs.py
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "formatters": {
-        "verbose": {
-            "format": "{levelname} {asctime} {module} {process:d} {thread:d} {message}",
-            "style": "{",
-        },
-        "simple": {
-            "format": "{levelname} {asctime} {module} {message}",
-            "style": "{",
-        },
+    "filters": {
+        f"sample:{name}": {"()": "apps.core.logs.SamplingFilter", "rate": rate}
+        for name, rate in LOG_SAMPLE_RATES.items()
     },
     "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "simple",
-        },
-        "file": {
-            "class": "logging.handlers.RotatingFileHandler",
+        "background": {
+            "()": "apps.core.logs.BackgroundHandler",
             "filename": LOGS_DIR / "app.log",
-            "maxBytes": 1024 * 1024 * 5,  # 5 MB
-            "backupCount": 5,
-            "formatter": "verbose",
+            "max_bytes": 1024 * 1024 * 5,  # 5 MB
+            "backup_count": 5,
+            "queue_size": int(os.getenv("LOG_QUEUE_SIZE", 10000)),
+            # Human-readable console instead of JSON, for local development
+            "text_console": os.getenv("LOG_FORMAT", "json") == "text",
         },
     },
     "root": {
-        "handlers": ["console", "file"],
+        "handlers": ["background"],
         "level": "INFO",
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["background"],
             "level": "INFO",
             "propagate": False,
         },
         "apps": {
-            "handlers": ["console", "file"],
-            "level": "DEBUG",
+            "handlers": ["background"],
+            "level": LOG_LEVEL,
             "propagate": False,
         },
     },
 }
+
+# Logger filters only see records logged on that logger itself, not those
+# propagated from its children, so sample by module logger name
+for _name in LOG_SAMPLE_RATES:
+    LOGGING["loggers"].setdefault(_name, {}).setdefault("filters", []).append(
+        f"sample:{_name}"
+    )
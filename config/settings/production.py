@@ -4,18 +4,87 @@ from .base import *  # noqa: F401, F403
 # DEBUG can be overridden via environment variable for testing
 DEBUG = os.getenv("DEBUG", "False").lower() in ("true", "1", "yes")
 
+# Database connections:
+# - "pool": a pool per worker process (apps/core/db/pool.py)
+# - "pgbouncer": the same pool in front of a transaction-pooling PgBouncer,
+#   with server-side cursors disabled
+# - "persistent": one connection per thread kept for DB_CONN_MAX_AGE
+#   seconds, only effective under WSGI (ASGI runs each request in a new thread)
+# - "direct": a new connection for every request
+DB_CONNECTION_MODE = os.getenv("DB_CONNECTION_MODE", "pool")
+DB_POOLED = DB_CONNECTION_MODE in ("pool", "pgbouncer")
+
 # PostgreSQL for production
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.postgresql",
+        "ENGINE": (
+            "apps.core.db.postgresql" if DB_POOLED else "django.db.backends.postgresql"
+        ),
         "NAME": os.getenv("POSTGRES_DB", "events_db"),
         "USER": os.getenv("POSTGRES_USER", "user"),
         "PASSWORD": os.getenv("POSTGRES_PASSWORD", "password"),
         "HOST": os.getenv("POSTGRES_HOST", "db"),
         "PORT": os.getenv("POSTGRES_PORT", "5432"),
+        # Pooled connections go back to the pool after every request
+        "CONN_MAX_AGE": (
+            int(os.getenv("DB_CONN_MAX_AGE", 60))
+            if DB_CONNECTION_MODE == "persistent"
+            else 0
+        ),
+        "CONN_HEALTH_CHECKS": DB_CONNECTION_MODE == "persistent",
+        # Transaction pooling cannot keep a cursor open across transactions
+        "DISABLE_SERVER_SIDE_CURSORS": DB_CONNECTION_MODE == "pgbouncer",
+        # Per worker process: keep WEB_CONCURRENCY * MAX_SIZE under the
+        # connections Postgres (or PgBouncer) accepts
+        "POOL": {
+            "MAX_SIZE": int(os.getenv("DB_POOL_MAX_SIZE", 10)),
+            # Seconds to wait for a free connection before failing the request
+            "TIMEOUT": float(os.getenv("DB_POOL_TIMEOUT", 5)),
+            # Seconds before a connection is replaced
+            "MAX_LIFETIME": int(os.getenv("DB_POOL_MAX_LIFETIME", 1800)),
+            # Seconds idle before a connection is checked with SELECT 1
+            "CHECK_AFTER": int(os.getenv("DB_POOL_CHECK_AFTER", 30)),
+        },
     }
 }
 
+# Read replicas: "host[:port],..." with the primary's credentials, used by
+# safe requests through apps.core.db.routers.PrimaryReplicaRouter
+for _number, _address in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    _host, _, _port = _address.strip().partition(":")
+    DATABASES[f"replica_{_number}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": _port or DATABASES["default"]["PORT"],
+    }
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != "default"]
+
+# Shared cache (response cache generations must be visible to all workers)
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+
+# Served by gunicorn with uvicorn workers (config/asgi.py, gunicorn.conf.py)
+ASYNC_EVENT_VIEWS = os.getenv("ASYNC_EVENT_VIEWS", "True").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+
+# Per-view timings are internal: no Server-Timing header unless enabled, and
+# /metrics only with a METRICS_TOKEN
+SERVER_TIMING = os.getenv("SERVER_TIMING", "False").lower() in ("true", "1", "yes")
+METRICS_REQUIRE_TOKEN = True
+
+# Behind nginx (nginx.conf), which appends the client to X-Forwarded-For
+REST_FRAMEWORK["NUM_PROXIES"] = int(os.getenv("NUM_PROXIES", 1))  # noqa: F405
+
 # SMTP Email Backend
 EMAIL_BACKEND = "django.core.mail.backends.smtp.EmailBackend"
 EMAIL_HOST = os.getenv("EMAIL_HOST", "smtp.gmail.com")
@@ -0,0 +1,7 @@
+import copy
+
+from .local import *  # noqa: F401, F403
+
+# Console only, so test and benchmark runs leave docs/logs alone
+LOGGING = copy.deepcopy(LOGGING)  # noqa: F405
+LOGGING["handlers"]["background"]["filename"] = None
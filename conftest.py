@@ -0,0 +1,25 @@
+import pytest
+from django.core.cache import caches
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--benchmark-report",
+        default=None,
+        help="Write benchmark results as JSON to this path.",
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches, the test database is rolled back."""
+    from apps.core.health import readiness
+    from apps.users.authentication import clear_auth_caches
+    from apps.users.blacklist import blacklist_filter
+
+    for cache in caches.all():
+        cache.clear()
+    clear_auth_caches()
+    blacklist_filter.clear()
+    readiness.reset()
+    yield